@@ -5,7 +5,12 @@ from contextlib import asynccontextmanager
 
 from auth import auth_router
 from db import Base, engine
+from rabbitmq_service.sender import publisher
 from routes import ROUTER
+from routes.message import manager as conversation_manager
+from search import close_search_index, open_search_index
+from snowflake.lease import instance_lease
+from translate import translation_pipeline, translator
 
 
 @asynccontextmanager
@@ -13,8 +18,32 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    if instance_lease is not None:
+        await instance_lease.start()
+
+    await open_search_index()
+
+    await translator.start()
+
+    try:
+        await publisher.start()
+    except Exception as e:
+        print(f"Error connecting to RabbitMQ: {e}")
+
+    await conversation_manager.start()
+
     yield
 
+    await conversation_manager.close()
+    await translation_pipeline.close()
+    await translator.close()
+    await publisher.close()
+
+    close_search_index()
+
+    if instance_lease is not None:
+        await instance_lease.release()
+
 app = FastAPI(
     lifespan=lifespan
 )
@@ -25,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 app.include_router(auth_router)
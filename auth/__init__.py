@@ -1,2 +1,2 @@
 from .router import router as auth_router
-from .utils import UserIdDep, UserIdDepends, validate_jwt
+from .utils import OptionalUserIdDep, UserIdDep, UserIdDepends, validate_jwt
@@ -0,0 +1,156 @@
+from cryptography.hazmat.primitives.asymmetric.ec import (
+    EllipticCurvePrivateKey,
+    EllipticCurvePublicKey,
+)
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    load_pem_private_key,
+    load_pem_public_key,
+    PublicFormat,
+)
+
+from hashlib import sha256
+from os import listdir, path
+from threading import Lock
+from time import monotonic
+from typing import Callable, Optional
+
+from config import (
+    JWT_KEY_DIR,
+    JWT_KEY_RELOAD_INTERVAL,
+    PRIVATE_KEY_FILE,
+    PUBLIC_KEY_FILE,
+)
+
+
+def key_id(public_key: EllipticCurvePublicKey) -> str:
+    return sha256(public_key.public_bytes(
+        Encoding.DER,
+        PublicFormat.SubjectPublicKeyInfo
+    )).hexdigest()[:16]
+
+
+class KeyRing:
+    signing_kid: Optional[str]
+    signing_key: Optional[EllipticCurvePrivateKey]
+    public_keys: dict[str, EllipticCurvePublicKey]
+    primary_kid: Optional[str]
+
+    _private_key_file: Optional[str]
+    _public_key_file: Optional[str]
+    _key_dir: Optional[str]
+    _reload_interval: float
+    _last_reload: float
+    _listeners: list[Callable[[], None]]
+    _lock: Lock
+
+    def __init__(
+        self,
+        private_key_file: Optional[str],
+        public_key_file: Optional[str],
+        key_dir: Optional[str] = None,
+        reload_interval: float = 30,
+    ) -> None:
+        self.signing_kid = None
+        self.signing_key = None
+        self.public_keys = {}
+        self.primary_kid = None
+
+        self._private_key_file = private_key_file
+        self._public_key_file = public_key_file
+        self._key_dir = key_dir
+        self._reload_interval = reload_interval
+        self._last_reload = float("-inf")
+        self._listeners = []
+        self._lock = Lock()
+
+        self.reload(force=True)
+
+    @staticmethod
+    def __read_public_key(file: str) -> EllipticCurvePublicKey:
+        with open(file, "rb") as f:
+            data = f.read()
+
+        try:
+            return load_pem_public_key(data)  # type: ignore
+        except ValueError:
+            return load_pem_private_key(
+                data,
+                password=None
+            ).public_key()  # type: ignore
+
+    def on_change(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    def reload(self, force: bool = False) -> bool:
+        with self._lock:
+            now = monotonic()
+            if not force and now - self._last_reload < self._reload_interval:
+                return False
+            self._last_reload = now
+
+            signing_kid, signing_key = None, None
+            if self._private_key_file is not None:
+                with open(self._private_key_file, "rb") as f:
+                    signing_key = load_pem_private_key(
+                        f.read(),
+                        password=None
+                    )
+                signing_kid = key_id(signing_key.public_key())  # type: ignore
+
+            public_keys: dict[str, EllipticCurvePublicKey] = {}
+            primary_kid = None
+            if self._public_key_file is not None:
+                public_key = self.__read_public_key(self._public_key_file)
+                primary_kid = key_id(public_key)
+                public_keys[primary_kid] = public_key
+
+            if self._key_dir is not None and path.isdir(self._key_dir):
+                for name in sorted(listdir(self._key_dir)):
+                    if not name.endswith(".pem"):
+                        continue
+                    try:
+                        public_key = self.__read_public_key(
+                            path.join(self._key_dir, name)
+                        )
+                    except ValueError:
+                        continue
+                    public_keys[key_id(public_key)] = public_key
+
+            changed = public_keys.keys() != self.public_keys.keys()
+
+            self.signing_kid = signing_kid
+            self.signing_key = signing_key  # type: ignore
+            self.public_keys = public_keys
+            self.primary_kid = primary_kid
+
+        if changed:
+            for listener in self._listeners:
+                listener()
+
+        return changed
+
+    def get_public_key(
+        self,
+        kid: Optional[str],
+    ) -> Optional[EllipticCurvePublicKey]:
+        # Tokens signed before key ids were introduced carry no `kid` and
+        # are checked against the configured public key.
+        if kid is None:
+            kid = self.primary_kid
+            if kid is None:
+                return None
+
+        public_key = self.public_keys.get(kid)
+        if public_key is None and self.reload():
+            public_key = self.public_keys.get(kid)
+
+        return public_key
+
+
+key_ring = KeyRing(
+    private_key_file=PRIVATE_KEY_FILE,
+    public_key_file=PUBLIC_KEY_FILE,
+    key_dir=JWT_KEY_DIR,
+    reload_interval=JWT_KEY_RELOAD_INTERVAL,
+)
@@ -0,0 +1,116 @@
+from bcrypt import checkpw, gensalt, hashpw
+
+from asyncio import get_running_loop, Semaphore
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, TypeVar
+
+from config import PASSWORD_HASH_WORKERS
+
+T = TypeVar("T")
+
+
+class PasswordHasherStats:
+    completed: int
+    waiting: int
+    running: int
+    total_queue_wait: float
+    max_queue_wait: float
+    total_run_time: float
+    max_run_time: float
+
+    def __init__(self) -> None:
+        self.completed = 0
+        self.waiting = 0
+        self.running = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_run_time = 0.0
+        self.max_run_time = 0.0
+
+    def record(self, queue_wait: float, run_time: float) -> None:
+        self.completed += 1
+        self.total_queue_wait += queue_wait
+        self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+        self.total_run_time += run_time
+        self.max_run_time = max(self.max_run_time, run_time)
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "completed": self.completed,
+            "waiting": self.waiting,
+            "running": self.running,
+            "avg_queue_wait_ms": (
+                self.total_queue_wait / self.completed * 1000
+            ) if self.completed else 0.0,
+            "max_queue_wait_ms": self.max_queue_wait * 1000,
+            "avg_run_time_ms": (
+                self.total_run_time / self.completed * 1000
+            ) if self.completed else 0.0,
+            "max_run_time_ms": self.max_run_time * 1000,
+        }
+
+
+class PasswordHasher:
+    stats: PasswordHasherStats
+
+    _executor: ThreadPoolExecutor
+    _limit: Semaphore
+
+    def __init__(self, workers: int) -> None:
+        self.stats = PasswordHasherStats()
+
+        # bcrypt releases the GIL while hashing, so plain threads give real
+        # parallelism. The semaphore keeps excess callers queued on the event
+        # loop where their wait time can be measured.
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="password-hasher"
+        )
+        self._limit = Semaphore(workers)
+
+    async def __run(self, func: Callable[[], T]) -> T:
+        queued_at = perf_counter()
+        self.stats.waiting += 1
+        try:
+            await self._limit.acquire()
+        finally:
+            self.stats.waiting -= 1
+
+        self.stats.running += 1
+        started_at = perf_counter()
+        try:
+            return await get_running_loop().run_in_executor(
+                self._executor,
+                func
+            )
+        finally:
+            self._limit.release()
+            self.stats.running -= 1
+            self.stats.record(
+                queue_wait=started_at - queued_at,
+                run_time=perf_counter() - started_at
+            )
+
+    async def hash(self, password: str) -> str:
+        return await self.__run(lambda: hashpw(
+            password.encode("utf-8"),
+            gensalt()
+        ).decode("utf-8"))
+
+    async def check(self, password: str, password_hash: str) -> bool:
+        return await self.__run(lambda: checkpw(
+            password.encode("utf-8"),
+            password_hash.encode("utf-8")
+        ))
+
+
+password_hasher = PasswordHasher(workers=PASSWORD_HASH_WORKERS)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def check_password(password: str, password_hash: str) -> bool:
+    return await password_hasher.check(password, password_hash)
@@ -1,4 +1,3 @@
-from bcrypt import checkpw, gensalt, hashpw
 from fastapi import APIRouter, Body, HTTPException, status
 from sqlalchemy import select
 
@@ -8,8 +7,9 @@ from db import SessionDep
 from exceptions.user import USER_NOT_FOUND
 from model.user import User, UserModel
 from schemas.auth import Jwt, LoginData, RegisterData
-from snowflake import SnowflakeGenerator
+from snowflake import id_generator
 
+from .password import check_password, hash_password
 from .utils import sign_jwt, UserIdDep
 
 router = APIRouter(
@@ -17,8 +17,6 @@ router = APIRouter(
     tags=["Authentication"]
 )
 
-id_generator = SnowflakeGenerator()
-
 
 @router.post(
     path="/pre-check",
@@ -40,11 +38,7 @@ async def pre_check(session: SessionDep, username: Annotated[str, Body(embed=Tru
 
 @router.post("/register")
 async def register(session: SessionDep, data: RegisterData) -> Jwt:
-    salt = gensalt()
-    hashed_password = hashpw(
-        data.password.encode("utf-8"),
-        salt
-    )
+    hashed_password = await hash_password(data.password)
 
     user = User(
         id=id_generator.next_id(),
@@ -82,7 +76,7 @@ async def login(session: SessionDep, data: LoginData) -> Jwt:
 
     user_id, password = result
 
-    if not checkpw(data.password.encode("utf-8"), password.encode("utf-8")):
+    if not await check_password(data.password, password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect password."
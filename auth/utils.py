@@ -1,12 +1,18 @@
+from cachetools import LRUCache
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jwt import decode, encode
+from jwt import decode, encode, get_unverified_header
 
-from config import PRIVATE_KEY, PUBLIC_KEY
+from config import JWT_CACHE_SIZE
 from snowflake import SnowflakeID
 
 from datetime import datetime, timedelta
-from typing import Annotated, Union
+from hashlib import sha256
+from threading import Lock
+from time import time
+from typing import Annotated, Optional, Union
+
+from .keys import key_ring
 
 try:
     from datetime import UTC
@@ -21,6 +27,26 @@ SECURITY = HTTPBearer(
     auto_error=False,
 )
 
+INVALID_CREDENTIALS = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid authentication credentials."
+)
+
+# `validate_depends` is sync and runs on the threadpool, so the cache needs
+# its own lock.
+verified_tokens: LRUCache[bytes, tuple[dict, float]] = LRUCache(
+    maxsize=max(JWT_CACHE_SIZE, 1)
+)
+verified_tokens_lock = Lock()
+
+
+def clear_verified_tokens() -> None:
+    with verified_tokens_lock:
+        verified_tokens.clear()
+
+
+key_ring.on_change(clear_verified_tokens)
+
 
 def sign_jwt(user_id: Union[int, str, SnowflakeID]) -> str:
     payload = {
@@ -29,25 +55,52 @@ def sign_jwt(user_id: Union[int, str, SnowflakeID]) -> str:
         "exp": datetime.now(UTC) + timedelta(days=7)
     }
 
+    key_ring.reload()
+
     return encode(
         payload=payload,
-        key=PRIVATE_KEY,
-        algorithm="ES256"
+        key=key_ring.signing_key,  # type: ignore
+        algorithm="ES256",
+        headers={"kid": key_ring.signing_kid}
     )
 
 
 def validate_jwt(token: str) -> dict:
+    digest = sha256(token.encode("utf-8")).digest()
+
+    if JWT_CACHE_SIZE > 0:
+        with verified_tokens_lock:
+            cached = verified_tokens.get(digest)
+
+        if cached is not None:
+            claims, expires_at = cached
+            if time() < expires_at:
+                return claims
+
+            with verified_tokens_lock:
+                verified_tokens.pop(digest, None)
+
     try:
-        return decode(
+        public_key = key_ring.get_public_key(
+            get_unverified_header(token).get("kid")
+        )
+        if public_key is None:
+            raise INVALID_CREDENTIALS
+
+        claims = decode(
             token,
-            key=PUBLIC_KEY,
+            key=public_key,
             algorithms=["ES256"]
         )
     except:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials."
-        )
+        raise INVALID_CREDENTIALS
+
+    expires_at = claims.get("exp")
+    if JWT_CACHE_SIZE > 0 and isinstance(expires_at, (int, float)):
+        with verified_tokens_lock:
+            verified_tokens[digest] = (claims, expires_at)
+
+    return claims
 
 
 def validate_depends(token: HTTPAuthorizationCredentials = Security(SECURITY)) -> int:
@@ -69,5 +122,18 @@ def validate_depends(token: HTTPAuthorizationCredentials = Security(SECURITY)) -
     return int(user_id)
 
 
+def optional_validate_depends(
+    token: Optional[HTTPAuthorizationCredentials] = Security(SECURITY)
+) -> Optional[int]:
+    if token is None:
+        return None
+
+    return validate_depends(token)
+
+
 UserIdDepends = Depends(validate_depends)
 UserIdDep = Annotated[int, UserIdDepends]
+OptionalUserIdDep = Annotated[
+    Optional[int],
+    Depends(optional_validate_depends)
+]
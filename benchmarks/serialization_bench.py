@@ -0,0 +1,119 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from time import perf_counter
+from typing import Any, Callable
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.view import ArticleView, UserView, ViewResponse  # noqa: E402
+from snowflake import SnowflakeID  # noqa: E402
+
+ITEMS = 1000
+ROUNDS = 50
+
+
+def article_fields(i: int) -> dict[str, Any]:
+    return {
+        "id": str(149495524844875776 + i),
+        "author_id": "149495523871797248",
+        "author_name": "CS Alice",
+        "category_id": "149495524844875000",
+        "category_name": "tech",
+        "title": f"title {i}",
+        "content": "content " * 20,
+        "tags": "a,b",
+        "is_event": i % 2 == 0,
+        "event_week_day": 3,
+        "event_number_min": None,
+        "event_number_max": 10,
+        "event_conversation_id": None,
+        "interest_count": i,
+        "join_count": 0,
+        "comment_count": 2,
+    }
+
+
+def user_fields(i: int) -> dict[str, Any]:
+    return {
+        "id": SnowflakeID(149495523871797248 + i),
+        "username": f"user{i}",
+        "display_name": f"User {i}",
+        "gender": "F",
+        "department": "CS",
+        "onboarding_year": 2020,
+        "onboarding_month": 1,
+        "onboarding_day": 1,
+        "interest": "",
+    }
+
+
+ARTICLES = [article_fields(i) for i in range(ITEMS)]
+USERS = [user_fields(i) for i in range(ITEMS)]
+
+app = FastAPI()
+
+
+@app.get("/before/articles")
+def articles_before() -> list[ArticleView]:
+    return [ArticleView(**fields) for fields in ARTICLES]
+
+
+@app.get("/after/articles")
+def articles_after() -> list[ArticleView]:
+    return ViewResponse([
+        ArticleView(**fields) for fields in ARTICLES
+    ])  # type: ignore
+
+
+@app.get("/construct/articles")
+def articles_construct() -> list[ArticleView]:
+    return ViewResponse([
+        ArticleView.model_construct(**fields) for fields in ARTICLES
+    ])  # type: ignore
+
+
+@app.get("/before/users")
+def users_before() -> list[UserView]:
+    return [UserView(**fields) for fields in USERS]
+
+
+@app.get("/after/users")
+def users_after() -> list[UserView]:
+    return ViewResponse([
+        UserView(**fields) for fields in USERS
+    ])  # type: ignore
+
+
+@app.get("/construct/users")
+def users_construct() -> list[UserView]:
+    return ViewResponse([
+        UserView.model_construct(**fields) for fields in USERS
+    ])  # type: ignore
+
+
+def bench(func: Callable[[], Any]) -> float:
+    func()
+    start = perf_counter()
+    for _ in range(ROUNDS):
+        func()
+    return (perf_counter() - start) / ROUNDS * 1000
+
+
+if __name__ == "__main__":
+    with TestClient(app) as client:
+        for resource in ("articles", "users"):
+            expected = client.get(f"/before/{resource}").json()
+            timings = {}
+            for variant in ("before", "construct", "after"):
+                assert client.get(f"/{variant}/{resource}").json() == expected
+                timings[variant] = bench(
+                    lambda: client.get(f"/{variant}/{resource}")
+                )
+
+            print(f"GET {resource} x{ITEMS}: " + "  ".join(
+                f"{variant} {ms:6.2f} ms" for variant, ms in timings.items()
+            ) + f"  ({timings['before'] / timings['after']:.1f}x)")
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snowflake import SnowflakeGenerator  # noqa: E402
+
+TOTAL_IDS = 400_000
+
+
+def bench_next_id(threads: int) -> float:
+    generator = SnowflakeGenerator()
+    per_thread = TOTAL_IDS // threads
+
+    def work(_: int) -> None:
+        for _ in range(per_thread):
+            generator.next_id()
+
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(work, range(threads)))
+
+    return per_thread * threads / (perf_counter() - start)
+
+
+def bench_next_ids(threads: int, block: int) -> float:
+    generator = SnowflakeGenerator()
+    per_thread = TOTAL_IDS // threads
+
+    def work(_: int) -> None:
+        for _ in range(per_thread // block):
+            generator.next_ids(block)
+
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(work, range(threads)))
+
+    return per_thread // block * block * threads / (perf_counter() - start)
+
+
+if __name__ == "__main__":
+    for threads in (1, 2, 4, 8):
+        print(f"next_id      threads={threads}: {bench_next_id(threads):>12,.0f} ids/s")
+    for threads in (1, 8):
+        print(f"next_ids(500) threads={threads}: {bench_next_ids(threads, 500):>12,.0f} ids/s")
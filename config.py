@@ -1,16 +1,64 @@
-from os import getenv
+from os import cpu_count, getenv
 
 public_key_file = getenv("PUBLIC_KEY")
 private_key_file = getenv("PRIVATE_KEY")
 
 if public_key_file is None or private_key_file is None:
+    PUBLIC_KEY_FILE = None
+    PRIVATE_KEY_FILE = None
     PUBLIC_KEY = None
     PRIVATE_KEY = None
 else:
+    PUBLIC_KEY_FILE = public_key_file
+    PRIVATE_KEY_FILE = private_key_file
     with open(public_key_file) as f:
         PUBLIC_KEY = f.read()
     with open(private_key_file) as f:
         PRIVATE_KEY = f.read()
 
+JWT_KEY_DIR = getenv("JWT_KEY_DIR")
+JWT_KEY_RELOAD_INTERVAL = float(getenv("JWT_KEY_RELOAD_INTERVAL", "30"))
+JWT_CACHE_SIZE = int(getenv("JWT_CACHE_SIZE", "10000"))
+PASSWORD_HASH_WORKERS = int(getenv(
+    "PASSWORD_HASH_WORKERS",
+    str(min(4, cpu_count() or 1))
+))
+
 DB_URL = getenv("DB_URL", "sqlite+aiosqlite:///./test.db")
+DB_POOL_SIZE = int(getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_TIMEOUT = float(getenv("DB_POOL_TIMEOUT", "30"))
+DB_STATEMENT_CACHE_SIZE = int(getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+DB_STATEMENT_TIMEOUT = int(getenv("DB_STATEMENT_TIMEOUT", "0"))
+INTERNAL_TOKEN = getenv("INTERNAL_TOKEN")
+CHAT_BACKPLANE = getenv("CHAT_BACKPLANE", "memory")
+SNOWFLAKE_LEASE_TTL = float(getenv("SNOWFLAKE_LEASE_TTL", "30"))
+
 TRANSLATER_API_KEY = getenv("TRANSLATER_API_KEY", "")
+TRANSLATER_API_URL = getenv(
+    "TRANSLATER_API_URL",
+    "https://api-free.deepl.com/v2/translate"
+)
+TRANSLATION_POOL_SIZE = int(getenv("TRANSLATION_POOL_SIZE", "10"))
+TRANSLATION_BATCH_WINDOW = float(getenv("TRANSLATION_BATCH_WINDOW", "0.01"))
+TRANSLATION_BATCH_SIZE = int(getenv("TRANSLATION_BATCH_SIZE", "50"))
+TRANSLATION_CACHE_SIZE = int(getenv("TRANSLATION_CACHE_SIZE", "10000"))
+TRANSLATION_CACHE_TTL = float(getenv("TRANSLATION_CACHE_TTL", "604800"))
+TRANSLATION_WORKERS = int(getenv("TRANSLATION_WORKERS", "4"))
+TRANSLATION_QUEUE_SIZE = int(getenv("TRANSLATION_QUEUE_SIZE", "1000"))
+
+SEARCH_BACKEND = getenv("SEARCH_BACKEND", "database")
+SEARCH_INDEX_SNAPSHOT = getenv("SEARCH_INDEX_SNAPSHOT", "./search-index.bin")
+SEARCH_INDEX_RESCAN_WINDOW = float(getenv("SEARCH_INDEX_RESCAN_WINDOW", "600"))
+
+BULK_NDJSON_MAX_ARTICLES = int(getenv("BULK_NDJSON_MAX_ARTICLES", "10000"))
+BULK_NDJSON_MAX_BYTES = int(getenv("BULK_NDJSON_MAX_BYTES", str(16 << 20)))
+
+CATEGORY_REGISTRY_TTL = float(getenv("CATEGORY_REGISTRY_TTL", "60"))
+FEED_FANOUT_MAX_FOLLOWERS = int(getenv("FEED_FANOUT_MAX_FOLLOWERS", "10000"))
+
+FRIEND_GRAPH_CACHE_SIZE = int(getenv("FRIEND_GRAPH_CACHE_SIZE", "10000"))
+FRIEND_GRAPH_CACHE_TTL = float(getenv("FRIEND_GRAPH_CACHE_TTL", "300"))
+FRIEND_GRAPH_SYNC_INTERVAL = float(getenv("FRIEND_GRAPH_SYNC_INTERVAL", "1"))
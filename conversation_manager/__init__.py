@@ -1,7 +1,17 @@
+from .backplane import (
+    Backplane,
+    create_backplane,
+    InMemoryBackplane,
+    RabbitMQBackplane,
+)
 from .manager import ConversationManager
 from .utils import (
+    DEFAULT_MESSAGE_PAGE_SIZE,
+    MAX_MESSAGE_PAGE_SIZE,
     get_conversation_by_id,
     get_conversation_list_by_user_id,
+    get_conversation_views_by_user_id,
+    get_conversations_version,
     get_messages_by_conversation_id,
     get_private_conversation,
 )
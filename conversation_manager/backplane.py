@@ -0,0 +1,163 @@
+from aio_pika import connect_robust, ExchangeType, Message
+from aio_pika.abc import (
+    AbstractExchange,
+    AbstractIncomingMessage,
+    AbstractRobustConnection,
+)
+from orjson import dumps, loads
+
+from abc import ABC, abstractmethod
+from traceback import print_exc
+from typing import Awaitable, Callable, Optional
+
+BackplaneHandler = Callable[[list[int], int, dict], Awaitable[None]]
+
+
+class Backplane(ABC):
+    @abstractmethod
+    async def start(self, handler: BackplaneHandler) -> None:
+        ...
+
+    @abstractmethod
+    async def publish(
+        self,
+        user_ids: list[int],
+        conversation_id: int,
+        data: dict,
+    ) -> None:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryBackplane(Backplane):
+    subscribers: list[BackplaneHandler]
+
+    _handler: Optional[BackplaneHandler]
+
+    def __init__(
+        self,
+        subscribers: Optional[list[BackplaneHandler]] = None
+    ) -> None:
+        self.subscribers = subscribers if subscribers is not None else []
+
+        self._handler = None
+
+    def peer(self) -> "InMemoryBackplane":
+        return InMemoryBackplane(subscribers=self.subscribers)
+
+    async def start(self, handler: BackplaneHandler) -> None:
+        if self._handler is not None:
+            return
+
+        self._handler = handler
+        self.subscribers.append(handler)
+
+    async def publish(
+        self,
+        user_ids: list[int],
+        conversation_id: int,
+        data: dict,
+    ) -> None:
+        for handler in list(self.subscribers):
+            await handler(user_ids, conversation_id, data)
+
+    async def close(self) -> None:
+        if self._handler is not None:
+            self.subscribers.remove(self._handler)
+            self._handler = None
+
+
+class RabbitMQBackplane(Backplane):
+    url: str
+    exchange_name: str
+
+    _connection: Optional[AbstractRobustConnection]
+    _exchange: Optional[AbstractExchange]
+
+    def __init__(self, url: str, exchange_name: str) -> None:
+        self.url = url
+        self.exchange_name = exchange_name
+
+        self._connection = None
+        self._exchange = None
+
+    async def start(self, handler: BackplaneHandler) -> None:
+        if self._connection is not None:
+            return
+
+        connection = await connect_robust(self.url)
+        try:
+            channel = await connection.channel()
+            exchange = await channel.declare_exchange(
+                self.exchange_name,
+                ExchangeType.FANOUT,
+            )
+
+            # Every worker binds its own exclusive queue, so each one sees
+            # every message and delivers it to the sockets it happens to hold.
+            queue = await channel.declare_queue(
+                exclusive=True,
+                auto_delete=True
+            )
+            await queue.bind(exchange)
+        except:
+            await connection.close()
+            raise
+
+        async def on_message(message: AbstractIncomingMessage) -> None:
+            async with message.process():
+                try:
+                    envelope = loads(message.body)
+                    await handler(
+                        envelope["user_ids"],
+                        envelope["conversation_id"],
+                        envelope["data"],
+                    )
+                except:
+                    print_exc()
+
+        await queue.consume(on_message)
+
+        self._connection = connection
+        self._exchange = exchange
+
+    async def publish(
+        self,
+        user_ids: list[int],
+        conversation_id: int,
+        data: dict,
+    ) -> None:
+        if self._exchange is None:
+            raise RuntimeError("Backplane is not started.")
+
+        await self._exchange.publish(
+            Message(body=dumps({
+                "user_ids": user_ids,
+                "conversation_id": conversation_id,
+                "data": data,
+            })),
+            routing_key=""
+        )
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+
+        self._connection = None
+        self._exchange = None
+
+
+def create_backplane(kind: str) -> Backplane:
+    if kind == "rabbitmq":
+        from rabbitmq_service.sender import RABBITMQ_URL
+
+        return RabbitMQBackplane(
+            url=RABBITMQ_URL,
+            exchange_name="chat-backplane"
+        )
+    if kind == "memory":
+        return InMemoryBackplane()
+
+    raise ValueError(f"Unknown chat backplane: {kind}")
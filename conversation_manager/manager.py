@@ -1,28 +1,87 @@
 from fastapi import WebSocket
 from orjson import dumps
 from starlette.websockets import WebSocketState
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from asyncio import gather
+from asyncio import CancelledError, create_task, gather, sleep, Task
+from traceback import print_exc
 from typing import Optional
 
 from db import get_session
 from model import ConversationModel, MessageModel, UserModel
 from model.view import MessageView
-from snowflake import SnowflakeGenerator
-from translate import translate_text
+from snowflake import id_generator
+from translate import translation_pipeline
 
-id_generator = SnowflakeGenerator()
+from .backplane import Backplane, InMemoryBackplane
 
 
 class ConversationManager:
     user_ws: dict[int, list[WebSocket]]
     conversations: dict[int, list[int]]
+    backplane: Backplane
 
-    def __init__(self) -> None:
+    _started: bool
+    _retry: Optional[Task]
+    _retry_delay: float
+    _max_retry_delay: float
+
+    def __init__(
+        self,
+        backplane: Optional[Backplane] = None,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+    ) -> None:
         self.user_ws = {}
         self.conversations = {}
+        self.backplane = backplane or InMemoryBackplane()
+
+        self._started = False
+        self._retry = None
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+
+    async def __try_start(self) -> bool:
+        try:
+            await self.backplane.start(self.deliver)
+        except CancelledError:
+            raise
+        except:
+            print_exc()
+            return False
+
+        self._started = True
+        return True
+
+    async def __retry_loop(self) -> None:
+        delay = self._retry_delay
+        while not await self.__try_start():
+            await sleep(delay)
+            delay = min(delay * 2, self._max_retry_delay)
+
+        self._retry = None
+
+    async def start(self) -> None:
+        if self._started or self._retry is not None:
+            return
+
+        # An unreachable backplane must not stop the app from starting;
+        # messages are delivered locally until the retry loop connects.
+        if not await self.__try_start():
+            self._retry = create_task(self.__retry_loop())
+
+    async def close(self) -> None:
+        if self._retry is not None:
+            self._retry.cancel()
+            try:
+                await self._retry
+            except CancelledError:
+                pass
+            self._retry = None
+
+        await self.backplane.close()
+        self._started = False
 
     def connect(
         self,
@@ -59,12 +118,14 @@ class ConversationManager:
             elif user_id not in conversation_user_ids:
                 return
 
+            message_id = id_generator.next_id().value
             message_data = MessageModel(
-                id=id_generator.next_id().value,
+                id=message_id,
+                updated_seq=message_id,
                 author_id=user_id,
                 conversation_id=conversation_id,
                 context=message,
-                translated_context=await translate_text(message),
+                translated_context=None,
             )
 
             session.add(message_data)
@@ -75,51 +136,123 @@ class ConversationManager:
                 await session.rollback()
                 return
 
-            async def func(user_id: int) -> None:
-                async def __func(ws: WebSocket) -> None:
-                    if ws.client_state != WebSocketState.CONNECTED:
-                        await self.disconnect(
-                            ws=ws,
-                            user_id=user_id,
-                            conversation_id=conversation_id
-                        )
-                        return
+            await self.broadcast(
+                user_ids=conversation_user_ids,
+                conversation_id=conversation_id,
+                data=MessageView.from_model(message_data).model_dump()
+            )
+
+            async def on_translated(translated_context: str) -> None:
+                # An empty result means the translation failed; keep the
+                # original rather than overwriting it with nothing.
+                if not translated_context:
+                    return
 
-                    await ws.send_bytes(dumps(
-                        MessageView.from_model(message_data).model_dump()
+                async with get_session() as session:
+                    await session.execute(update(MessageModel).where(
+                        MessageModel.id == message_id
+                    ).values(
+                        translated_context=translated_context,
+                        updated_seq=id_generator.next_id().value,
                     ))
+                    await session.commit()
+
+                await self.broadcast(
+                    user_ids=conversation_user_ids,
+                    conversation_id=conversation_id,
+                    data={
+                        "type": "translation",
+                        "id": str(message_id),
+                        "conversation_id": str(conversation_id),
+                        "translated_context": translated_context,
+                    }
+                )
 
-                await gather(*[__func(ws) for ws in self.user_ws[user_id]])
+            await translation_pipeline.submit(
+                text=message,
+                callback=on_translated
+            )
+
+    async def broadcast(
+        self,
+        user_ids: list[int],
+        conversation_id: int,
+        data: dict,
+    ) -> None:
+        await self.start()
+
+        if self._started:
+            try:
+                await self.backplane.publish(
+                    user_ids=user_ids,
+                    conversation_id=conversation_id,
+                    data=data
+                )
+                return
+            except:
+                print_exc()
+
+        await self.deliver(
+            user_ids=user_ids,
+            conversation_id=conversation_id,
+            data=data
+        )
+
+    async def deliver(
+        self,
+        user_ids: list[int],
+        conversation_id: int,
+        data: dict,
+    ) -> None:
+        payload = dumps(data)
+
+        async def func(user_id: int) -> None:
+            async def __func(ws: WebSocket) -> None:
+                if ws.client_state == WebSocketState.CONNECTED:
+                    try:
+                        await ws.send_bytes(payload)
+                        return
+                    except:
+                        pass
+
+                await self.disconnect(
+                    ws=ws,
+                    user_id=user_id,
+                    conversation_id=conversation_id
+                )
 
             await gather(*[
-                func(user_id)
-                for user_id in conversation_user_ids
-                if self.user_ws.get(user_id) is not None
+                __func(ws) for ws in list(self.user_ws.get(user_id, []))
             ])
 
+        await gather(*[
+            func(user_id)
+            for user_id in user_ids
+            if self.user_ws.get(user_id) is not None
+        ])
+
     async def disconnect(
         self,
         ws: WebSocket,
         user_id: int,
         conversation_id: Optional[int] = None
     ) -> None:
-        if self.user_ws.get(user_id) is None:
+        sockets = self.user_ws.get(user_id)
+        if sockets is None or ws not in sockets:
             return
 
-        self.user_ws[user_id].remove(ws)
-        if len(self.user_ws[user_id]) == 0:
-            del self.user_ws[user_id]
-
-        if conversation_id is not None:
-            need_clean = True
-            for user_id in self.conversations.get(conversation_id, []):
-                if self.user_ws.get(user_id) is None:
-                    continue
+        sockets.remove(ws)
+        if len(sockets) == 0:
+            self.user_ws.pop(user_id, None)
 
-                need_clean = False
-                break
-            if need_clean:
-                del self.conversations[conversation_id]
+        # Backplane deliveries reach workers that never cached this
+        # conversation, so the entry may be missing here.
+        member_ids = self.conversations.get(conversation_id) \
+            if conversation_id is not None else None
+        if member_ids is not None and all(
+            self.user_ws.get(member_id) is None for member_id in member_ids
+        ):
+            self.conversations.pop(conversation_id, None)
 
         try:
             await ws.close()
@@ -1,4 +1,4 @@
-from sqlalchemy import func, insert, select
+from sqlalchemy import func, insert, or_, select
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -6,11 +6,19 @@ from typing import Optional
 
 from db import get_session
 from exceptions.conversation import CONVERSATION_NOT_FOUND, CREATE_CONVERSATION_ERROR
-from model import ConversationModel, MessageModel
+from model import (
+    ArticleModel,
+    CategoryModel,
+    ConversationModel,
+    MessageModel,
+    UserModel,
+)
 from model.relationships import conversation_user_table
-from snowflake import SnowflakeGenerator
+from model.view import ConversationView
+from snowflake import id_generator
 
-id_generator = SnowflakeGenerator()
+DEFAULT_MESSAGE_PAGE_SIZE = 50
+MAX_MESSAGE_PAGE_SIZE = 200
 
 
 async def get_conversation_by_id(
@@ -67,6 +75,99 @@ async def get_conversation_list_by_user_id(
         return list(conversations.scalars().unique().all())
 
 
+async def get_conversation_views_by_user_id(
+    user_id: int,
+    session: Optional[AsyncSession] = None
+) -> list[ConversationView]:
+    async with get_session(session) as session:
+        conversations = await ConversationView.from_models(
+            models=await get_conversation_list_by_user_id(
+                user_id=user_id,
+                session=session
+            ),
+            session=session
+        )
+
+    def last_activity(conversation: ConversationView) -> int:
+        if conversation.latest_message is None:
+            return int(conversation.id)
+        return max(
+            int(conversation.id),
+            int(conversation.latest_message.id)
+        )
+
+    return sorted(conversations, key=last_activity, reverse=True)
+
+
+async def get_conversations_version(
+    user_id: int,
+    session: Optional[AsyncSession] = None
+) -> tuple[int, int, int, int, int, int, int]:
+    async with get_session(session) as session:
+        # One (conversation_id, updated_seq) index probe per conversation the
+        # user is in, rather than an aggregate over all of their messages.
+        latest_message_seq = select(
+            func.max(MessageModel.updated_seq)
+        ).where(
+            MessageModel.conversation_id ==
+            conversation_user_table.c.conversations_id
+        ).scalar_subquery()
+
+        conversation_count, latest_conversation_id, latest_message_seq = (
+            await session.execute(select(
+                func.count(),
+                func.max(conversation_user_table.c.conversations_id),
+                func.max(latest_message_seq),
+            ).where(
+                conversation_user_table.c.user_id == user_id
+            ))
+        ).one()
+
+        # The views also embed every member and the event article, whose
+        # counters, author and category can all change without a message.
+        mine = conversation_user_table.alias("mine")
+        members = conversation_user_table.alias("members")
+        conversation_ids = select(mine.c.conversations_id).where(
+            mine.c.user_id == user_id
+        )
+        member_ids = select(members.c.user_id).where(
+            members.c.conversations_id.in_(conversation_ids)
+        )
+        events = select(
+            ArticleModel.author_id,
+            ArticleModel.category_id,
+            ArticleModel.updated_seq,
+        ).where(
+            ArticleModel.event_conversation_id.in_(conversation_ids)
+        ).subquery()
+
+        member_count, users_seq, event_seq, category_seq = (
+            await session.execute(select(
+                select(func.count()).select_from(
+                    member_ids.subquery()
+                ).scalar_subquery(),
+                select(func.max(UserModel.updated_seq)).where(or_(
+                    UserModel.id.in_(member_ids),
+                    UserModel.id.in_(select(events.c.author_id)),
+                )).scalar_subquery(),
+                select(func.max(events.c.updated_seq)).scalar_subquery(),
+                select(func.max(CategoryModel.updated_seq)).where(
+                    CategoryModel.id.in_(select(events.c.category_id))
+                ).scalar_subquery(),
+            ))
+        ).one()
+
+        return (
+            conversation_count,
+            latest_conversation_id or 0,
+            latest_message_seq or 0,
+            member_count,
+            users_seq or 0,
+            event_seq or 0,
+            category_seq or 0,
+        )
+
+
 async def get_private_conversation(
     user_id_1: int,
     user_id_2: int,
@@ -94,7 +195,7 @@ async def get_private_conversation(
             return conversation
 
         conversation = ConversationModel(
-            id=id_generator.next_id(),
+            id=id_generator.next_id().value,
             title="",
             is_private=True
         )
@@ -121,7 +222,10 @@ async def get_private_conversation(
 async def get_messages_by_conversation_id(
     user_id: int,
     conversation_id: int,
-    session: Optional[AsyncSession] = None
+    session: Optional[AsyncSession] = None,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = DEFAULT_MESSAGE_PAGE_SIZE,
 ) -> list[MessageModel]:
     async with get_session(session) as session:
         await get_conversation_by_id(
@@ -130,12 +234,26 @@ async def get_messages_by_conversation_id(
             session=session
         )
 
-        messages = await session.execute(select(
+        stat = select(
             MessageModel
         ).where(
             MessageModel.conversation_id == conversation_id,
-        ).order_by(
-            MessageModel.id.asc()
-        ))
+        )
+
+        if before_id is not None:
+            stat = stat.where(MessageModel.id < before_id)
+        if after_id is not None:
+            stat = stat.where(MessageModel.id > after_id)
+
+        # Both directions walk the (conversation_id, id) index from the
+        # cursor; pages are always returned newest first.
+        ascending = after_id is not None and before_id is None
+        stat = stat.order_by(
+            MessageModel.id.asc() if ascending else MessageModel.id.desc()
+        ).limit(limit)
+
+        messages = list((await session.execute(stat)).scalars().all())
+        if ascending:
+            messages.reverse()
 
-        return list(messages.scalars().all())
+        return messages
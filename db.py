@@ -1,18 +1,140 @@
 from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from contextlib import asynccontextmanager
-from typing import Annotated, AsyncGenerator, Optional
+from time import perf_counter
+from typing import Annotated, Any, AsyncGenerator, Optional
 
-from config import DB_URL
+from config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_STATEMENT_TIMEOUT,
+    DB_URL,
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(DB_URL)  # , echo=True)
+class PoolStats:
+    checkouts: int
+    connects: int
+    overflow_connects: int
+    timeouts: int
+    total_wait: float
+    max_wait: float
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.connects = 0
+        self.overflow_connects = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "overflow_connects": self.overflow_connects,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (
+                self.total_wait / self.checkouts * 1000
+            ) if self.checkouts else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def _do_get(self) -> ConnectionPoolEntry:
+        started_at = perf_counter()
+        try:
+            entry = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.timeouts += 1
+            raise
+
+        pool_stats.record_wait(perf_counter() - started_at)
+        return entry
+
+
+def __engine_options(url: str) -> dict[str, Any]:
+    parsed = make_url(url)
+
+    # In-memory SQLite keeps a single static connection; there is no pool to
+    # size.
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None, "", ":memory:"
+    ):
+        return {}
+
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedPool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+
+    if parsed.get_driver_name() == "asyncpg":
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": DB_STATEMENT_CACHE_SIZE,
+        }
+        if DB_STATEMENT_TIMEOUT > 0:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(DB_STATEMENT_TIMEOUT),
+            }
+        options["connect_args"] = connect_args
+
+    return options
+
+
+engine = create_async_engine(DB_URL, **__engine_options(DB_URL))  # , echo=True)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def __on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+    pool_stats.connects += 1
+    # Only a queue pool overflows; in-memory SQLite runs on a StaticPool.
+    pool = engine.pool
+    if isinstance(pool, AsyncAdaptedQueuePool) and pool.overflow() > 0:
+        pool_stats.overflow_connects += 1
+
+
+def get_pool_status() -> dict[str, Any]:
+    pool = engine.pool
+    status: dict[str, Any] = {"pool": pool.__class__.__name__}
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": DB_MAX_OVERFLOW,
+        })
+
+    status.update(pool_stats.snapshot())
+    return status
 
 
 @asynccontextmanager
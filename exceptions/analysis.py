@@ -0,0 +1,7 @@
+from fastapi import HTTPException, status
+
+
+ANALYSIS_NOT_IMPLEMENTED = HTTPException(
+    status_code=status.HTTP_501_NOT_IMPLEMENTED,
+    detail="This analysis is not available yet."
+)
@@ -5,3 +5,33 @@ CREATE_ARTICLE_ERROR = HTTPException(
     status_code=status.HTTP_400_BAD_REQUEST,
     detail="Failed to create article."
 )
+
+UPDATE_ARTICLE_ERROR = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Failed to update article."
+)
+
+ARTICLE_NOT_FOUND = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Article not found."
+)
+
+CATEGORY_NOT_FOUND = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Category does not exist."
+)
+
+EVENT_NOT_FOUND = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Event not found."
+)
+
+EVENT_FULL = HTTPException(
+    status_code=status.HTTP_409_CONFLICT,
+    detail="Event is full."
+)
+
+BULK_IMPORT_TOO_LARGE = HTTPException(
+    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    detail="Bulk import is too large."
+)
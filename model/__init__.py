@@ -3,8 +3,11 @@ from .article_history import ArticleHistory, ArticleHistoryModel
 from .category import Category, CategoryModel
 from .comment import Comment, CommentModel
 from .conversation import Conversation, ConversationModel
+from .instance_lease import InstanceLeaseModel
 from .message import Message, MessageModel
+from .search_document import SearchDocument, SearchDocumentModel
 from .search_history import SearchHistory, SearchHistoryModel
+from .translation_cache import TranslationCacheEntry, TranslationCacheEntryModel
 from .user import User, UserModel
 
 Article.model_rebuild()
@@ -13,5 +16,7 @@ Category.model_rebuild()
 Comment.model_rebuild()
 Conversation.model_rebuild()
 Message.model_rebuild()
+SearchDocument.model_rebuild()
 SearchHistory.model_rebuild()
+TranslationCacheEntry.model_rebuild()
 User.model_rebuild()
@@ -1,5 +1,13 @@
 from pydantic import Field
-from sqlalchemy import Boolean, ForeignKey, Integer, Text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ForeignKey,
+    Index,
+    Integer,
+    Text,
+    true,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from typing import Optional, TYPE_CHECKING
@@ -16,6 +24,14 @@ if TYPE_CHECKING:
 
 class ArticleModel(IdBase):
     __tablename__ = "articles"
+    __table_args__ = (
+        Index(
+            "ix_articles_category_id_fanned_out_id",
+            "category_id",
+            "fanned_out",
+            "id"
+        ),
+    )
 
     author_id: Mapped[int] = mapped_column(
         ForeignKey("users.id"),
@@ -80,6 +96,42 @@ class ArticleModel(IdBase):
         back_populates="event",
     )
 
+    interest_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    join_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    comment_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    # False when the article was posted to a category too large to fan out
+    # to; feeds pull those articles on read instead.
+    fanned_out: Mapped[bool] = mapped_column(
+        Boolean,
+        nullable=False,
+        default=True,
+        server_default=true(),
+    )
+    # A fresh snowflake on every write to the row, counters included, so
+    # max(updated_seq) changes whenever any listed article does.
+    updated_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        index=True,
+    )
+
     comments: Mapped[list["CommentModel"]] = relationship(
         back_populates="article",
     )
@@ -178,6 +230,36 @@ class Article(IdBaseModel[ArticleModel]):
         description="The conversation associated with the event.",
     )
 
+    interest_count: int = Field(
+        default=0,
+        title="Interest Count",
+        description="Number of users interested in the article.",
+        ge=0,
+    )
+    join_count: int = Field(
+        default=0,
+        title="Join Count",
+        description="Number of users who have joined the event.",
+        ge=0,
+    )
+    comment_count: int = Field(
+        default=0,
+        title="Comment Count",
+        description="Number of comments on the article.",
+        ge=0,
+    )
+    fanned_out: bool = Field(
+        default=True,
+        title="Fanned Out",
+        description="Whether the article was written to follower timelines.",
+    )
+    updated_seq: int = Field(
+        default=0,
+        title="Updated Sequence",
+        description="Snowflake issued on the latest write to the article.",
+        ge=0,
+    )
+
     comments: list["Comment"] = Field(
         default_factory=list,
         title="Comments",
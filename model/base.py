@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field
-from sqlalchemy import BigInteger
+from sqlalchemy import BigInteger, ColumnElement, true
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
-from typing import Any, cast, Generic, Self, TypeVar
+from datetime import datetime
+from typing import Any, cast, Generic, Optional, Self, TypeVar
 try:
     from types import get_original_bases
 except ImportError:
@@ -26,6 +27,24 @@ class IdBase(Base):
         nullable=False
     )
 
+    @classmethod
+    def created_between(
+        cls,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> ColumnElement[bool]:
+        if start is not None and end is not None:
+            return cls.id.between(
+                SnowflakeID.lower_bound(start).value,
+                SnowflakeID.upper_bound(end).value
+            )
+        if start is not None:
+            return cls.id >= SnowflakeID.lower_bound(start).value
+        if end is not None:
+            return cls.id <= SnowflakeID.upper_bound(end).value
+
+        return true()
+
 
 class SQLBaseModel(BaseModel, Generic[T]):
     @classmethod
@@ -1,5 +1,5 @@
 from pydantic import Field
-from sqlalchemy import Text
+from sqlalchemy import BigInteger, Integer, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from typing import TYPE_CHECKING
@@ -28,6 +28,21 @@ class CategoryModel(IdBase):
     followers: Mapped[list["UserModel"]] = relationship(
         secondary=follow_category_table,
     )
+    follower_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    # A fresh snowflake on every rename, so article views that embed the
+    # category name can version themselves on max(updated_seq).
+    updated_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        index=True,
+    )
 
 
 class Category(IdBaseModel[CategoryModel]):
@@ -47,3 +62,15 @@ class Category(IdBaseModel[CategoryModel]):
         title="Followers",
         description="List of users following this category.",
     )
+    follower_count: int = Field(
+        default=0,
+        title="Follower Count",
+        description="Number of users following this category.",
+        ge=0,
+    )
+    updated_seq: int = Field(
+        default=0,
+        title="Updated Sequence",
+        description="Snowflake issued on the latest rename of the category.",
+        ge=0,
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import BigInteger, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db import Base
+
+
+class InstanceLeaseModel(Base):
+    __tablename__ = "snowflake_instance_leases"
+
+    instance_id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=False,
+    )
+    owner: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+    expires_at: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        index=True,
+    )
@@ -1,8 +1,8 @@
 from pydantic import Field
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import BigInteger, ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from .base import IdBase, IdBaseModel
 
@@ -13,6 +13,14 @@ if TYPE_CHECKING:
 
 class MessageModel(IdBase):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_conversation_id_id", "conversation_id", "id"),
+        Index(
+            "ix_messages_conversation_id_updated_seq",
+            "conversation_id",
+            "updated_seq"
+        ),
+    )
 
     author_id: Mapped[int] = mapped_column(
         ForeignKey("users.id"),
@@ -25,7 +33,6 @@ class MessageModel(IdBase):
     conversation_id: Mapped[int] = mapped_column(
         ForeignKey("conversations.id"),
         nullable=False,
-        index=True
     )
     conversation: Mapped["ConversationModel"] = relationship(
         back_populates="messages",
@@ -36,10 +43,16 @@ class MessageModel(IdBase):
         nullable=False,
     )
 
-    translated_context: Mapped[str] = mapped_column(
+    translated_context: Mapped[Optional[str]] = mapped_column(
         Text,
         nullable=True,
     )
+    updated_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
 
 
 class Message(IdBaseModel[MessageModel]):
@@ -64,7 +77,14 @@ class Message(IdBaseModel[MessageModel]):
         title="Message Content",
         description="The content of the message.",
     )
-    translated_context: str = Field(
+    translated_context: Optional[str] = Field(
+        default=None,
         title="Translated Content",
         description="The translated content of the message, if available.",
     )
+    updated_seq: int = Field(
+        default=0,
+        title="Updated Sequence",
+        description="Snowflake issued on the latest write to the message.",
+        ge=0,
+    )
@@ -1,5 +1,6 @@
 from .conversation_users import conversation_user_table
 from .friends import friend_table
+from .timelines import timeline_table
 from .user_follow_categories import follow_category_table
 from .user_interest_articles import interest_table
 from .user_join_events import join_event_table
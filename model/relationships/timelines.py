@@ -0,0 +1,10 @@
+from sqlalchemy import Column, ForeignKey, Table
+
+from db import Base
+
+timeline_table = Table(
+    "timelines",
+    Base.metadata,
+    Column("user_id", ForeignKey("users.id"), primary_key=True),
+    Column("article_id", ForeignKey("articles.id"), primary_key=True),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Column, ForeignKey, Table, UniqueConstraint
 
 from db import Base
 
@@ -7,4 +7,5 @@ interest_table = Table(
     Base.metadata,
     Column("user_id", ForeignKey("users.id"), index=True),
     Column("article_id", ForeignKey("articles.id"), index=True),
+    UniqueConstraint("user_id", "article_id"),
 )
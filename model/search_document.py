@@ -0,0 +1,71 @@
+from pydantic import Field
+from sqlalchemy import BigInteger, DDL, event, Index, String, text, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import IdBase, IdBaseModel
+
+
+class SearchDocumentModel(IdBase):
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        Index(
+            "ix_search_documents_tokens_tsv",
+            text("to_tsvector('simple', tokens)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    kind: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+    )
+    article_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        index=True,
+    )
+    tokens: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+
+
+# SQLite has no tsvector; an external-content FTS5 table kept in sync by
+# triggers indexes the same pre-tokenized column instead.
+for statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "tokens, content='search_documents', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON "
+    "search_documents BEGIN INSERT INTO search_documents_fts(rowid, tokens) "
+    "VALUES (new.id, new.tokens); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON "
+    "search_documents BEGIN INSERT INTO search_documents_fts("
+    "search_documents_fts, rowid, tokens) VALUES ('delete', old.id, "
+    "old.tokens); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON "
+    "search_documents BEGIN INSERT INTO search_documents_fts("
+    "search_documents_fts, rowid, tokens) VALUES ('delete', old.id, "
+    "old.tokens); INSERT INTO search_documents_fts(rowid, tokens) VALUES "
+    "(new.id, new.tokens); END",
+):
+    event.listen(
+        SearchDocumentModel.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite")
+    )
+
+
+class SearchDocument(IdBaseModel[SearchDocumentModel]):
+    kind: str = Field(
+        title="Kind",
+        description="Type of the indexed row.",
+        examples=["article", "comment"],
+    )
+    article_id: int = Field(
+        title="Article ID",
+        description="ID of the article the indexed row belongs to.",
+    )
+    tokens: str = Field(
+        title="Tokens",
+        description="Space separated search tokens of the indexed text.",
+    )
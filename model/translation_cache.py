@@ -0,0 +1,52 @@
+from pydantic import Field
+from sqlalchemy import BigInteger, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import IdBase, IdBaseModel
+
+
+class TranslationCacheEntryModel(IdBase):
+    __tablename__ = "translation_cache_entries"
+    __table_args__ = (
+        UniqueConstraint("text_hash", "target_language"),
+    )
+
+    text_hash: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+    )
+    target_language: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+    )
+    translated_text: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+    # A fresh snowflake on every write; its timestamp starts the TTL.
+    refreshed_at: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        index=True,
+    )
+
+
+class TranslationCacheEntry(IdBaseModel[TranslationCacheEntryModel]):
+    text_hash: str = Field(
+        title="Text Hash",
+        description="SHA-256 of the normalized source text.",
+    )
+    target_language: str = Field(
+        title="Target Language",
+        description="Language code the text was translated into.",
+        examples=["EN", "ZH-HANT"],
+    )
+    translated_text: str = Field(
+        title="Translated Text",
+        description="The translated text.",
+    )
+    refreshed_at: int = Field(
+        title="Refreshed At",
+        description="Snowflake issued on the latest write to the entry.",
+        ge=0,
+    )
@@ -72,6 +72,25 @@ class UserModel(IdBase):
         String(60),
         nullable=False
     )
+    # A fresh snowflake on every profile write, so views that embed the
+    # user's name or department can version themselves on max(updated_seq).
+    updated_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        index=True,
+    )
+    # A fresh snowflake whenever the user's follows or friends change, which
+    # reshapes their feed without touching any article. Workers also scan it
+    # to drop cached friend sets another worker changed.
+    feed_seq: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+        index=True,
+    )
 
     articles: Mapped[list["ArticleModel"]] = relationship(
         back_populates="author",
@@ -159,6 +178,18 @@ class User(IdBaseModel[UserModel]):
         description="The password for the user account.",
         examples=["strongpassword123"],
     )
+    updated_seq: int = Field(
+        default=0,
+        title="Updated Sequence",
+        description="Snowflake issued on the latest profile write.",
+        ge=0,
+    )
+    feed_seq: int = Field(
+        default=0,
+        title="Feed Sequence",
+        description="Snowflake issued on the latest follow or friend change.",
+        ge=0,
+    )
 
     articles: list["Article"] = Field(
         default_factory=list,
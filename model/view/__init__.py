@@ -1,6 +1,8 @@
-from .article_view import ArticleView
+from .article_view import ArticleBulkResultView, ArticleView
 from .category_view import CategoryView
 from .comment_view import CommentView
 from .conversation_view import ConversationView
 from .message_view import MessageView
+from .response import encode_default, ViewResponse
+from .search_view import SearchPageView, SearchResultView
 from .user_view import UserView
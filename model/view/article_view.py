@@ -1,15 +1,13 @@
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from typing import Optional, Self
+from typing import Optional, Self, Sequence
 
 from db import get_session
 
-from .user_view import UserView
 from ..article import ArticleModel
 from ..category import CategoryModel
-from ..relationships import interest_table, join_event_table
 from ..user import UserModel
 
 
@@ -29,6 +27,24 @@ class ArticleView(BaseModel):
     event_conversation_id: Optional[str] = None
     interest_count: int
     join_count: int
+    comment_count: int
+
+    @staticmethod
+    def __author_fields(
+        model: ArticleModel,
+        author: Optional[tuple[str, str]],
+    ) -> tuple[Optional[int], str]:
+        if model.author_visibility == 0:
+            return None, "匿名"
+        if author is None:
+            return None, "未知用户"
+
+        display_name, department = author
+        if model.author_visibility == 0b10:
+            return None, department
+        if model.author_visibility == 0b01:
+            return model.author_id, display_name
+        return model.author_id, f"{department} {display_name}"
 
     @classmethod
     async def from_model(
@@ -36,81 +52,97 @@ class ArticleView(BaseModel):
         model: ArticleModel,
         session: Optional[AsyncSession] = None
     ) -> Self:
+        return (await cls.from_models([model], session=session))[0]
+
+    @classmethod
+    async def from_models(
+        cls,
+        models: Sequence[ArticleModel],
+        session: Optional[AsyncSession] = None
+    ) -> list[Self]:
+        if len(models) == 0:
+            return []
+
+        authors: dict[int, tuple[str, str]] = {}
+        categories: dict[int, str] = {}
+        missing_author_ids: set[int] = set()
+        missing_category_ids: set[int] = set()
+
+        for model in models:
+            unloaded = inspect(model).unloaded
+
+            if model.author_visibility != 0 and model.author_id:
+                if "author" in unloaded:
+                    missing_author_ids.add(model.author_id)
+                elif model.author is not None:
+                    authors[model.author_id] = (
+                        model.author.display_name,
+                        model.author.department,
+                    )
+
+            if model.category_id:
+                if "category" in unloaded:
+                    missing_category_ids.add(model.category_id)
+                elif model.category is not None:
+                    categories[model.category_id] = model.category.name
+
         async with get_session(session) as session:
-            author_id = None
-            author_name = ""
-            if model.author_visibility == 0:
-                author_name = "匿名"
-            else:
-                try:
-                    author = model.author
-                except:
-                    author = await session.get(
-                        UserModel,
-                        model.author_id
-                    ) if model.author_id else None
-
-                if author is None:
-                    author_name = "未知用户"
-                else:
-                    if model.author_visibility == 0b10:
-                        author_name = author.department
-                    elif model.author_visibility == 0b01:
-                        author_id = model.author_id
-                        author_name = author.display_name
-                    else:
-                        author_id = model.author_id
-                        author_name = f"{author.department} {author.display_name}"
-
-            category_id = model.category_id
-            category_name = None
-            try:
-                if model.category:
-                    category_name = model.category.name
-            except:
-                category = await session.get(
-                    CategoryModel,
+            if missing_author_ids:
+                result = (await session.execute(select(
+                    UserModel.id,
+                    UserModel.display_name,
+                    UserModel.department,
+                ).where(
+                    UserModel.id.in_(missing_author_ids)
+                ))).all()
+
+                for user_id, display_name, department in result:
+                    authors[user_id] = (display_name, department)
+
+            if missing_category_ids:
+                result = (await session.execute(select(
+                    CategoryModel.id,
+                    CategoryModel.name,
+                ).where(
+                    CategoryModel.id.in_(missing_category_ids)
+                ))).all()
+
+                for category_id, name in result:
+                    categories[category_id] = name
+
+        views = []
+        for model in models:
+            author_id, author_name = cls.__author_fields(
+                model,
+                authors.get(model.author_id)
+            )
+
+            views.append(cls(
+                id=str(model.id),
+                author_id=str(author_id) if author_id is not None else None,
+                author_name=author_name,
+                category_id=str(
                     model.category_id
-                ) if model.category_id else None
+                ) if model.category_id else None,
+                category_name=categories.get(model.category_id),
+                title=model.title,
+                content=model.content,
+                tags=model.tags,
+                is_event=model.is_event,
+                event_week_day=model.event_week_day,
+                event_number_min=model.event_number_min,
+                event_number_max=model.event_number_max,
+                event_conversation_id=str(
+                    model.event_conversation_id
+                ) if model.event_conversation_id else None,
+                interest_count=model.interest_count,
+                join_count=model.join_count,
+                comment_count=model.comment_count,
+            ))
 
-                if category:
-                    category_name = category.name
+        return views
 
-            interest_count = 0
-            join_count = 0
 
-            result = (await session.execute(
-                select(
-                    func.count(interest_table.c.user_id),
-                    func.count(join_event_table.c.user_id),
-                ).where(
-                    interest_table.c.article_id == model.id,
-                    join_event_table.c.article_id == model.id,
-                )
-            )).first()
-
-            if result is None:
-                interest_count = 0
-                join_count = 0
-            else:
-                interest_count, join_count = result
-
-        return cls(
-            id=str(model.id),
-            author_id=str(author_id) if author_id is not None else None,
-            author_name=author_name,
-            category_id=str(category_id) if category_id else None,
-            category_name=category_name,
-            title=model.title,
-            content=model.content,
-            tags=model.tags,
-            is_event=model.is_event,
-            event_week_day=model.event_week_day,
-            event_number_min=model.event_number_min,
-            event_number_max=model.event_number_max,
-            event_conversation_id=str(
-                model.event_conversation_id
-            ) if model.event_conversation_id else None,
-            interest_count=interest_count,
-            join_count=join_count
-        )
+class ArticleBulkResultView(BaseModel):
+    created: int
+    ids: list[str]
@@ -1,9 +1,8 @@
 from pydantic import BaseModel
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import func, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from typing import Optional, Self
+from typing import Optional, Self, Sequence
 
 from db import get_session
 from model import ConversationModel
@@ -31,65 +30,107 @@ class ConversationView(BaseModel):
         model: ConversationModel,
         session: Optional[AsyncSession] = None
     ) -> Self:
-        async with get_session(session) as session:
-            try:
-                users = [
+        return (await cls.from_models([model], session=session))[0]
+
+    @classmethod
+    async def from_models(
+        cls,
+        models: Sequence[ConversationModel],
+        session: Optional[AsyncSession] = None
+    ) -> list[Self]:
+        if len(models) == 0:
+            return []
+
+        conversation_ids = [model.id for model in models]
+        users: dict[int, list[UserView]] = {}
+        events: dict[int, ArticleModel] = {}
+        missing_user_ids: set[int] = set()
+        missing_event_ids: set[int] = set()
+
+        for model in models:
+            unloaded = inspect(model).unloaded
+
+            if "users" in unloaded:
+                missing_user_ids.add(model.id)
+            else:
+                users[model.id] = [
                     UserView.from_model(user)
                     for user in model.users
                 ]
-            except:
-                users = [
-                    UserView.from_model(user)
-                    for user in (await session.execute(select(
-                        UserModel
-                    ).join(
-                        conversation_user_table,
-                        conversation_user_table.c.conversations_id == model.id
-                    ).where(
-                        UserModel.id == conversation_user_table.c.user_id
-                    ))).scalars().all()
-                ]
 
-            event = None
-            try:
-                if model.event is not None:
-                    event = await ArticleView.from_model(
-                        model.event,
-                        session
+            if "event" in unloaded:
+                missing_event_ids.add(model.id)
+            elif model.event is not None:
+                events[model.id] = model.event
+
+        async with get_session(session) as session:
+            if missing_user_ids:
+                result = (await session.execute(select(
+                    conversation_user_table.c.conversations_id,
+                    UserModel,
+                ).join(
+                    conversation_user_table,
+                    conversation_user_table.c.user_id == UserModel.id
+                ).where(
+                    conversation_user_table.c.conversations_id.in_(
+                        missing_user_ids
+                    )
+                ))).all()
+
+                for conversation_id, user in result:
+                    users.setdefault(conversation_id, []).append(
+                        UserView.from_model(user)
                     )
-            except:
+
+            if missing_event_ids:
                 result = (await session.execute(select(
                     ArticleModel
-                ).options(
-                    joinedload(ArticleModel.author),
-                    joinedload(ArticleModel.category),
                 ).where(
-                    ArticleModel.event_conversation_id == model.id
-                ))).scalar()
+                    ArticleModel.event_conversation_id.in_(missing_event_ids)
+                ))).scalars().all()
 
-                if result is not None:
-                    event = await ArticleView.from_model(
-                        result,
-                        session=session
-                    )
+                for event in result:
+                    events[event.event_conversation_id] = event
 
-            latest_message = (await session.execute(select(
-                MessageModel
+            # The correlated max(id) is answered from the
+            # (conversation_id, id) index once per conversation, so this
+            # stays a single round-trip without scanning message history.
+            latest_id = select(
+                func.max(MessageModel.id)
             ).where(
-                MessageModel.conversation_id == model.id
-            ).order_by(
-                MessageModel.id.desc()
-            ).limit(1))).scalar()
+                MessageModel.conversation_id == ConversationModel.id
+            ).correlate(
+                ConversationModel
+            ).scalar_subquery()
+
+            latest_messages = {
+                message.conversation_id: MessageView.from_model(message)
+                for message in (await session.execute(select(
+                    MessageModel
+                ).where(
+                    MessageModel.id.in_(select(latest_id).where(
+                        ConversationModel.id.in_(conversation_ids)
+                    ))
+                ))).scalars().all()
+            }
 
-            latest_message = MessageView.from_model(
-                model=latest_message,
-            ) if latest_message else None
+            event_models = list(events.values())
+            event_views = dict(zip(
+                [event.event_conversation_id for event in event_models],
+                await ArticleView.from_models(
+                    models=event_models,
+                    session=session
+                )
+            ))
 
-            return cls(
+        return [
+            cls(
                 id=str(model.id),
                 title=model.title,
                 is_private=model.is_private,
-                event=event,
-                users=users,
-                latest_message=latest_message
+                event=event_views.get(model.id),
+                users=users.get(model.id, []),
+                latest_message=latest_messages.get(model.id)
             )
+            for model in models
+        ]
@@ -16,7 +16,7 @@ class MessageView(BaseModel):
     author_id: str
     conversation_id: str
     context: str
-    translated_context: str
+    translated_context: Optional[str] = None
 
     @classmethod
     def from_model(
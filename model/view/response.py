@@ -0,0 +1,24 @@
+from fastapi import Response
+from orjson import dumps, OPT_NON_STR_KEYS
+from pydantic import BaseModel
+
+from typing import Any
+
+from snowflake import SnowflakeID
+
+
+def encode_default(obj: Any) -> Any:
+    # View models carry only plain fields, so their instance dict is already
+    # the JSON shape; this skips pydantic's serializer entirely.
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    if isinstance(obj, SnowflakeID):
+        return str(obj.value)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ViewResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content, default=encode_default, option=OPT_NON_STR_KEYS)
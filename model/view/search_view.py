@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+from typing import Literal, Optional
+
+from .article_view import ArticleView
+from .comment_view import CommentView
+
+
+class SearchResultView(BaseModel):
+    type: Literal["article", "comment"]
+    score: float
+    article: Optional[ArticleView] = None
+    comment: Optional[CommentView] = None
+
+
+class SearchPageView(BaseModel):
+    results: list[SearchResultView]
+    next_offset: Optional[int] = None
@@ -1,15 +1,23 @@
 from fastapi import APIRouter
 
+from .analysis import router as analysis_router
 from .articles import router as articles_router
 from .category import router as category_router
+from .events import router as events_router
 from .friends import router as friends_router
+from .internal import router as internal_router
 from .message import router as message_router
+from .search import router as search_router
 from .user import router as user_router
 
 ROUTER = APIRouter()
 
+ROUTER.include_router(analysis_router)
 ROUTER.include_router(articles_router)
 ROUTER.include_router(category_router)
+ROUTER.include_router(events_router)
 ROUTER.include_router(friends_router)
+ROUTER.include_router(internal_router)
 ROUTER.include_router(message_router)
+ROUTER.include_router(search_router)
 ROUTER.include_router(user_router)
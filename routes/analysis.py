@@ -1,8 +1,17 @@
 from fastapi import APIRouter
 
+from datetime import datetime
+from typing import Optional
+
+from auth import UserIdDepends
+from db import SessionDep
+from exceptions.analysis import ANALYSIS_NOT_IMPLEMENTED
+from services.article import count_articles
+
 router = APIRouter(
     prefix="/analysis",
-    tags=["Analysis"]
+    tags=["Analysis"],
+    dependencies=[UserIdDepends],
 )
 
 
@@ -10,60 +19,82 @@ router = APIRouter(
     path="/search"
 )
 async def search_analysis():
-    pass
+    raise ANALYSIS_NOT_IMPLEMENTED
 
 
 @router.get(
-    path="/post-count"
+    path="/post-count",
+    description="Count non-event articles created within the optional "
+    "`start` / `end` window."
 )
-async def post_count_analysis():
-    pass
+async def post_count_analysis(
+    session: SessionDep,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> int:
+    return await count_articles(
+        is_event=False,
+        start=start,
+        end=end,
+        session=session
+    )
 
 
 @router.get(
-    path="/event-count"
+    path="/event-count",
+    description="Count events created within the optional `start` / `end` "
+    "window."
 )
-async def event_count_analysis():
-    pass
+async def event_count_analysis(
+    session: SessionDep,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> int:
+    return await count_articles(
+        is_event=True,
+        start=start,
+        end=end,
+        session=session
+    )
 
 
 @router.get(
     path="/emotion"
 )
 async def emotion_analysis():
-    pass
+    raise ANALYSIS_NOT_IMPLEMENTED
 
 
 @router.get(
     path="/emotion/search"
 )
 async def emotion_search_analysis():
-    pass
+    raise ANALYSIS_NOT_IMPLEMENTED
 
 
 @router.get(
     path="/emotion/plot"
 )
 async def emotion_plot_analysis():
-    pass
+    raise ANALYSIS_NOT_IMPLEMENTED
 
 
 @router.get(
     path="/keywords"
 )
 async def keywords_analysis():
-    pass
+    raise ANALYSIS_NOT_IMPLEMENTED
 
 
 @router.get(
     path="/keywords/{keyword_id}"
 )
 async def keyword_detail_analysis(keyword_id: int):
-    pass
+    raise ANALYSIS_NOT_IMPLEMENTED
 
 
 @router.get(
     path="/keywords/{keyword_id}/plot"
 )
 async def keyword_detail_plot_analysis(keyword_id: int):
-    pass
+    raise ANALYSIS_NOT_IMPLEMENTED
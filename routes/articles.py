@@ -1,23 +1,50 @@
-from fastapi import APIRouter, Body
-from rabbitmq_service.sender import send_message_to_rabbitmq
+from fastapi import (
+    APIRouter,
+    Body,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from pydantic import ValidationError
+from rabbitmq_service.sender import (
+    send_message_to_rabbitmq,
+    send_messages_to_rabbitmq,
+)
 
-from asyncio import gather
 from typing import Annotated, Literal, Optional
 
-from auth import UserIdDep
+from auth import OptionalUserIdDep, UserIdDep
 from db import SessionDep
-from exceptions.article import CREATE_ARTICLE_ERROR
-from model.view import ArticleView, CommentView
+from config import BULK_NDJSON_MAX_ARTICLES, BULK_NDJSON_MAX_BYTES
+from exceptions.article import BULK_IMPORT_TOO_LARGE, CREATE_ARTICLE_ERROR
+from model import ArticleModel
+from model.view import (
+    ArticleBulkResultView,
+    ArticleView,
+    CommentView,
+    ViewResponse,
+)
 from schemas.article import ArticleCreate
+from search import add_committed_articles
 from services.article import (
+    BULK_INSERT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    add_article_interest,
     create_article,
+    create_articles_bulk,
     get_all_articles,
     get_article_by_id,
+    get_articles_version,
+    remove_article_interest,
 )
 from services.comment import (
     add_comment_by_article_id,
     get_comments_by_article_id
 )
+from services.etag import make_etag, not_modified
+from services.feed import get_feed, get_feed_version
 
 router = APIRouter(
     prefix="/articles",
@@ -27,23 +54,67 @@ router = APIRouter(
 
 @router.get(
     path="",
-    description="List articles with optional filtering by type."
+    description="List articles newest first with optional filtering by type. "
+    "With `type=follow` and a login, returns the user's feed of followed "
+    "categories and friends. When more articles follow, the `X-Next-Cursor` "
+    "header carries the cursor; pass it back as `before` (or as `after` when "
+    "paging with `after`) to fetch the following page."
 )
 async def list_articles(
+    request: Request,
+    user_id: OptionalUserIdDep,
     session: SessionDep,
     type: Optional[Literal[
         "follow", "event"
     ]] = None,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
 ) -> list[ArticleView]:
-    return await gather(*[
-        ArticleView.from_model(model=article, session=session)
-        for article in await get_all_articles(
+    follow = type == "follow" and user_id is not None
+    etag = make_etag(
+        "articles",
+        *await get_articles_version(session),
+        user_id if follow else None,
+        await get_feed_version(user_id, session) if follow else None,
+        type,
+        before,
+        after,
+        limit,
+    )
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged  # type: ignore
+
+    if follow:
+        articles, next_cursor = await get_feed(
+            user_id=user_id,
+            session=session,
+            before=before,
+            after=after,
+            limit=limit,
+        )
+    else:
+        articles, next_cursor = await get_all_articles(
             type=type,
             session=session,
             fetch_author=True,
-            fetch_category=True
+            fetch_category=True,
+            before=before,
+            after=after,
+            limit=limit,
         )
-    ])
+
+    # The cursor travels in a header so the body keeps the plain list
+    # shape existing clients read.
+    headers = {"ETag": etag}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)
+
+    return ViewResponse(await ArticleView.from_models(
+        models=articles,
+        session=session
+    ), headers=headers)  # type: ignore
 
 
 @router.post(
@@ -79,27 +150,109 @@ async def create_bulk(
     data: list[ArticleCreate],
     session: SessionDep
 ) -> list[ArticleView]:
-    articles = await gather(*[create_article(
+    articles = await create_articles_bulk(
         author_id=user_id,
-        data=d,
+        data=data,
+        session=session
+    )
+
+    event_ids = [str(article.id) for article in articles if article.is_event]
+    if event_ids:
+        await send_messages_to_rabbitmq(event_ids)
+
+    return await ArticleView.from_models(
+        models=articles,
         session=session
-    ) for d in data])
+    )
+
+
+async def __read_ndjson(request: Request) -> list[ArticleCreate]:
+    articles: list[ArticleCreate] = []
+    buffer = b""
+    received = 0
+    line_number = 0
+
+    def parse(line: bytes) -> None:
+        if not line.strip():
+            return
+        if len(articles) >= BULK_NDJSON_MAX_ARTICLES:
+            raise BULK_IMPORT_TOO_LARGE
+        try:
+            articles.append(ArticleCreate.model_validate_json(line))
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Invalid article on line {line_number}: "
+                f"{exc.errors(include_url=False)}"
+            )
+
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > BULK_NDJSON_MAX_BYTES:
+            raise BULK_IMPORT_TOO_LARGE
+
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            line_number += 1
+            parse(line)
+
+    line_number += 1
+    parse(buffer)
+
+    return articles
+
+
+@router.post(
+    path="/bulk/ndjson",
+    description="Create articles from a newline-delimited JSON body, one "
+    "article per line. The body is validated in full before anything is "
+    "written, then committed in one transaction. Imports are capped in "
+    "lines and bytes; larger ones answer 413.",
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}}
+        }
+    }
+)
+async def create_bulk_ndjson(
+    user_id: UserIdDep,
+    request: Request,
+    session: SessionDep
+) -> ArticleBulkResultView:
+    # The body is read and validated before the first insert, so a slow
+    # client or a bad last line never holds a transaction open.
+    data = await __read_ndjson(request)
+    created: list[ArticleModel] = []
 
     try:
-        await session.commit()
+        for start in range(0, len(data), BULK_INSERT_CHUNK_SIZE):
+            created.extend(await create_articles_bulk(
+                author_id=user_id,
+                data=data[start:start + BULK_INSERT_CHUNK_SIZE],
+                session=session,
+                commit=False
+            ))
 
-        await gather(*[
-            session.refresh(article)
-            for article in articles
-        ])
+        await session.commit()
+    except HTTPException:
+        await session.rollback()
+        raise
     except:
         await session.rollback()
         raise CREATE_ARTICLE_ERROR
 
-    return await gather(*[ArticleView.from_model(
-        model=article,
-        session=session
-    ) for article in articles])
+    add_committed_articles(created)
+
+    event_ids = [str(article.id) for article in created if article.is_event]
+    if event_ids:
+        await send_messages_to_rabbitmq(event_ids)
+
+    return ArticleBulkResultView(
+        created=len(created),
+        ids=[str(article.id) for article in created]
+    )
 
 
 @router.get(
@@ -144,13 +297,17 @@ async def get_comments(
 ) -> list[CommentView]:
     comments = await get_comments_by_article_id(
         article_id=article_id,
-        session=session
+        session=session,
+        with_author=True
     )
 
-    return await gather(*[
-        CommentView.from_model(model=comment, session=session)
+    # Authors are joined in, so each view is built without another query;
+    # awaiting them in turn also keeps to one statement at a time on the
+    # shared session.
+    return [
+        await CommentView.from_model(model=comment, session=session)
         for comment in comments
-    ])
+    ]
 
 
 @router.post(
@@ -175,3 +332,37 @@ async def add_comment(
         model=comment,
         session=session
     )
+
+
+@router.post(
+    path="/{article_id}/interest",
+    description="Mark an article as interesting for the authenticated user.",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def add_interest(
+    user_id: UserIdDep,
+    article_id: int,
+    session: SessionDep
+) -> None:
+    await add_article_interest(
+        article_id=article_id,
+        user_id=user_id,
+        session=session
+    )
+
+
+@router.delete(
+    path="/{article_id}/interest",
+    description="Remove the authenticated user's interest in an article.",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def remove_interest(
+    user_id: UserIdDep,
+    article_id: int,
+    session: SessionDep
+) -> None:
+    await remove_article_interest(
+        article_id=article_id,
+        user_id=user_id,
+        session=session
+    )
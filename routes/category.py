@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Body, HTTPException, status
+from fastapi import APIRouter, Body, HTTPException, Request, status
 
 from typing import Annotated
 
+from auth import UserIdDep
 from db import SessionDep
 from model import Category
-from model.view import CategoryView
-from services.category import get_all_categories
-from snowflake import SnowflakeGenerator
-
-id_generator = SnowflakeGenerator()
+from model.view import CategoryView, ViewResponse
+from services.category import (
+    category_registry,
+    follow_category,
+    unfollow_category,
+)
+from services.etag import make_etag, not_modified
+from snowflake import id_generator
 
 router = APIRouter(
     prefix="/categories",
@@ -21,8 +25,26 @@ router = APIRouter(
     description="Get list of categories.",
     status_code=status.HTTP_200_OK
 )
-async def list_categories() -> list[CategoryView]:
-    return await get_all_categories()
+async def list_categories(
+    request: Request,
+    session: SessionDep,
+) -> list[CategoryView]:
+    categories = await category_registry.get_all(session)
+
+    etag = make_etag(
+        "categories",
+        max(categories, default=0),
+        category_registry.version,
+        len(categories),
+    )
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged  # type: ignore
+
+    return ViewResponse(
+        list(categories.values()),
+        headers={"ETag": etag}
+    )  # type: ignore
 
 
 @router.post(
@@ -50,7 +72,43 @@ async def create_category(
             detail="Failed to create category."
         )
 
+    category_registry.invalidate()
+
     return CategoryView(
         id=category.id,
         name=category.name
     )
+
+
+@router.post(
+    path="/{category_id}/follow",
+    description="Follow a category so its new articles show up in the feed.",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def follow(
+    category_id: int,
+    user_id: UserIdDep,
+    session: SessionDep,
+) -> None:
+    await follow_category(
+        user_id=user_id,
+        category_id=category_id,
+        session=session
+    )
+
+
+@router.delete(
+    path="/{category_id}/follow",
+    description="Stop following a category.",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def unfollow(
+    category_id: int,
+    user_id: UserIdDep,
+    session: SessionDep,
+) -> None:
+    await unfollow_category(
+        user_id=user_id,
+        category_id=category_id,
+        session=session
+    )
@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, status
+
+from auth import UserIdDep
+from db import SessionDep
+from services.article import join_event, leave_event
 
 router = APIRouter(
     prefix="/events",
@@ -8,7 +12,34 @@ router = APIRouter(
 
 @router.post(
     path="/{event_id}",
-    description="Join an event by its ID."
+    description="Join an event by its ID. Joining twice is a no-op; joining "
+    "a full event fails with 409.",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def join(
+    user_id: UserIdDep,
+    event_id: int,
+    session: SessionDep
+) -> None:
+    await join_event(
+        article_id=event_id,
+        user_id=user_id,
+        session=session
+    )
+
+
+@router.delete(
+    path="/{event_id}",
+    description="Leave an event by its ID.",
+    status_code=status.HTTP_204_NO_CONTENT,
 )
-async def join_event(event_id: int):
-    pass
+async def leave(
+    user_id: UserIdDep,
+    event_id: int,
+    session: SessionDep
+) -> None:
+    await leave_event(
+        article_id=event_id,
+        user_id=user_id,
+        session=session
+    )
@@ -4,11 +4,12 @@ from typing import Annotated
 
 from auth import UserIdDep
 from db import SessionDep
-from model.view import UserView
+from model.view import UserView, ViewResponse
 from services.user import (
     add_friend_by_id,
     check_is_friend,
-    get_friends_by_user_id
+    get_friends_by_user_id,
+    remove_friend_by_id,
 )
 
 router = APIRouter(
@@ -25,10 +26,10 @@ async def get_friends(
     user_id: UserIdDep,
     session: SessionDep,
 ) -> list[UserView]:
-    return await get_friends_by_user_id(
+    return ViewResponse(await get_friends_by_user_id(
         user_id=user_id,
         session=session
-    )
+    ))  # type: ignore
 
 
 @router.post(
@@ -47,6 +48,22 @@ async def add_friend(
     )
 
 
+@router.post(
+    path="/remove",
+    description="Remove a friend by user ID."
+)
+async def remove_friend(
+    user_id: UserIdDep,
+    friend_id: Annotated[int, Body(embed=True)],
+    session: SessionDep,
+) -> None:
+    await remove_friend_by_id(
+        user_id=user_id,
+        friend_id=friend_id,
+        session=session
+    )
+
+
 @router.get(
     path="/check/{friend_id}",
     description="Check if a user is a friend by user ID.",
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy import text
+
+from hmac import compare_digest
+from typing import Annotated, Any, Optional
+
+from auth.password import password_hasher
+from config import INTERNAL_TOKEN
+from db import get_pool_status, SessionDep
+from rabbitmq_service.sender import publisher
+from translate import translation_cache, translation_pipeline
+
+
+def verify_internal_token(
+    x_internal_token: Annotated[Optional[str], Header()] = None
+) -> None:
+    # Without a configured token the endpoints are disabled; a wrong token
+    # gets the same 404 so the routes are not discoverable.
+    if (
+        INTERNAL_TOKEN is None or
+        x_internal_token is None or
+        not compare_digest(
+            x_internal_token.encode(),
+            INTERNAL_TOKEN.encode()
+        )
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    include_in_schema=False,
+    dependencies=[Depends(verify_internal_token)],
+)
+
+
+@router.get(
+    path="/health",
+    status_code=status.HTTP_200_OK
+)
+async def health(session: SessionDep) -> dict[str, Any]:
+    await session.execute(text("SELECT 1"))
+
+    return {
+        "status": "ok",
+        "db_pool": get_pool_status(),
+    }
+
+
+@router.get(
+    path="/stats",
+    status_code=status.HTTP_200_OK
+)
+async def stats() -> dict[str, Any]:
+    return {
+        "db_pool": get_pool_status(),
+        "password_hasher": password_hasher.stats.snapshot(),
+        "publisher": publisher.stats.snapshot(),
+        "translation_cache": translation_cache.stats(),
+        "translation_pipeline": translation_pipeline.stats(),
+    }
@@ -1,20 +1,34 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import (
+    APIRouter,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from orjson import loads
 
-from asyncio import gather
+from typing import Annotated, Optional
 
 from auth import UserIdDep, validate_jwt
+from config import CHAT_BACKPLANE
 from conversation_manager import (
     ConversationManager,
+    create_backplane,
+    DEFAULT_MESSAGE_PAGE_SIZE,
+    MAX_MESSAGE_PAGE_SIZE,
     get_conversation_by_id,
-    get_conversation_list_by_user_id,
+    get_conversation_views_by_user_id,
+    get_conversations_version,
     get_messages_by_conversation_id,
     get_private_conversation,
 )
 from db import SessionDep
-from model.view import ConversationView, MessageView
+from model.view import ConversationView, MessageView, ViewResponse
+from services.etag import make_etag, not_modified
 
-manager = ConversationManager()
+manager = ConversationManager(
+    backplane=create_backplane(CHAT_BACKPLANE)
+)
 
 router = APIRouter(
     prefix="/messages",
@@ -24,16 +38,23 @@ router = APIRouter(
 
 @router.get("")
 async def get_conversations(
+    request: Request,
     user_id: UserIdDep,
     session: SessionDep,
 ) -> list[ConversationView]:
-    return await gather(*[
-        ConversationView.from_model(model=c, session=session)
-        for c in await get_conversation_list_by_user_id(
-            user_id=user_id,
-            session=session
-        )
-    ])
+    etag = make_etag(
+        "conversations",
+        user_id,
+        *await get_conversations_version(user_id=user_id, session=session),
+    )
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged  # type: ignore
+
+    return ViewResponse(await get_conversation_views_by_user_id(
+        user_id=user_id,
+        session=session
+    ), headers={"ETag": etag})  # type: ignore
 
 
 @router.get("/by-id/{conversation_id}")
@@ -54,22 +75,35 @@ async def get_by_id(
     )
 
 
-@router.get("/by-id/{conversation_id}/messages")
+@router.get(
+    "/by-id/{conversation_id}/messages",
+    description="List messages newest first. Pass the oldest returned id as "
+    "`before_id` to scroll back, or the newest as `after_id` to catch up."
+)
 async def get_messages(
     user_id: UserIdDep,
     conversation_id: int,
     session: SessionDep,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: Annotated[
+        int,
+        Query(ge=1, le=MAX_MESSAGE_PAGE_SIZE)
+    ] = DEFAULT_MESSAGE_PAGE_SIZE,
 ) -> list[MessageView]:
     messages = await get_messages_by_conversation_id(
         user_id=user_id,
         conversation_id=conversation_id,
         session=session,
+        before_id=before_id,
+        after_id=after_id,
+        limit=limit,
     )
 
-    return [
+    return ViewResponse([
         MessageView.from_model(message)
         for message in messages
-    ]
+    ])  # type: ignore
 
 
 @router.get("/private-message/{to_user_id}")
@@ -1,4 +1,23 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, BackgroundTasks, Query
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from typing import Annotated, Optional
+
+from auth import UserIdDep
+from db import SessionDep
+from model import ArticleModel, CommentModel
+from model.view import (
+    ArticleView,
+    CommentView,
+    SearchPageView,
+    SearchResultView,
+    ViewResponse,
+)
+from search import record_search_history, search_documents, SearchKind
+
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 50
 
 router = APIRouter(
     prefix="/search",
@@ -8,7 +27,74 @@ router = APIRouter(
 
 @router.get(
     path="",
-    description="Search"
+    description="Search articles and comments, best match first. Pass "
+    "`next_offset` back as `offset` to fetch the following page."
 )
-async def search(query: str):
-    pass
+async def search(
+    user_id: UserIdDep,
+    query: Annotated[str, Query(min_length=1, max_length=256)],
+    session: SessionDep,
+    background_tasks: BackgroundTasks,
+    type: Optional[SearchKind] = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(
+        ge=1,
+        le=MAX_SEARCH_PAGE_SIZE
+    )] = DEFAULT_SEARCH_PAGE_SIZE,
+) -> SearchPageView:
+    background_tasks.add_task(record_search_history, user_id, query)
+
+    hits = await search_documents(
+        query=query,
+        kind=type,
+        offset=offset,
+        limit=limit + 1,
+        session=session
+    )
+
+    next_offset = offset + limit if len(hits) > limit else None
+    hits = hits[:limit]
+
+    article_ids = [id for kind, id, _ in hits if kind == "article"]
+    comment_ids = [id for kind, id, _ in hits if kind == "comment"]
+
+    articles: dict[int, ArticleView] = {}
+    if article_ids:
+        models = (await session.execute(select(ArticleModel).where(
+            ArticleModel.id.in_(article_ids)
+        ))).scalars().all()
+        views = await ArticleView.from_models(models, session=session)
+        articles = {int(view.id): view for view in views}
+
+    comments: dict[int, CommentView] = {}
+    if comment_ids:
+        models = (await session.execute(select(CommentModel).where(
+            CommentModel.id.in_(comment_ids)
+        ).options(
+            joinedload(CommentModel.author)
+        ))).scalars().all()
+        for model in models:
+            comments[model.id] = await CommentView.from_model(
+                model=model,
+                session=session
+            )
+
+    results = []
+    for kind, id, score in hits:
+        if kind == "article" and id in articles:
+            results.append(SearchResultView(
+                type="article",
+                score=score,
+                article=articles[id]
+            ))
+        elif kind == "comment" and id in comments:
+            results.append(SearchResultView(
+                type="comment",
+                score=score,
+                comment=comments[id]
+            ))
+
+    return ViewResponse(SearchPageView(
+        results=results,
+        next_offset=next_offset
+    ))  # type: ignore
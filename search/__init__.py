@@ -0,0 +1,14 @@
+from .engine import (
+    add_committed_articles,
+    article_index,
+    backfill_search_documents,
+    close_search_index,
+    index_articles,
+    index_comments,
+    open_search_index,
+    record_search_history,
+    search_documents,
+    SearchKind,
+)
+from .memory import build_article_index, InvertedIndex
+from .tokenizer import query_tokens, tokenize
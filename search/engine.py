@@ -0,0 +1,270 @@
+from sqlalchemy import (
+    case,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import Iterable, Literal, Optional, Sequence
+
+from config import SEARCH_BACKEND, SEARCH_INDEX_SNAPSHOT
+from db import get_session
+from model import (
+    ArticleModel,
+    CommentModel,
+    SearchDocumentModel,
+    SearchHistoryModel,
+)
+from snowflake import id_generator
+
+from .memory import article_text, build_article_index, InvertedIndex
+from .tokenizer import query_tokens, tokenize
+
+SearchKind = Literal["article", "comment"]
+
+BACKFILL_BATCH_SIZE = 500
+
+article_index = InvertedIndex()
+
+
+def article_tokens(article: ArticleModel) -> str:
+    return " ".join(tokenize(
+        article_text(article.title, article.content, article.tags)
+    ))
+
+
+def comment_tokens(comment: CommentModel) -> str:
+    return " ".join(tokenize(comment.content))
+
+
+async def index_articles(
+    articles: Iterable[ArticleModel],
+    session: AsyncSession,
+) -> None:
+    if SEARCH_BACKEND == "memory":
+        return
+
+    rows = [{
+        "id": article.id,
+        "kind": "article",
+        "article_id": article.id,
+        "tokens": article_tokens(article),
+    } for article in articles]
+
+    if rows:
+        await session.execute(insert(SearchDocumentModel), rows)
+
+
+async def index_comments(
+    comments: Iterable[CommentModel],
+    session: AsyncSession,
+) -> None:
+    if SEARCH_BACKEND == "memory":
+        return
+
+    rows = [{
+        "id": comment.id,
+        "kind": "comment",
+        "article_id": comment.article_id,
+        "tokens": comment_tokens(comment),
+    } for comment in comments]
+
+    if rows:
+        await session.execute(insert(SearchDocumentModel), rows)
+
+
+def add_committed_articles(articles: Iterable[ArticleModel]) -> None:
+    if SEARCH_BACKEND != "memory":
+        return
+
+    for article in articles:
+        article_index.add(
+            article.id,
+            article_text(article.title, article.content, article.tags)
+        )
+
+
+async def backfill_search_documents(
+    session: Optional[AsyncSession] = None,
+) -> int:
+    indexed = 0
+
+    async with get_session(session) as session:
+        for model, index in (
+            (ArticleModel, index_articles),
+            (CommentModel, index_comments),
+        ):
+            while True:
+                rows = list((await session.execute(select(model).where(
+                    ~exists().where(SearchDocumentModel.id == model.id)
+                ).order_by(
+                    model.id
+                ).limit(BACKFILL_BATCH_SIZE))).scalars().all())
+
+                if not rows:
+                    break
+
+                await index(rows, session)  # type: ignore
+                await session.commit()
+                indexed += len(rows)
+
+    return indexed
+
+
+async def __search_postgresql(
+    tokens: list[str],
+    kind: Optional[SearchKind],
+    offset: int,
+    limit: int,
+    session: AsyncSession,
+) -> Sequence[tuple[str, int, float]]:
+    # The literal config keeps the expression identical to the GIN index.
+    vector = func.to_tsvector(
+        literal_column("'simple'"),
+        SearchDocumentModel.tokens
+    )
+    query = func.plainto_tsquery(
+        literal_column("'simple'"),
+        " ".join(tokens)
+    )
+    score = func.ts_rank(vector, query)
+
+    stat = select(
+        SearchDocumentModel.kind,
+        SearchDocumentModel.id,
+        score,
+    ).where(
+        vector.op("@@")(query)
+    )
+    if kind is not None:
+        stat = stat.where(SearchDocumentModel.kind == kind)
+
+    return (await session.execute(stat.order_by(
+        score.desc(),
+        SearchDocumentModel.id.desc()
+    ).offset(offset).limit(limit))).tuples().all()
+
+
+async def __search_sqlite(
+    tokens: list[str],
+    kind: Optional[SearchKind],
+    offset: int,
+    limit: int,
+    session: AsyncSession,
+) -> Sequence[tuple[str, int, float]]:
+    match = " ".join(
+        '"' + token.replace('"', '""') + '"' for token in tokens
+    )
+
+    return (await session.execute(text(
+        "SELECT d.kind, d.id, -bm25(search_documents_fts) AS score "
+        "FROM search_documents_fts "
+        "JOIN search_documents AS d ON d.id = search_documents_fts.rowid "
+        "WHERE search_documents_fts MATCH :match "
+        + ("AND d.kind = :kind " if kind is not None else "") +
+        "ORDER BY bm25(search_documents_fts), d.id DESC "
+        "LIMIT :limit OFFSET :offset"
+    ), {
+        "match": match,
+        "kind": kind,
+        "limit": limit,
+        "offset": offset,
+    })).tuples().all()
+
+
+async def __search_like(
+    tokens: list[str],
+    kind: Optional[SearchKind],
+    offset: int,
+    limit: int,
+    session: AsyncSession,
+) -> Sequence[tuple[str, int, float]]:
+    # Without a full-text index, documents are scanned for whole tokens and
+    # ranked by how many of the query tokens they contain.
+    padded = literal(" ") + SearchDocumentModel.tokens + literal(" ")
+    matches = [
+        padded.contains(f" {token} ", autoescape=True)
+        for token in tokens
+    ]
+    score = sum(case((match, 1), else_=0) for match in matches)
+
+    stat = select(
+        SearchDocumentModel.kind,
+        SearchDocumentModel.id,
+        score,
+    ).where(
+        or_(*matches)
+    )
+    if kind is not None:
+        stat = stat.where(SearchDocumentModel.kind == kind)
+
+    return (await session.execute(stat.order_by(
+        score.desc(),
+        SearchDocumentModel.id.desc()
+    ).offset(offset).limit(limit))).tuples().all()
+
+
+async def search_documents(
+    query: str,
+    kind: Optional[SearchKind] = None,
+    offset: int = 0,
+    limit: int = 20,
+    session: Optional[AsyncSession] = None,
+) -> list[tuple[SearchKind, int, float]]:
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+
+    if SEARCH_BACKEND == "memory":
+        if kind == "comment":
+            return []
+
+        return [
+            ("article", article_id, score)
+            for article_id, score in article_index.search(
+                tokens,
+                offset=offset,
+                limit=limit
+            )
+        ]
+
+    async with get_session(session) as session:
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            search = __search_postgresql
+        elif dialect == "sqlite":
+            search = __search_sqlite
+        else:
+            search = __search_like
+
+        rows = await search(tokens, kind, offset, limit, session)
+
+    return [(row[0], row[1], float(row[2])) for row in rows]  # type: ignore
+
+
+async def open_search_index() -> None:
+    if SEARCH_BACKEND == "memory":
+        await build_article_index(article_index, SEARCH_INDEX_SNAPSHOT)
+    else:
+        await backfill_search_documents()
+
+
+def close_search_index() -> None:
+    if SEARCH_BACKEND == "memory" and SEARCH_INDEX_SNAPSHOT:
+        article_index.save(SEARCH_INDEX_SNAPSHOT)
+
+
+async def record_search_history(user_id: int, query: str) -> None:
+    async with get_session() as session:
+        await session.execute(insert(SearchHistoryModel).values(
+            id=id_generator.next_id().value,
+            user_id=user_id,
+            query=query,
+        ))
+        await session.commit()
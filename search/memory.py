@@ -0,0 +1,233 @@
+from orjson import dumps, loads
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from array import array
+from datetime import timedelta
+from heapq import nlargest
+from math import log
+from os import path, remove, replace
+from sys import byteorder
+from tempfile import NamedTemporaryFile
+from typing import Iterable, Optional
+
+from config import SEARCH_INDEX_RESCAN_WINDOW
+from db import get_session
+from model import ArticleModel
+from snowflake import SnowflakeID
+
+from .tokenizer import tokenize
+
+SNAPSHOT_MAGIC = b"TJOY-SEARCH-1\n"
+STREAM_BATCH_SIZE = 1000
+MAX_TERM_FREQUENCY = (1 << 16) - 1
+
+
+class InvertedIndex:
+    last_id: int
+
+    # Documents are numbered densely in insertion order; postings hold those
+    # ordinals and term frequencies in parallel typed arrays instead of
+    # per-entry Python objects.
+    _doc_ids: array
+    _doc_lengths: array
+    _ordinals: dict[int, int]
+    _postings: dict[str, tuple[array, array]]
+    _total_length: int
+
+    k1: float
+    b: float
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.clear()
+
+    def clear(self) -> None:
+        self.last_id = 0
+
+        self._doc_ids = array("q")
+        self._doc_lengths = array("I")
+        self._ordinals = {}
+        self._postings = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def add(self, doc_id: int, text: str) -> bool:
+        if doc_id in self._ordinals:
+            return False
+
+        tokens = tokenize(text)
+        frequencies: dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+
+        ordinal = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._doc_lengths.append(len(tokens))
+        self._ordinals[doc_id] = ordinal
+        self._total_length += len(tokens)
+        self.last_id = max(self.last_id, doc_id)
+
+        for token, frequency in frequencies.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = (array("I"), array("H"))
+                self._postings[token] = posting
+
+            posting[0].append(ordinal)
+            posting[1].append(min(frequency, MAX_TERM_FREQUENCY))
+
+        return True
+
+    def search(
+        self,
+        tokens: Iterable[str],
+        offset: int = 0,
+        limit: int = 20,
+    ) -> list[tuple[int, float]]:
+        count = len(self._doc_ids)
+        if count == 0:
+            return []
+
+        average_length = self._total_length / count or 1.0
+        scores: dict[int, float] = {}
+
+        for token in dict.fromkeys(tokens):
+            posting = self._postings.get(token)
+            if posting is None:
+                continue
+
+            ordinals, frequencies = posting
+            df = len(ordinals)
+            idf = log(1 + (count - df + 0.5) / (df + 0.5))
+
+            for ordinal, frequency in zip(ordinals, frequencies):
+                norm = self.k1 * (
+                    1 - self.b
+                    + self.b * self._doc_lengths[ordinal] / average_length
+                )
+                scores[ordinal] = scores.get(ordinal, 0.0) + idf * (
+                    frequency * (self.k1 + 1) / (frequency + norm)
+                )
+
+        top = nlargest(
+            offset + limit,
+            scores.items(),
+            key=lambda item: (item[1], self._doc_ids[item[0]])
+        )[offset:]
+
+        return [(self._doc_ids[ordinal], score) for ordinal, score in top]
+
+    def save(self, file: str) -> None:
+        terms = list(self._postings)
+        header = dumps({
+            "byteorder": byteorder,
+            "last_id": self.last_id,
+            "total_length": self._total_length,
+            "terms": terms,
+            "sizes": [len(self._postings[term][0]) for term in terms],
+        })
+
+        # Every worker saves the same snapshot on shutdown, so each one
+        # writes its own temp file and the last replace wins whole.
+        with NamedTemporaryFile(
+            "wb",
+            dir=path.dirname(path.abspath(file)),
+            prefix=f"{path.basename(file)}.",
+            suffix=".tmp",
+            delete=False
+        ) as f:
+            temp_file = f.name
+            try:
+                f.write(SNAPSHOT_MAGIC)
+                f.write(len(header).to_bytes(8, "little"))
+                f.write(header)
+                f.write(len(self._doc_ids).to_bytes(8, "little"))
+                self._doc_ids.tofile(f)
+                self._doc_lengths.tofile(f)
+                for term in terms:
+                    self._postings[term][0].tofile(f)
+                for term in terms:
+                    self._postings[term][1].tofile(f)
+            except:
+                f.close()
+                remove(temp_file)
+                raise
+
+        replace(temp_file, file)
+
+    def load(self, file: str) -> None:
+        with open(file, "rb") as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError("Not a search index snapshot.")
+
+            header = loads(f.read(int.from_bytes(f.read(8), "little")))
+            count = int.from_bytes(f.read(8), "little")
+            swap = header["byteorder"] != byteorder
+
+            def read(typecode: str, size: int) -> array:
+                values = array(typecode)
+                values.fromfile(f, size)
+                if swap:
+                    values.byteswap()
+                return values
+
+            doc_ids = read("q", count)
+            doc_lengths = read("I", count)
+            ordinals = [read("I", size) for size in header["sizes"]]
+            frequencies = [read("H", size) for size in header["sizes"]]
+
+        self.last_id = header["last_id"]
+        self._doc_ids = doc_ids
+        self._doc_lengths = doc_lengths
+        self._ordinals = {
+            doc_id: ordinal for ordinal, doc_id in enumerate(doc_ids)
+        }
+        self._postings = dict(zip(header["terms"], zip(ordinals, frequencies)))
+        self._total_length = header["total_length"]
+
+
+def article_text(title: str, content: str, tags: Optional[str]) -> str:
+    return f"{title}\n{content}\n{tags or ''}"
+
+
+async def build_article_index(
+    index: InvertedIndex,
+    snapshot_file: Optional[str] = None,
+    session: Optional[AsyncSession] = None,
+    rescan_window: float = SEARCH_INDEX_RESCAN_WINDOW,
+) -> int:
+    if snapshot_file and path.exists(snapshot_file):
+        try:
+            index.load(snapshot_file)
+        except (OSError, ValueError, KeyError, EOFError):
+            index.clear()
+
+    # Workers do not commit in id order, so an article with an id below the
+    # snapshot's watermark can land after it was taken. Rows from a window
+    # behind the watermark are read again; known ids are skipped.
+    rescan_from = SnowflakeID(index.last_id).timestamp - timedelta(
+        seconds=rescan_window
+    ) if index.last_id else None
+
+    added = 0
+    async with get_session(session) as session:
+        result = await session.stream(select(
+            ArticleModel.id,
+            ArticleModel.title,
+            ArticleModel.content,
+            ArticleModel.tags,
+        ).where(
+            ArticleModel.created_between(start=rescan_from)
+        ).order_by(
+            ArticleModel.id
+        ).execution_options(yield_per=STREAM_BATCH_SIZE))
+
+        async for article_id, title, content, tags in result:
+            if index.add(article_id, article_text(title, content, tags)):
+                added += 1
+
+    return added
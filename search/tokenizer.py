@@ -0,0 +1,38 @@
+from re import compile
+from unicodedata import normalize
+
+CJK_RANGES = (
+    "\u3400-\u4dbf"
+    "\u4e00-\u9fff"
+    "\uf900-\ufaff"
+    "\u3040-\u30ff"
+    "\uac00-\ud7af"
+)
+
+TOKEN_PATTERN = compile(rf"[{CJK_RANGES}]+|[^\W_{CJK_RANGES}]+")
+CJK_PATTERN = compile(rf"[{CJK_RANGES}]")
+
+
+def tokenize(text: str) -> list[str]:
+    tokens: list[str] = []
+
+    for match in TOKEN_PATTERN.finditer(normalize("NFKC", text).lower()):
+        word = match.group()
+
+        # CJK has no word boundaries; overlapping bigrams index every
+        # two-character sequence so any substring of length >= 2 matches.
+        if CJK_PATTERN.match(word):
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(
+                    word[i:i + 2] for i in range(len(word) - 1)
+                )
+        else:
+            tokens.append(word)
+
+    return tokens
+
+
+def query_tokens(text: str) -> list[str]:
+    return list(dict.fromkeys(tokenize(text)))
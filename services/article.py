@@ -1,19 +1,32 @@
-from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import delete, func, insert, or_, select, Table, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import InstrumentedAttribute, joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from typing import Literal, Optional
+from datetime import datetime
+from typing import Literal, Optional, Sequence
 
 from db import get_session
-from exceptions.article import CREATE_ARTICLE_ERROR
-from model import ArticleModel
+from exceptions.article import (
+    ARTICLE_NOT_FOUND,
+    CATEGORY_NOT_FOUND,
+    CREATE_ARTICLE_ERROR,
+    EVENT_FULL,
+    EVENT_NOT_FOUND,
+    UPDATE_ARTICLE_ERROR,
+)
+from model import ArticleModel, CategoryModel, CommentModel, UserModel
+from model.relationships import interest_table, join_event_table
 from schemas.article import ArticleCreate
-from snowflake import SnowflakeGenerator
+from search import add_committed_articles, index_articles
+from snowflake import id_generator
 
-from .category import check_category_exists
+from .category import check_categories_exist, check_category_exists
+from .feed import fan_out_articles
 
-id_generator = SnowflakeGenerator()
+BULK_INSERT_CHUNK_SIZE = 1000
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 
 
 async def create_article(
@@ -29,13 +42,12 @@ async def create_article(
         )
 
         if not category_exists:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Category does not exist."
-            )
+            raise CATEGORY_NOT_FOUND
 
+        article_id = id_generator.next_id().value
         article = ArticleModel(
-            id=id_generator.next_id(),
+            id=article_id,
+            updated_seq=article_id,
             author_id=author_id,
             category_id=int(data.category_id),
             **data.model_dump(exclude={"category_id"})
@@ -45,22 +57,84 @@ async def create_article(
             session.add(article)
 
             try:
+                await index_articles([article], session)
+                await fan_out_articles([article], session)
                 await session.commit()
             except:
                 await session.rollback()
                 raise CREATE_ARTICLE_ERROR
 
             await session.refresh(article)
+            add_committed_articles([article])
 
         return article
 
 
+async def create_articles_bulk(
+    author_id: int,
+    data: Sequence[ArticleCreate],
+    session: Optional[AsyncSession] = None,
+    commit: bool = True
+) -> list[ArticleModel]:
+    if len(data) == 0:
+        return []
+
+    async with get_session(session) as session:
+        categories_exist = await check_categories_exist(
+            category_ids={d.category_id for d in data},
+            session=session
+        )
+
+        if not categories_exist:
+            raise CATEGORY_NOT_FOUND
+
+        ids = id_generator.next_ids(len(data))
+
+        try:
+            # A single executemany INSERT ... RETURNING; SQLAlchemy batches it
+            # into multi-row VALUES statements per dialect.
+            articles = list((await session.scalars(
+                insert(ArticleModel).returning(
+                    ArticleModel,
+                    sort_by_parameter_order=True
+                ),
+                [{
+                    "id": article_id.value,
+                    "updated_seq": article_id.value,
+                    "author_id": author_id,
+                    "category_id": int(d.category_id),
+                    **d.model_dump(exclude={"category_id"})
+                } for article_id, d in zip(ids, data)]
+            )).all())
+            await index_articles(articles, session)
+            await fan_out_articles(articles, session)
+
+            # Detached rows keep their RETURNING values after the commit
+            # instead of being expired and reloaded one by one.
+            for article in articles:
+                session.expunge(article)
+
+            if commit:
+                await session.commit()
+        except:
+            await session.rollback()
+            raise CREATE_ARTICLE_ERROR
+
+        if commit:
+            add_committed_articles(articles)
+
+        return articles
+
+
 async def get_all_articles(
     type: Optional[Literal["follow", "event"]] = None,
     session: Optional[AsyncSession] = None,
     fetch_author: bool = False,
     fetch_category: bool = False,
-) -> list[ArticleModel]:
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> tuple[list[ArticleModel], Optional[int]]:
     async with get_session(session) as session:
         stat = select(ArticleModel)
         if type == "follow":
@@ -68,14 +142,56 @@ async def get_all_articles(
         elif type == "event":
             stat = stat.where(ArticleModel.is_event == True)
 
+        if before is not None:
+            stat = stat.where(ArticleModel.id < before)
+        if after is not None:
+            stat = stat.where(ArticleModel.id > after)
+
+        # Snowflake IDs are time-ordered, so the primary key doubles as the
+        # keyset cursor. Paging forward from `after` walks the index upwards
+        # and flips the page back to newest-first afterwards.
+        if after is not None and before is None:
+            stat = stat.order_by(ArticleModel.id.asc())
+        else:
+            stat = stat.order_by(ArticleModel.id.desc())
+
         if fetch_author:
             stat = stat.options(joinedload(ArticleModel.author))
         if fetch_category:
             stat = stat.options(joinedload(ArticleModel.category))
 
-        result = await session.execute(stat)
+        result = await session.execute(stat.limit(limit + 1))
+        articles = list(result.scalars().all())
+
+        has_more = len(articles) > limit
+        articles = articles[:limit]
 
-        return list(result.scalars().all())
+        next_cursor = None
+        if after is not None and before is None:
+            if has_more:
+                next_cursor = articles[-1].id
+            articles.reverse()
+        elif has_more:
+            next_cursor = articles[-1].id
+
+        return articles, next_cursor
+
+
+async def get_articles_version(
+    session: Optional[AsyncSession] = None,
+) -> tuple[int, int, int]:
+    async with get_session(session) as session:
+        # Article views embed the author's name and the category name, so a
+        # profile edit or a rename has to move the version too.
+        articles_seq, categories_seq, users_seq = (await session.execute(
+            select(
+                select(func.max(ArticleModel.updated_seq)).scalar_subquery(),
+                select(func.max(CategoryModel.updated_seq)).scalar_subquery(),
+                select(func.max(UserModel.updated_seq)).scalar_subquery(),
+            )
+        )).one()
+
+        return articles_seq or 0, categories_seq or 0, users_seq or 0
 
 
 async def get_article_by_id(
@@ -98,9 +214,212 @@ async def get_article_by_id(
         )
 
         if article is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Article not found."
-            )
+            raise ARTICLE_NOT_FOUND
 
         return article
+
+
+async def count_articles(
+    is_event: Optional[bool] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    session: Optional[AsyncSession] = None,
+) -> int:
+    async with get_session(session) as session:
+        stat = select(func.count()).select_from(ArticleModel).where(
+            ArticleModel.created_between(start, end)
+        )
+        if is_event is not None:
+            stat = stat.where(ArticleModel.is_event == is_event)
+
+        return (await session.execute(stat)).scalar_one()
+
+
+async def __update_article_relation(
+    table: Table,
+    counter: InstrumentedAttribute[int],
+    article_id: int,
+    user_id: int,
+    linked: bool,
+    session: Optional[AsyncSession] = None,
+) -> bool:
+    async with get_session(session) as session:
+        if linked:
+            # Bumping the counter first takes the article row lock, so the
+            # relationship insert and the counter always commit together.
+            result = await session.execute(update(ArticleModel).where(
+                ArticleModel.id == article_id
+            ).values({
+                counter: counter + 1,
+                ArticleModel.updated_seq: id_generator.next_id().value,
+            }))
+
+            if result.rowcount == 0:
+                await session.rollback()
+                raise ARTICLE_NOT_FOUND
+
+            try:
+                await session.execute(insert(table).values(
+                    user_id=user_id,
+                    article_id=article_id
+                ))
+            except IntegrityError:
+                await session.rollback()
+                return False
+        else:
+            result = await session.execute(delete(table).where(
+                table.c.user_id == user_id,
+                table.c.article_id == article_id
+            ))
+
+            if result.rowcount == 0:
+                await session.rollback()
+                return False
+
+            await session.execute(update(ArticleModel).where(
+                ArticleModel.id == article_id
+            ).values({
+                counter: counter - 1,
+                ArticleModel.updated_seq: id_generator.next_id().value,
+            }))
+
+        try:
+            await session.commit()
+        except:
+            await session.rollback()
+            raise UPDATE_ARTICLE_ERROR
+
+        return True
+
+
+async def add_article_interest(
+    article_id: int,
+    user_id: int,
+    session: Optional[AsyncSession] = None,
+) -> bool:
+    return await __update_article_relation(
+        table=interest_table,
+        counter=ArticleModel.interest_count,
+        article_id=article_id,
+        user_id=user_id,
+        linked=True,
+        session=session
+    )
+
+
+async def remove_article_interest(
+    article_id: int,
+    user_id: int,
+    session: Optional[AsyncSession] = None,
+) -> bool:
+    return await __update_article_relation(
+        table=interest_table,
+        counter=ArticleModel.interest_count,
+        article_id=article_id,
+        user_id=user_id,
+        linked=False,
+        session=session
+    )
+
+
+async def join_event(
+    article_id: int,
+    user_id: int,
+    session: Optional[AsyncSession] = None,
+) -> bool:
+    async with get_session(session) as session:
+        # The capacity check and the increment are one statement, so however
+        # many requests race for the last seat only one of them matches.
+        result = await session.execute(update(ArticleModel).where(
+            ArticleModel.id == article_id,
+            ArticleModel.is_event.is_(True),
+            or_(
+                ArticleModel.event_number_max.is_(None),
+                ArticleModel.join_count < ArticleModel.event_number_max,
+            )
+        ).values(
+            join_count=ArticleModel.join_count + 1,
+            updated_seq=id_generator.next_id().value,
+        ))
+
+        if result.rowcount == 0:
+            is_event = (await session.execute(select(
+                ArticleModel.is_event
+            ).where(
+                ArticleModel.id == article_id
+            ))).scalar()
+            joined = (await session.execute(select(
+                join_event_table.c.user_id
+            ).where(
+                join_event_table.c.user_id == user_id,
+                join_event_table.c.article_id == article_id
+            ))).first() is not None
+            await session.rollback()
+
+            if not is_event:
+                raise EVENT_NOT_FOUND
+            if joined:
+                return False
+            raise EVENT_FULL
+
+        try:
+            await session.execute(insert(join_event_table).values(
+                user_id=user_id,
+                article_id=article_id
+            ))
+        except IntegrityError:
+            await session.rollback()
+            return False
+
+        try:
+            await session.commit()
+        except:
+            await session.rollback()
+            raise UPDATE_ARTICLE_ERROR
+
+        return True
+
+
+async def leave_event(
+    article_id: int,
+    user_id: int,
+    session: Optional[AsyncSession] = None,
+) -> bool:
+    return await __update_article_relation(
+        table=join_event_table,
+        counter=ArticleModel.join_count,
+        article_id=article_id,
+        user_id=user_id,
+        linked=False,
+        session=session
+    )
+
+
+async def reconcile_article_counters(
+    session: Optional[AsyncSession] = None,
+) -> None:
+    async with get_session(session) as session:
+        await session.execute(update(ArticleModel).values(
+            interest_count=select(func.count()).where(
+                interest_table.c.article_id == ArticleModel.id
+            ).scalar_subquery(),
+            join_count=select(func.count()).where(
+                join_event_table.c.article_id == ArticleModel.id
+            ).scalar_subquery(),
+            comment_count=select(func.count()).where(
+                CommentModel.article_id == ArticleModel.id
+            ).scalar_subquery(),
+            updated_seq=id_generator.next_id().value,
+        ))
+
+        try:
+            await session.commit()
+        except:
+            await session.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    from asyncio import run
+
+    run(reconcile_article_counters())
@@ -1,33 +1,196 @@
-from sqlalchemy import select
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from typing import Optional, Union
+from asyncio import Lock
+from time import monotonic
+from typing import Iterable, Optional, Union
 
+from config import CATEGORY_REGISTRY_TTL
 from db import get_session
-from model import CategoryModel
+from exceptions.article import CATEGORY_NOT_FOUND
+from model import CategoryModel, UserModel
+from model.relationships import follow_category_table
 from model.view import CategoryView
-from snowflake import SnowflakeID
+from snowflake import id_generator, SnowflakeID
+
+from .feed import remove_category_from_timeline
+
+
+class CategoryRegistry:
+    version: int
+
+    _categories: Optional[dict[int, CategoryView]]
+    _loaded_at: float
+    _ttl: float
+    _reload_interval: float
+    _lock: Lock
+
+    def __init__(self, ttl: float, reload_interval: float = 1.0) -> None:
+        self.version = 0
+
+        self._categories = None
+        self._loaded_at = float("-inf")
+        self._ttl = ttl
+        self._reload_interval = reload_interval
+        self._lock = Lock()
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._categories = None
+
+    async def __load(
+        self,
+        session: Optional[AsyncSession],
+        force: bool = False,
+    ) -> dict[int, CategoryView]:
+        async with self._lock:
+            categories = self._categories
+            if not force and categories is not None and \
+                    monotonic() - self._loaded_at < self._ttl:
+                return categories
+
+            # An invalidation that lands while the query is in flight must
+            # win over the rows this load read.
+            version = self.version
+            async with get_session(session) as session:
+                categories = {
+                    category.id.value: category
+                    for category in await CategoryView.get_all(session)
+                }
+
+            if version == self.version:
+                self._categories = categories
+                self._loaded_at = monotonic()
+
+            return categories
+
+    async def get_all(
+        self,
+        session: Optional[AsyncSession] = None,
+    ) -> dict[int, CategoryView]:
+        categories = self._categories
+        if categories is None or monotonic() - self._loaded_at >= self._ttl:
+            categories = await self.__load(session)
+
+        return categories
+
+    async def missing(
+        self,
+        category_ids: Iterable[int],
+        session: Optional[AsyncSession] = None,
+    ) -> set[int]:
+        category_ids = set(category_ids)
+
+        missing = category_ids - (await self.get_all(session)).keys()
+        if missing and monotonic() - self._loaded_at >= self._reload_interval:
+            # Another worker may have created the category since our load.
+            missing = category_ids - (
+                await self.__load(session, force=True)
+            ).keys()
+
+        return missing
+
+
+category_registry = CategoryRegistry(ttl=CATEGORY_REGISTRY_TTL)
+
+
+def __to_int(category_id: Union[int, str, SnowflakeID]) -> int:
+    if isinstance(category_id, SnowflakeID):
+        return category_id.value
+    return int(category_id)
 
 
 async def get_all_categories(
         session: Optional[AsyncSession] = None
 ) -> list[CategoryView]:
-    async with get_session() as session:
-        return await CategoryView.get_all(session)
+    return list((await category_registry.get_all(session)).values())
+
+
+async def check_categories_exist(
+    category_ids: Iterable[Union[int, str, SnowflakeID]],
+    session: Optional[AsyncSession] = None
+) -> bool:
+    missing = await category_registry.missing(
+        map(__to_int, category_ids),
+        session=session
+    )
+
+    return len(missing) == 0
 
 
 async def check_category_exists(
     category_id: Union[int, str, SnowflakeID],
     session: Optional[AsyncSession] = None
 ) -> bool:
-    if isinstance(category_id, SnowflakeID):
-        category_id = category_id.value
-    elif isinstance(category_id, str):
-        category_id = int(category_id)
+    return await check_categories_exist([category_id], session=session)
+
+
+async def follow_category(
+    user_id: int,
+    category_id: int,
+    session: Optional[AsyncSession] = None
+) -> bool:
+    async with get_session(session) as session:
+        if not await check_category_exists(category_id, session=session):
+            raise CATEGORY_NOT_FOUND
+
+        # Bumping the counter first takes the category row lock, so the
+        # follow row and follower_count always commit together.
+        await session.execute(update(CategoryModel).where(
+            CategoryModel.id == category_id
+        ).values(
+            follower_count=CategoryModel.follower_count + 1
+        ))
+
+        try:
+            await session.execute(insert(follow_category_table).values(
+                user_id=user_id,
+                category_id=category_id
+            ))
+            await session.execute(update(UserModel).where(
+                UserModel.id == user_id
+            ).values(
+                feed_seq=id_generator.next_id().value
+            ))
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            return False
+
+        return True
+
+
+async def unfollow_category(
+    user_id: int,
+    category_id: int,
+    session: Optional[AsyncSession] = None
+) -> bool:
+    async with get_session(session) as session:
+        result = await session.execute(delete(follow_category_table).where(
+            follow_category_table.c.user_id == user_id,
+            follow_category_table.c.category_id == category_id
+        ))
+
+        if result.rowcount == 0:
+            await session.rollback()
+            return False
 
-    async with get_session() as session:
-        category = await session.execute(select(
-            CategoryModel.id
-        ).where(CategoryModel.id == category_id))
+        await session.execute(update(CategoryModel).where(
+            CategoryModel.id == category_id
+        ).values(
+            follower_count=CategoryModel.follower_count - 1
+        ))
+        await remove_category_from_timeline(
+            user_id=user_id,
+            category_id=category_id,
+            session=session
+        )
+        await session.execute(update(UserModel).where(
+            UserModel.id == user_id
+        ).values(
+            feed_seq=id_generator.next_id().value
+        ))
+        await session.commit()
 
-        return category is not None
+        return True
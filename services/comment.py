@@ -1,10 +1,12 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db import get_session
 from exceptions.comment import CREATE_COMMENT_ERROR
-from model import CommentModel
+from model import ArticleModel, CommentModel
+from search import index_comments
+from snowflake import id_generator
 
 from typing import Optional
 
@@ -42,6 +44,7 @@ async def add_comment_by_article_id(
 ) -> CommentModel:
     async with get_session(session) as session:
         comment = CommentModel(
+            id=id_generator.next_id().value,
             article_id=article_id,
             author_id=author_id,
             content=content,
@@ -52,6 +55,13 @@ async def add_comment_by_article_id(
             session.add(comment)
 
             try:
+                await session.execute(update(ArticleModel).where(
+                    ArticleModel.id == article_id
+                ).values(
+                    comment_count=ArticleModel.comment_count + 1,
+                    updated_seq=comment.id,
+                ))
+                await index_comments([comment], session)
                 await session.commit()
                 await session.refresh(comment)
             except:
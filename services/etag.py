@@ -0,0 +1,39 @@
+from fastapi import Request, Response, status
+
+from hashlib import sha1
+from typing import Any, Optional
+
+
+def make_etag(*parts: Any) -> str:
+    digest = sha1(
+        "|".join(map(str, parts)).encode("utf-8")
+    ).hexdigest()[:20]
+
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(
+    request: Request,
+    etag: str,
+) -> Optional[Response]:
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag}
+        )
+
+    return None
@@ -0,0 +1,251 @@
+from sqlalchemy import delete, insert, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from typing import Iterable, Optional
+
+from config import FEED_FANOUT_MAX_FOLLOWERS
+from db import get_session
+from model import ArticleModel, CategoryModel, UserModel
+from model.relationships import (
+    follow_category_table,
+    friend_table,
+    timeline_table,
+)
+
+FANOUT_CHUNK_SIZE = 1000
+
+
+async def get_large_category_ids(
+    category_ids: Iterable[int],
+    threshold: int,
+    session: AsyncSession,
+) -> set[int]:
+    category_ids = set(category_ids)
+    if not category_ids:
+        return set()
+
+    result = await session.execute(select(
+        CategoryModel.id
+    ).where(
+        CategoryModel.id.in_(category_ids),
+        CategoryModel.follower_count > threshold
+    ))
+
+    return set(result.scalars().all())
+
+
+async def fan_out_articles(
+    articles: Iterable[ArticleModel],
+    session: AsyncSession,
+) -> None:
+    articles = [article for article in articles if not article.is_event]
+    if not articles:
+        return
+
+    large_category_ids = await get_large_category_ids(
+        category_ids={
+            article.category_id for article in articles
+            if article.category_id is not None
+        },
+        threshold=FEED_FANOUT_MAX_FOLLOWERS,
+        session=session
+    )
+
+    # Recorded per article, so the read side keeps pulling what was posted
+    # while a category was large even after it shrinks.
+    for article in articles:
+        if article.category_id in large_category_ids:
+            article.fanned_out = False
+
+    # The INSERT ... SELECT below reads the new rows back from `articles`.
+    await session.flush()
+
+    for start in range(0, len(articles), FANOUT_CHUNK_SIZE):
+        article_ids = [
+            article.id
+            for article in articles[start:start + FANOUT_CHUNK_SIZE]
+        ]
+        new_articles = select(
+            ArticleModel.id,
+            ArticleModel.author_id,
+            ArticleModel.author_visibility,
+            ArticleModel.category_id,
+        ).where(
+            ArticleModel.id.in_(article_ids)
+        ).subquery()
+
+        # Followers of large categories are served on read instead, so one
+        # post there does not write a row per follower.
+        category_followers = select(
+            follow_category_table.c.user_id,
+            new_articles.c.id,
+        ).join(
+            follow_category_table,
+            follow_category_table.c.category_id == new_articles.c.category_id
+        )
+        if large_category_ids:
+            category_followers = category_followers.where(
+                new_articles.c.category_id.not_in(large_category_ids)
+            )
+
+        await session.execute(insert(timeline_table).from_select(
+            ["user_id", "article_id"],
+            union(
+                select(new_articles.c.author_id, new_articles.c.id),
+                category_followers,
+                # An anonymous post reaching only the author's friends would
+                # narrow the author down to one of them, so it travels
+                # through its category alone.
+                select(friend_table.c.user_id, new_articles.c.id).join(
+                    friend_table,
+                    friend_table.c.friend_id == new_articles.c.author_id
+                ).where(new_articles.c.author_visibility != 0),
+                select(friend_table.c.friend_id, new_articles.c.id).join(
+                    friend_table,
+                    friend_table.c.user_id == new_articles.c.author_id
+                ).where(new_articles.c.author_visibility != 0),
+            )
+        ))
+
+
+async def remove_category_from_timeline(
+    user_id: int,
+    category_id: int,
+    session: AsyncSession,
+) -> None:
+    friend_ids = union(
+        select(friend_table.c.friend_id).where(
+            friend_table.c.user_id == user_id
+        ),
+        select(friend_table.c.user_id).where(
+            friend_table.c.friend_id == user_id
+        ),
+    )
+
+    # Articles that reached the timeline as the user's own or a friend's
+    # stay; only the ones delivered through the category go. Anonymous
+    # posts never fan out to friends, so those go too.
+    await session.execute(delete(timeline_table).where(
+        timeline_table.c.user_id == user_id,
+        timeline_table.c.article_id.in_(select(ArticleModel.id).where(
+            ArticleModel.category_id == category_id,
+            ArticleModel.author_id != user_id,
+            or_(
+                ArticleModel.author_visibility == 0,
+                ArticleModel.author_id.not_in(friend_ids),
+            ),
+        ))
+    ))
+
+
+async def remove_friend_from_timeline(
+    user_id: int,
+    friend_id: int,
+    session: AsyncSession,
+) -> None:
+    # The friend's articles stay where they also arrived through a category
+    # the user follows.
+    await session.execute(delete(timeline_table).where(
+        timeline_table.c.user_id == user_id,
+        timeline_table.c.article_id.in_(select(ArticleModel.id).where(
+            ArticleModel.author_id == friend_id,
+            or_(
+                ArticleModel.category_id.is_(None),
+                ArticleModel.category_id.not_in(select(
+                    follow_category_table.c.category_id
+                ).where(
+                    follow_category_table.c.user_id == user_id
+                )),
+            ),
+        ))
+    ))
+
+
+async def get_feed_version(
+    user_id: int,
+    session: Optional[AsyncSession] = None,
+) -> int:
+    # New articles move the articles version; this covers the follows,
+    # unfollows and friendships that reshape the feed without one.
+    async with get_session(session) as session:
+        return (await session.execute(select(
+            UserModel.feed_seq
+        ).where(
+            UserModel.id == user_id
+        ))).scalar() or 0
+
+
+async def get_feed(
+    user_id: int,
+    session: Optional[AsyncSession] = None,
+    before: Optional[int] = None,
+    after: Optional[int] = None,
+    limit: int = 20,
+) -> tuple[list[ArticleModel], Optional[int]]:
+    ascending = after is not None and before is None
+
+    async with get_session(session) as session:
+        timeline = select(
+            timeline_table.c.article_id
+        ).where(
+            timeline_table.c.user_id == user_id
+        )
+        if before is not None:
+            timeline = timeline.where(timeline_table.c.article_id < before)
+        if after is not None:
+            timeline = timeline.where(timeline_table.c.article_id > after)
+
+        timeline = timeline.order_by(
+            timeline_table.c.article_id.asc() if ascending
+            else timeline_table.c.article_id.desc()
+        ).limit(limit + 1)
+
+        article_ids = set((await session.execute(timeline)).scalars().all())
+
+        # Articles that skipped fan-out are merged in from the followed
+        # categories through the (category_id, fanned_out, id) index.
+        stat = select(ArticleModel.id).where(
+            ArticleModel.category_id.in_(select(
+                follow_category_table.c.category_id
+            ).where(
+                follow_category_table.c.user_id == user_id
+            )),
+            ArticleModel.fanned_out == False,
+            ArticleModel.is_event == False,
+        )
+        if before is not None:
+            stat = stat.where(ArticleModel.id < before)
+        if after is not None:
+            stat = stat.where(ArticleModel.id > after)
+
+        article_ids.update((await session.execute(stat.order_by(
+            ArticleModel.id.asc() if ascending
+            else ArticleModel.id.desc()
+        ).limit(limit + 1))).scalars().all())
+
+        page = sorted(article_ids, reverse=not ascending)
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        next_cursor = page[-1] if has_more else None
+
+        if not page:
+            return [], None
+
+        articles = {
+            article.id: article
+            for article in (await session.execute(select(
+                ArticleModel
+            ).where(
+                ArticleModel.id.in_(page)
+            ).options(
+                joinedload(ArticleModel.author),
+                joinedload(ArticleModel.category),
+            ))).scalars().all()
+        }
+
+        return [
+            articles[id] for id in sorted(page, reverse=True)
+            if id in articles
+        ], next_cursor
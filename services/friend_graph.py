@@ -0,0 +1,136 @@
+from cachetools import TTLCache
+from sqlalchemy import select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Optional, Union
+
+from config import (
+    FRIEND_GRAPH_CACHE_SIZE,
+    FRIEND_GRAPH_CACHE_TTL,
+    FRIEND_GRAPH_SYNC_INTERVAL,
+)
+from model import UserModel
+from model.relationships import friend_table
+from snowflake import SnowflakeID
+from snowflake.snowflake import UTC
+
+SYNC_LOOKBACK = 5.0
+
+
+class FriendGraph:
+    generation: int
+
+    _adjacency: Optional[TTLCache]
+    _sync_interval: float
+    _synced_at: float
+    _synced_until: Optional[datetime]
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        sync_interval: float = 1.0,
+    ) -> None:
+        self.generation = 0
+
+        self._adjacency = TTLCache(
+            maxsize=maxsize,
+            ttl=ttl
+        ) if maxsize > 0 else None
+        self._sync_interval = sync_interval
+        self._synced_at = float("-inf")
+        self._synced_until = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._adjacency is not None
+
+    async def __sync(self, session: AsyncSession) -> None:
+        if monotonic() - self._synced_at < self._sync_interval:
+            return
+        self._synced_at = monotonic()
+
+        now = datetime.now(UTC)
+        since, self._synced_until = self._synced_until, now
+        if since is None:
+            return
+
+        # Friendships written by other workers bump users.feed_seq; dropping
+        # just those users keeps every worker within one sync interval. The
+        # lookback covers transactions that drew their snowflake before the
+        # last sync but committed after it.
+        changed = (await session.execute(select(
+            UserModel.id
+        ).where(
+            UserModel.feed_seq >= SnowflakeID.lower_bound(
+                since - timedelta(seconds=SYNC_LOOKBACK)
+            ).value
+        ))).scalars().all()
+
+        if changed:
+            self.invalidate(*changed)
+
+    async def get_friend_ids(
+        self,
+        user_id: Union[int, SnowflakeID],
+        session: AsyncSession
+    ) -> frozenset[int]:
+        user_id = int(user_id)
+
+        if self._adjacency is not None:
+            await self.__sync(session)
+
+            friend_ids = self._adjacency.get(user_id)
+            if friend_ids is not None:
+                return friend_ids
+
+        # An invalidation that lands while the query is in flight must win
+        # over the rows this fill read.
+        generation = self.generation
+        result = await session.execute(union(
+            select(friend_table.c.friend_id).where(
+                friend_table.c.user_id == user_id
+            ),
+            select(friend_table.c.user_id).where(
+                friend_table.c.friend_id == user_id
+            ),
+        ))
+        friend_ids = frozenset(result.scalars().all())
+
+        if self._adjacency is not None and generation == self.generation:
+            self._adjacency[user_id] = friend_ids
+
+        return friend_ids
+
+    async def is_friend(
+        self,
+        user_id: Union[int, SnowflakeID],
+        friend_id: Union[int, SnowflakeID],
+        session: AsyncSession
+    ) -> bool:
+        user_id, friend_id = int(user_id), int(friend_id)
+
+        if self._adjacency is not None and \
+                user_id not in self._adjacency and \
+                friend_id in self._adjacency:
+            user_id, friend_id = friend_id, user_id
+
+        return friend_id in await self.get_friend_ids(user_id, session)
+
+    def invalidate(self, *user_ids: Union[int, SnowflakeID]) -> None:
+        self.generation += 1
+
+        if self._adjacency is None:
+            return
+
+        for user_id in user_ids:
+            self._adjacency.pop(int(user_id), None)
+
+
+friend_graph = FriendGraph(
+    maxsize=FRIEND_GRAPH_CACHE_SIZE,
+    ttl=FRIEND_GRAPH_CACHE_TTL,
+    sync_interval=FRIEND_GRAPH_SYNC_INTERVAL,
+)
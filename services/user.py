@@ -1,9 +1,9 @@
-from bcrypt import gensalt, hashpw
 from sqlalchemy import and_, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from typing import Optional, Union
 
+from auth.password import hash_password
 from db import get_session
 from exceptions.user import (
     USER_NOT_FOUND,
@@ -13,7 +13,10 @@ from model import UserModel
 from model.relationships import friend_table
 from model.view import UserView
 from schemas.user import UserUpdate
-from snowflake import SnowflakeID
+from snowflake import id_generator, SnowflakeID
+
+from .feed import remove_friend_from_timeline
+from .friend_graph import friend_graph
 
 
 async def get_user_by_id(
@@ -43,12 +46,10 @@ async def update_user_by_id(
             exclude_none=True
         )
         if user_update.password is not None:
-            salt = gensalt()
-            hashed_password = hashpw(
-                user_update.password.encode("utf-8"),
-                salt
+            update_data["password_hash"] = await hash_password(
+                user_update.password
             )
-            update_data["password_hash"] = hashed_password
+        update_data["updated_seq"] = id_generator.next_id().value
 
         await session.execute(
             update(UserModel).
@@ -104,12 +105,61 @@ async def add_friend_by_id(
             user_id=user_id,
             friend_id=friend_id
         ))
+        await session.execute(update(UserModel).where(
+            UserModel.id.in_([user_id, friend_id])
+        ).values(
+            feed_seq=id_generator.next_id().value
+        ))
 
         try:
             await session.commit()
         except:
             await session.rollback()
             raise USER_UPDATE_FAILED
+        finally:
+            friend_graph.invalidate(user_id, friend_id)
+
+
+async def remove_friend_by_id(
+    user_id: Union[int, SnowflakeID],
+    friend_id: Union[int, SnowflakeID],
+    session: Optional[AsyncSession] = None
+) -> None:
+    async with get_session(session) as session:
+        result = await session.execute(friend_table.delete().where(or_(
+            and_(friend_table.c.user_id == user_id,
+                 friend_table.c.friend_id == friend_id),
+            and_(friend_table.c.user_id == friend_id,
+                 friend_table.c.friend_id == user_id)
+        )))
+
+        if result.rowcount == 0:
+            await session.rollback()
+            raise USER_UPDATE_FAILED
+
+        await remove_friend_from_timeline(
+            user_id=int(user_id),
+            friend_id=int(friend_id),
+            session=session
+        )
+        await remove_friend_from_timeline(
+            user_id=int(friend_id),
+            friend_id=int(user_id),
+            session=session
+        )
+        await session.execute(update(UserModel).where(
+            UserModel.id.in_([user_id, friend_id])
+        ).values(
+            feed_seq=id_generator.next_id().value
+        ))
+
+        try:
+            await session.commit()
+        except:
+            await session.rollback()
+            raise USER_UPDATE_FAILED
+        finally:
+            friend_graph.invalidate(user_id, friend_id)
 
 
 async def get_friends_by_user_id(
@@ -117,26 +167,23 @@ async def get_friends_by_user_id(
     session: Optional[AsyncSession] = None
 ) -> list[UserView]:
     async with get_session(session) as session:
-        result = await session.execute(
-            friend_table.select().where(
-                or_(
-                    friend_table.c.user_id == user_id,
-                    friend_table.c.friend_id == user_id
-                )
+        if not friend_graph.enabled:
+            return await UserView.get_friends(
+                user_id=user_id,
+                session=session
             )
-        )
 
-        friends = []
-        for row in result.fetchall():
-            friend_id = row.friend_id if row.user_id == user_id else row.user_id
-            friend = await UserView.query_by(
-                session,
-                UserModel.id == friend_id
-            )
-            if friend:
-                friends.append(friend)
+        friend_ids = await friend_graph.get_friend_ids(
+            user_id=user_id,
+            session=session
+        )
+        if len(friend_ids) == 0:
+            return []
 
-        return friends
+        return await UserView.query_all_by(
+            session,
+            UserModel.id.in_(friend_ids)
+        )
 
 
 async def check_is_friend(
@@ -148,6 +195,13 @@ async def check_is_friend(
         return False
 
     async with get_session(session) as session:
+        if friend_graph.enabled:
+            return await friend_graph.is_friend(
+                user_id=user_id,
+                friend_id=friend_id,
+                session=session
+            )
+
         friend_exists = await session.execute(
             friend_table.select().where(or_(
                 and_(friend_table.c.user_id == user_id,
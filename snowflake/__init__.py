@@ -1 +1,6 @@
-from .snowflake import SnowflakeGenerator, SnowflakeID
+from .snowflake import (
+    id_generator,
+    InstanceLeaseExpired,
+    SnowflakeGenerator,
+    SnowflakeID,
+)
@@ -0,0 +1,181 @@
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from asyncio import CancelledError, create_task, sleep, Task
+from os import getenv, getpid
+from random import randrange
+from socket import gethostname
+from time import monotonic, time_ns
+from traceback import print_exc
+from typing import Optional
+from uuid import uuid4
+
+from config import SNOWFLAKE_LEASE_TTL
+from db import get_session
+from model import InstanceLeaseModel
+
+from .snowflake import id_generator, MAX_INST, SnowflakeGenerator
+
+
+def now_millis() -> int:
+    return time_ns() // 1_000_000
+
+
+class InstanceLease:
+    owner: str
+    instance_id: Optional[int]
+
+    _generator: SnowflakeGenerator
+    _ttl_ms: int
+    _valid_for: float
+    _heartbeat: Optional[Task]
+
+    def __init__(self, generator: SnowflakeGenerator, ttl: float) -> None:
+        self.owner = f"{gethostname()}:{getpid()}:{uuid4().hex[:8]}"
+        self.instance_id = None
+
+        self._generator = generator
+        self._ttl_ms = int(ttl * 1000)
+        # The local deadline ends a fifth of the ttl before the row expires,
+        # leaving room for clock skew with the worker that reclaims it.
+        self._valid_for = ttl * 0.8
+        self._heartbeat = None
+
+    async def __claim_expired(self, session: AsyncSession) -> Optional[int]:
+        now = now_millis()
+        candidates = (await session.execute(select(
+            InstanceLeaseModel.instance_id
+        ).where(
+            InstanceLeaseModel.expires_at < now
+        ).order_by(
+            InstanceLeaseModel.expires_at
+        ).limit(8))).scalars().all()
+
+        for instance_id in candidates:
+            # Only one worker can win the conditional update for a slot,
+            # even when several reclaim the same expired row concurrently.
+            result = await session.execute(update(InstanceLeaseModel).where(
+                InstanceLeaseModel.instance_id == instance_id,
+                InstanceLeaseModel.expires_at < now,
+            ).values(
+                owner=self.owner,
+                expires_at=now + self._ttl_ms,
+            ))
+            await session.commit()
+
+            if result.rowcount == 1:
+                return instance_id
+
+        return None
+
+    async def __claim_unused(self, session: AsyncSession) -> Optional[int]:
+        used = set((await session.execute(select(
+            InstanceLeaseModel.instance_id
+        ))).scalars().all())
+
+        offset = randrange(MAX_INST + 1)
+        for step in range(MAX_INST + 1):
+            instance_id = (offset + step) & MAX_INST
+            if instance_id in used:
+                continue
+
+            try:
+                await session.execute(insert(InstanceLeaseModel).values(
+                    instance_id=instance_id,
+                    owner=self.owner,
+                    expires_at=now_millis() + self._ttl_ms,
+                ))
+                await session.commit()
+                return instance_id
+            except IntegrityError:
+                await session.rollback()
+
+        return None
+
+    async def acquire(self, session: Optional[AsyncSession] = None) -> int:
+        started = monotonic()
+        async with get_session(session) as session:
+            instance_id = await self.__claim_expired(session)
+            if instance_id is None:
+                instance_id = await self.__claim_unused(session)
+
+        if instance_id is None:
+            raise RuntimeError("No free snowflake instance id to lease.")
+
+        self.instance_id = instance_id
+        self._generator.set_lease(instance_id, started + self._valid_for)
+
+        return instance_id
+
+    async def renew(self, session: Optional[AsyncSession] = None) -> None:
+        if self.instance_id is None:
+            await self.acquire(session)
+            return
+
+        started = monotonic()
+        async with get_session(session) as session:
+            result = await session.execute(update(InstanceLeaseModel).where(
+                InstanceLeaseModel.instance_id == self.instance_id,
+                InstanceLeaseModel.owner == self.owner,
+            ).values(
+                expires_at=now_millis() + self._ttl_ms,
+            ))
+            await session.commit()
+
+            if result.rowcount == 1:
+                self._generator.set_lease(
+                    self.instance_id,
+                    started + self._valid_for
+                )
+                return
+
+            # The slot expired and was handed to someone else; stop issuing
+            # ids under it before moving to a fresh one.
+            self._generator.expire_lease()
+            self.instance_id = None
+            await self.acquire(session)
+
+    async def __heartbeat_loop(self) -> None:
+        while True:
+            await sleep(self._ttl_ms / 3000)
+            try:
+                await self.renew()
+            except CancelledError:
+                raise
+            except:
+                print_exc()
+
+    async def start(self) -> None:
+        await self.acquire()
+
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = create_task(self.__heartbeat_loop())
+
+    async def release(self, session: Optional[AsyncSession] = None) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except CancelledError:
+                pass
+            self._heartbeat = None
+
+        self._generator.expire_lease()
+        if self.instance_id is None:
+            return
+
+        async with get_session(session) as session:
+            await session.execute(delete(InstanceLeaseModel).where(
+                InstanceLeaseModel.instance_id == self.instance_id,
+                InstanceLeaseModel.owner == self.owner,
+            ))
+            await session.commit()
+
+        self.instance_id = None
+
+
+instance_lease = InstanceLease(
+    generator=id_generator,
+    ttl=SNOWFLAKE_LEASE_TTL,
+) if getenv("SNOWFLAKE_INSTANCE_ID") is None else None
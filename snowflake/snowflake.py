@@ -3,7 +3,10 @@ from pydantic.json_schema import JsonSchemaValue
 from pydantic_core import CoreSchema, core_schema
 
 from datetime import datetime, timedelta
-from typing import Any, Union
+from os import getenv, getpid, register_at_fork
+from threading import Lock
+from time import monotonic, time_ns
+from typing import Any, Callable, Optional, Union
 try:
     from datetime import UTC
 except ImportError:
@@ -25,6 +28,8 @@ MAX_TS = (1 << TS_LEN) - 1
 MAX_INST = (1 << INST_LEN) - 1
 MAX_SEQ = (1 << SEQ_LEN) - 1
 
+START_MS = int(START_TS.timestamp() * 1000)
+
 
 class SnowflakeID():
     value: int
@@ -65,6 +70,28 @@ class SnowflakeID():
     def instance_id(self) -> int:
         return (self.value >> SEQ_LEN) & MAX_INST
 
+    @staticmethod
+    def __millis_since_start(dt: datetime) -> int:
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=UTC)
+
+        delta = dt - START_TS
+        millis = (delta.days * 86_400_000
+                  + delta.seconds * 1000
+                  + delta.microseconds // 1000)
+        return min(max(millis, 0), MAX_TS)
+
+    @classmethod
+    def lower_bound(cls, dt: datetime) -> "SnowflakeID":
+        return cls(value=cls.__millis_since_start(dt) << (INST_LEN + SEQ_LEN))
+
+    @classmethod
+    def upper_bound(cls, dt: datetime) -> "SnowflakeID":
+        return cls(
+            value=(cls.__millis_since_start(dt) << (INST_LEN + SEQ_LEN))
+            | ((1 << (INST_LEN + SEQ_LEN)) - 1)
+        )
+
     @property
     def sequence(self) -> int:
         return self.value & MAX_SEQ
@@ -101,35 +128,143 @@ class SnowflakeID():
         return core_schema.no_info_before_validator_function(uid_validator, inner_schema)
 
 
+class InstanceLeaseExpired(RuntimeError):
+    pass
+
+
+def default_instance_id() -> int:
+    instance_id = getenv("SNOWFLAKE_INSTANCE_ID")
+    if instance_id is not None:
+        return int(instance_id) & MAX_INST
+
+    return getpid() & MAX_INST
+
+
+def current_millis() -> int:
+    return time_ns() // 1_000_000 - START_MS
+
+
 class SnowflakeGenerator():
     _last_timestamp: int
     _sequence: int
     _instance: int
+    _deadline: Optional[float]
+    _clock: Callable[[], int]
+    _lock: Lock
+
+    def __init__(
+        self,
+        instance_id: int = 0,
+        clock: Optional[Callable[[], int]] = None
+    ):
+        if not 0 <= instance_id <= MAX_INST:
+            raise ValueError(f"instance_id must be within 0..{MAX_INST}.")
 
-    def __init__(self, instance_id: int = 0):
         self._last_timestamp = 0
         self._sequence = 0
         self._instance = instance_id
+        self._deadline = None
+        self._clock = clock or current_millis
+        self._lock = Lock()
 
-    def __next__(self) -> SnowflakeID:
-        delta = (datetime.now(UTC) - START_TS)
-        current = int(delta.total_seconds() * 1000)
+    @property
+    def instance_id(self) -> int:
+        return self._instance
+
+    def set_instance_id(self, instance_id: int) -> None:
+        if not 0 <= instance_id <= MAX_INST:
+            raise ValueError(f"instance_id must be within 0..{MAX_INST}.")
 
-        if current == self._last_timestamp:
-            while current != self._last_timestamp:
-                delta = (datetime.now(UTC) - START_TS)
-                current = int(delta.total_seconds() * 1000)
-            self._sequence += 1
-        else:
-            self._sequence = 0
+        with self._lock:
+            self._instance = instance_id
 
-        self._last_timestamp = current
+    def set_lease(self, instance_id: int, deadline: Optional[float]) -> None:
+        # Past the monotonic deadline another process may own the slot, so
+        # no more ids are issued under it; None lifts the restriction.
+        if not 0 <= instance_id <= MAX_INST:
+            raise ValueError(f"instance_id must be within 0..{MAX_INST}.")
 
-        value = (current << (INST_LEN + SEQ_LEN))
-        value |= self._instance << (SEQ_LEN)
-        value |= self._sequence
+        with self._lock:
+            self._instance = instance_id
+            self._deadline = deadline
 
-        return SnowflakeID(value=value)
+    def expire_lease(self) -> None:
+        with self._lock:
+            if self._deadline is not None:
+                self._deadline = min(self._deadline, monotonic())
+
+    def reset(self, instance_id: int) -> None:
+        self._lock = Lock()
+        self._last_timestamp = 0
+        self._sequence = 0
+        self._deadline = None
+        self.set_instance_id(instance_id)
+
+    def __reserve(self, count: int) -> tuple[int, int, int, int]:
+        with self._lock:
+            if self._deadline is not None and monotonic() >= self._deadline:
+                raise InstanceLeaseExpired(
+                    f"The lease on instance id {self._instance} has expired."
+                )
+
+            current = self._clock()
+
+            if current > self._last_timestamp:
+                self._last_timestamp = current
+                self._sequence = 0
+            elif self._sequence > MAX_SEQ:
+                if current < self._last_timestamp:
+                    # The wall clock went backwards and this millisecond is
+                    # used up; borrow the next one instead of waiting out
+                    # the whole regression.
+                    self._last_timestamp += 1
+                else:
+                    while current <= self._last_timestamp:
+                        current = self._clock()
+                    self._last_timestamp = current
+                self._sequence = 0
+
+            first = self._sequence
+            taken = min(count, MAX_SEQ + 1 - first)
+            self._sequence += taken
+
+            return self._last_timestamp, self._instance, first, taken
+
+    @staticmethod
+    def __compose(timestamp: int, instance: int, sequence: int) -> int:
+        value = timestamp << (INST_LEN + SEQ_LEN)
+        value |= instance << SEQ_LEN
+        value |= sequence
+        return value
+
+    def __next__(self) -> SnowflakeID:
+        timestamp, instance, sequence, _ = self.__reserve(1)
+
+        return SnowflakeID(
+            value=self.__compose(timestamp, instance, sequence)
+        )
 
     def next_id(self) -> SnowflakeID:
         return self.__next__()
+
+    def next_ids(self, count: int) -> list[SnowflakeID]:
+        ids: list[SnowflakeID] = []
+
+        while len(ids) < count:
+            timestamp, instance, first, taken = self.__reserve(
+                count - len(ids)
+            )
+            base = self.__compose(timestamp, instance, 0)
+            ids.extend(
+                SnowflakeID(value=base | sequence)
+                for sequence in range(first, first + taken)
+            )
+
+        return ids
+
+
+id_generator = SnowflakeGenerator(instance_id=default_instance_id())
+
+register_at_fork(
+    after_in_child=lambda: id_generator.reset(default_instance_id())
+)
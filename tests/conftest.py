@@ -0,0 +1,18 @@
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db import Base
+import model  # noqa: F401
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.db'}",
+        connect_args={"timeout": 30},
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    yield engine
+    await engine.dispose()
@@ -0,0 +1,89 @@
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from datetime import datetime, timedelta
+
+import db
+from auth.utils import validate_depends
+from model import ArticleModel
+from routes.analysis import router
+from snowflake import SnowflakeID
+from snowflake.snowflake import UTC
+
+NOW = datetime.now(UTC).replace(microsecond=0)
+
+
+@pytest_asyncio.fixture
+async def app(engine) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+
+    async def session():
+        async with AsyncSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[db.__get_session] = session
+
+    # Ids minted one, two and three days ago.
+    async with AsyncSession(engine) as seed:
+        for days, is_event in ((3, False), (2, False), (1, True)):
+            seed.add(ArticleModel(
+                id=SnowflakeID.lower_bound(
+                    NOW - timedelta(days=days)
+                ).value,
+                author_id=1,
+                author_visibility=0,
+                title="t",
+                content="c",
+                tags="",
+                is_public=True,
+                is_event=is_event,
+            ))
+        await seed.commit()
+
+    return app
+
+
+def make_client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_counts_use_the_time_window(app):
+    app.dependency_overrides[validate_depends] = lambda: 1
+
+    def window(days: int) -> dict[str, str]:
+        return {
+            "start": (NOW - timedelta(days=days, hours=12)).isoformat(),
+            "end": NOW.isoformat(),
+        }
+
+    async with make_client(app) as client:
+        assert (await client.get("/analysis/post-count")).json() == 2
+        assert (await client.get("/analysis/event-count")).json() == 1
+        assert (await client.get(
+            "/analysis/post-count",
+            params=window(2),
+        )).json() == 1
+        assert (await client.get(
+            "/analysis/event-count",
+            params=window(0),
+        )).json() == 0
+
+
+@pytest.mark.asyncio
+async def test_analysis_requires_login_and_stubs_answer_501(app):
+    async with make_client(app) as client:
+        assert (await client.get("/analysis/post-count")).status_code == 401
+        assert (await client.get("/analysis/emotion")).status_code == 401
+
+        app.dependency_overrides[validate_depends] = lambda: 1
+
+        assert (await client.get("/analysis/emotion")).status_code == 501
+        assert (await client.get("/analysis/keywords/1")).status_code == 501
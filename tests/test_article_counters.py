@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from model import ArticleModel
+from services.article import (
+    add_article_interest,
+    reconcile_article_counters,
+    remove_article_interest,
+)
+from services.comment import add_comment_by_article_id
+from snowflake import id_generator
+
+
+async def create_article(engine) -> int:
+    article_id = id_generator.next_id().value
+    async with AsyncSession(engine) as session:
+        session.add(ArticleModel(
+            id=article_id,
+            author_id=1,
+            author_visibility=0,
+            title="t",
+            content="c",
+            is_public=True,
+            is_event=False,
+        ))
+        await session.commit()
+
+    return article_id
+
+
+async def counters(engine, article_id: int) -> tuple[int, int]:
+    async with AsyncSession(engine) as session:
+        return tuple((await session.execute(select(
+            ArticleModel.interest_count,
+            ArticleModel.comment_count,
+        ).where(ArticleModel.id == article_id))).one())
+
+
+async def call(engine, func, *args):
+    async with AsyncSession(engine) as session:
+        return await func(*args, session)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_interest_is_counted_once(engine):
+    article_id = await create_article(engine)
+
+    assert await call(engine, add_article_interest, article_id, 1) is True
+    assert await call(engine, add_article_interest, article_id, 1) is False
+    assert await call(engine, add_article_interest, article_id, 2) is True
+
+    assert await counters(engine, article_id) == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_removing_absent_interest_does_not_decrement(engine):
+    article_id = await create_article(engine)
+    await call(engine, add_article_interest, article_id, 1)
+
+    assert await call(engine, remove_article_interest, article_id, 2) is False
+    assert await call(engine, remove_article_interest, article_id, 1) is True
+    assert await call(engine, remove_article_interest, article_id, 1) is False
+
+    assert await counters(engine, article_id) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_comments_bump_comment_count(engine):
+    article_id = await create_article(engine)
+
+    for author_id in (1, 2, 2):
+        await call(
+            engine,
+            add_comment_by_article_id,
+            article_id,
+            author_id,
+            "hi",
+            0
+        )
+
+    assert await counters(engine, article_id) == (0, 3)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drifted_counters(engine):
+    article_id = await create_article(engine)
+    await call(engine, add_article_interest, article_id, 1)
+    await call(engine, add_comment_by_article_id, article_id, 1, "hi", 0)
+
+    async with AsyncSession(engine) as session:
+        await session.execute(update(ArticleModel).where(
+            ArticleModel.id == article_id
+        ).values(interest_count=7, comment_count=0, join_count=3))
+        await session.commit()
+
+    async with AsyncSession(engine) as session:
+        await reconcile_article_counters(session)
+        join_count = (await session.execute(select(
+            ArticleModel.join_count
+        ).where(ArticleModel.id == article_id))).scalar_one()
+
+    assert await counters(engine, article_id) == (1, 1)
+    assert join_count == 0
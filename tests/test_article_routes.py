@@ -0,0 +1,182 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from typing import Optional
+
+import db
+from auth.utils import validate_depends
+from model import ArticleModel, UserModel
+from routes.articles import router
+from services.article import get_all_articles
+from services.comment import add_comment_by_article_id
+from snowflake import id_generator
+
+USER = 1
+
+
+@pytest.fixture
+def client(engine):
+    app = FastAPI()
+    app.include_router(router)
+
+    async def session():
+        async with AsyncSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[db.__get_session] = session
+    app.dependency_overrides[validate_depends] = lambda: USER
+
+    return AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    )
+
+
+async def add_user(engine, user_id: int, name: str) -> None:
+    async with AsyncSession(engine) as session:
+        session.add(UserModel(
+            id=user_id,
+            username=name,
+            display_name=name.title(),
+            gender="",
+            department="R&D",
+            onboarding_year=2024,
+            onboarding_month=1,
+            onboarding_day=1,
+            interest="",
+            password_hash="",
+        ))
+        await session.commit()
+
+
+async def add_article(
+    engine,
+    author_visibility: int = 0,
+    is_event: bool = False,
+) -> int:
+    return (await add_articles(engine, 1, author_visibility, is_event))[0]
+
+
+async def add_articles(
+    engine,
+    count: int,
+    author_visibility: int = 0,
+    is_event: bool = False,
+) -> list[int]:
+    # One batch of ids usually shares a millisecond, so paging has to rely
+    # on the whole snowflake rather than its timestamp.
+    article_ids = [id.value for id in id_generator.next_ids(count)]
+    async with AsyncSession(engine) as session:
+        session.add_all([ArticleModel(
+            id=article_id,
+            author_id=USER,
+            author_visibility=author_visibility,
+            title="t",
+            content="c",
+            tags="",
+            is_public=True,
+            is_event=is_event,
+        ) for article_id in article_ids])
+        await session.commit()
+
+    return article_ids
+
+
+async def page(engine, **kwargs) -> tuple[list[int], Optional[int]]:
+    async with AsyncSession(engine) as session:
+        articles, next_cursor = await get_all_articles(
+            session=session,
+            **kwargs
+        )
+
+    return [article.id for article in articles], next_cursor
+
+
+@pytest.mark.asyncio
+async def test_get_comments(engine, client):
+    await add_user(engine, USER, "alice")
+    article_id = await add_article(engine)
+    async with AsyncSession(engine) as session:
+        await add_comment_by_article_id(article_id, USER, "first", 0, session)
+    async with AsyncSession(engine) as session:
+        await add_comment_by_article_id(article_id, USER, "second", 1, session)
+
+    async with client:
+        response = await client.get(f"/articles/{article_id}/comments")
+
+    assert response.status_code == 200
+    assert [
+        (comment["content"], comment["author_id"], comment["author_name"])
+        for comment in response.json()
+    ] == [
+        ("second", str(USER), "Alice"),
+        ("first", None, "匿名"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_before_pages_walk_back_to_the_end(engine):
+    article_ids = await add_articles(engine, 5)
+    newest_first = article_ids[::-1]
+
+    assert await page(engine, limit=2) == (newest_first[:2], newest_first[1])
+    assert await page(engine, limit=2, before=newest_first[1]) == (
+        newest_first[2:4], newest_first[3]
+    )
+    assert await page(engine, limit=2, before=newest_first[3]) == (
+        newest_first[4:], None
+    )
+    # A last page that is exactly full still ends the walk.
+    assert await page(engine, limit=1, before=newest_first[3]) == (
+        newest_first[4:], None
+    )
+
+
+@pytest.mark.asyncio
+async def test_after_pages_walk_forward_newest_first(engine):
+    article_ids = await add_articles(engine, 5)
+
+    assert await page(engine, limit=2, after=article_ids[0]) == (
+        [article_ids[2], article_ids[1]], article_ids[2]
+    )
+    assert await page(engine, limit=2, after=article_ids[2]) == (
+        [article_ids[4], article_ids[3]], None
+    )
+    assert await page(
+        engine,
+        limit=5,
+        after=article_ids[0],
+        before=article_ids[4]
+    ) == ([article_ids[3], article_ids[2], article_ids[1]], None)
+
+
+@pytest.mark.asyncio
+async def test_type_filter_applies_before_the_limit(engine):
+    posts = await add_articles(engine, 2)
+    events = await add_articles(engine, 2, is_event=True)
+
+    assert await page(engine, type="event", limit=5) == (events[::-1], None)
+    assert await page(engine, type="follow", limit=1) == (
+        [posts[1]], posts[1]
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_keeps_the_array_body_and_sends_the_cursor(engine, client):
+    article_ids = await add_articles(engine, 3)
+
+    async with client:
+        first = await client.get("/articles", params={"limit": 2})
+        last = await client.get("/articles", params={
+            "limit": 2,
+            "before": first.headers["X-Next-Cursor"]
+        })
+        too_large = await client.get("/articles", params={"limit": 1000})
+
+    assert [int(a["id"]) for a in first.json()] == article_ids[:0:-1]
+    assert first.headers["X-Next-Cursor"] == str(article_ids[1])
+    assert [int(a["id"]) for a in last.json()] == article_ids[:1]
+    assert "X-Next-Cursor" not in last.headers
+    assert too_large.status_code == 422
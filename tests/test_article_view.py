@@ -0,0 +1,125 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from model import ArticleModel, CategoryModel, UserModel
+from model.view import ArticleView
+from snowflake import id_generator
+
+ALICE, BOB, GONE = 1, 2, 3
+
+
+async def add_user(session: AsyncSession, user_id: int, name: str) -> None:
+    session.add(UserModel(
+        id=user_id,
+        username=name,
+        display_name=name.title(),
+        gender="",
+        department=f"{name} dept",
+        onboarding_year=2024,
+        onboarding_month=1,
+        onboarding_day=1,
+        interest="",
+        password_hash="",
+    ))
+
+
+@pytest_asyncio.fixture
+async def articles(engine) -> list[int]:
+    category_id = id_generator.next_id().value
+    rows = [
+        # (author, visibility, category)
+        (ALICE, 0, category_id),
+        (ALICE, 0b01, category_id),
+        (BOB, 0b10, None),
+        (BOB, 0b11, category_id),
+        (GONE, 0b01, None),
+    ]
+    article_ids = [id.value for id in id_generator.next_ids(len(rows))]
+
+    async with AsyncSession(engine) as session:
+        await add_user(session, ALICE, "alice")
+        await add_user(session, BOB, "bob")
+        session.add(CategoryModel(id=category_id, name="tech"))
+        session.add_all([ArticleModel(
+            id=article_id,
+            author_id=author_id,
+            author_visibility=visibility,
+            category_id=category,
+            title="t",
+            content="c",
+            tags="",
+            is_public=True,
+            is_event=False,
+        ) for article_id, (author_id, visibility, category) in zip(
+            article_ids,
+            rows
+        )])
+        await session.commit()
+
+    return article_ids
+
+
+async def hydrate(engine, article_ids: list[int], *options):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    async with AsyncSession(engine) as session:
+        models = (await session.execute(select(ArticleModel).where(
+            ArticleModel.id.in_(article_ids)
+        ).options(*options))).scalars().all()
+        models = sorted(models, key=lambda model: article_ids.index(model.id))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+        try:
+            views = await ArticleView.from_models(models, session=session)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    return views, statements
+
+
+@pytest.mark.asyncio
+async def test_batch_hydration_hides_anonymous_authors(engine, articles):
+    views, statements = await hydrate(engine, articles)
+
+    assert [view.id for view in views] == [str(id) for id in articles]
+    assert [(view.author_id, view.author_name) for view in views] == [
+        (None, "匿名"),
+        (str(ALICE), "Alice"),
+        (None, "bob dept"),
+        (str(BOB), "bob dept Bob"),
+        (None, "未知用户"),
+    ]
+    assert [view.category_name for view in views] == [
+        "tech", "tech", None, "tech", None
+    ]
+
+    # One grouped query for authors and one for categories.
+    assert len(statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_anonymous_author_is_never_looked_up(engine, articles):
+    _, statements = await hydrate(engine, articles[:1])
+
+    assert not any("users" in statement for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_loaded_relationships_skip_the_queries(engine, articles):
+    views, statements = await hydrate(
+        engine,
+        articles,
+        joinedload(ArticleModel.author),
+        joinedload(ArticleModel.category),
+    )
+
+    assert statements == []
+    assert views[0].author_name == "匿名"
+    assert views[0].author_id is None
+    assert views[3].author_name == "bob dept Bob"
@@ -0,0 +1,109 @@
+from cryptography.hazmat.primitives.asymmetric.ec import (
+    generate_private_key,
+    SECP256R1,
+)
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+from fastapi import HTTPException
+from jwt import encode
+import pytest
+
+from time import time
+
+import auth.utils as auth_utils
+from auth.keys import key_id, KeyRing
+
+
+def write_key(directory, name):
+    private_key = generate_private_key(SECP256R1())
+    (directory / f"{name}.key").write_bytes(private_key.private_bytes(
+        Encoding.PEM,
+        PrivateFormat.PKCS8,
+        NoEncryption()
+    ))
+    (directory / f"{name}.pem").write_bytes(private_key.public_key().public_bytes(
+        Encoding.PEM,
+        PublicFormat.SubjectPublicKeyInfo
+    ))
+    return private_key
+
+
+@pytest.fixture
+def ring(tmp_path, monkeypatch):
+    key_dir = tmp_path / "keys"
+    key_dir.mkdir()
+    write_key(tmp_path, "primary")
+
+    ring = KeyRing(
+        private_key_file=str(tmp_path / "primary.key"),
+        public_key_file=str(tmp_path / "primary.pem"),
+        key_dir=str(key_dir),
+        reload_interval=0,
+    )
+    ring.on_change(auth_utils.clear_verified_tokens)
+
+    monkeypatch.setattr(auth_utils, "key_ring", ring)
+    auth_utils.clear_verified_tokens()
+    return ring
+
+
+def test_verified_tokens_skip_signature_check(ring, monkeypatch):
+    token = auth_utils.sign_jwt(42)
+    calls = []
+    decode = auth_utils.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_utils, "decode", counting_decode)
+
+    assert auth_utils.validate_jwt(token)["sub"] == "42"
+    assert auth_utils.validate_jwt(token)["sub"] == "42"
+    assert len(calls) == 1
+
+    with pytest.raises(HTTPException):
+        auth_utils.validate_jwt(token[:-2] + "xx")
+
+
+def test_unknown_kid_picks_up_rotated_key(ring, tmp_path):
+    rotated = write_key(tmp_path / "keys", "rotated")
+    token = encode(
+        {"sub": "7", "exp": int(time()) + 60},
+        key=rotated,
+        algorithm="ES256",
+        headers={"kid": key_id(rotated.public_key())}
+    )
+
+    assert auth_utils.validate_jwt(token)["sub"] == "7"
+
+    (tmp_path / "keys" / "rotated.pem").unlink()
+    ring.reload(force=True)
+
+    with pytest.raises(HTTPException):
+        auth_utils.validate_jwt(token)
+
+
+def test_cached_claims_expire_with_token(ring, monkeypatch):
+    token = auth_utils.sign_jwt(9)
+    assert auth_utils.validate_jwt(token)["sub"] == "9"
+
+    digest = next(iter(auth_utils.verified_tokens))
+    claims, _ = auth_utils.verified_tokens[digest]
+    auth_utils.verified_tokens[digest] = (claims, time() - 1)
+
+    calls = []
+    decode = auth_utils.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_utils, "decode", counting_decode)
+
+    assert auth_utils.validate_jwt(token)["sub"] == "9"
+    assert len(calls) == 1
@@ -0,0 +1,120 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from orjson import loads
+from starlette.websockets import WebSocketState
+
+from asyncio import sleep
+
+from conversation_manager import ConversationManager, InMemoryBackplane
+
+
+def make_websocket() -> MagicMock:
+    ws = MagicMock()
+    ws.client_state = WebSocketState.CONNECTED
+    ws.send_bytes = AsyncMock()
+    ws.close = AsyncMock()
+    return ws
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_sockets_on_every_worker():
+    backplane = InMemoryBackplane()
+    worker_a = ConversationManager(backplane=backplane)
+    worker_b = ConversationManager(backplane=backplane.peer())
+    await worker_a.start()
+    await worker_b.start()
+
+    alice, bob, carol = make_websocket(), make_websocket(), make_websocket()
+    worker_a.connect(ws=alice, user_id=1)
+    worker_b.connect(ws=bob, user_id=2)
+    worker_b.connect(ws=carol, user_id=3)
+
+    await worker_a.broadcast(
+        user_ids=[1, 2],
+        conversation_id=10,
+        data={"id": "100", "context": "hi"}
+    )
+
+    alice.send_bytes.assert_awaited_once()
+    bob.send_bytes.assert_awaited_once()
+    carol.send_bytes.assert_not_awaited()
+    assert loads(bob.send_bytes.await_args.args[0]) == {
+        "id": "100",
+        "context": "hi",
+    }
+
+
+@pytest.mark.asyncio
+async def test_closed_manager_stops_receiving():
+    backplane = InMemoryBackplane()
+    worker_a = ConversationManager(backplane=backplane)
+    worker_b = ConversationManager(backplane=backplane.peer())
+    await worker_a.start()
+    await worker_b.start()
+
+    bob = make_websocket()
+    worker_b.connect(ws=bob, user_id=2)
+
+    await worker_b.close()
+    await worker_a.broadcast(user_ids=[2], conversation_id=10, data={})
+
+    bob.send_bytes.assert_not_awaited()
+
+
+class FlakyBackplane(InMemoryBackplane):
+    failures: int
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+
+    async def start(self, handler) -> None:
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("backplane unreachable")
+
+        await super().start(handler)
+
+
+@pytest.mark.asyncio
+async def test_stale_socket_on_uncached_conversation_is_dropped():
+    backplane = InMemoryBackplane()
+    worker_a = ConversationManager(backplane=backplane)
+    worker_b = ConversationManager(backplane=backplane.peer())
+    await worker_a.start()
+    await worker_b.start()
+
+    stale, live = make_websocket(), make_websocket()
+    stale.client_state = WebSocketState.DISCONNECTED
+    worker_b.connect(ws=stale, user_id=2)
+    worker_b.connect(ws=live, user_id=3)
+
+    # worker_b never cached conversation 10, and must not raise for it.
+    await worker_a.broadcast(user_ids=[2, 3], conversation_id=10, data={})
+
+    stale.send_bytes.assert_not_awaited()
+    live.send_bytes.assert_awaited_once()
+    assert 2 not in worker_b.user_ws
+    assert 10 not in worker_b.conversations
+
+
+@pytest.mark.asyncio
+async def test_failed_backplane_start_falls_back_and_retries():
+    backplane = FlakyBackplane(failures=2)
+    worker = ConversationManager(backplane=backplane, retry_delay=0.01)
+
+    await worker.start()
+
+    alice = make_websocket()
+    worker.connect(ws=alice, user_id=1)
+    await worker.broadcast(user_ids=[1], conversation_id=10, data={})
+    alice.send_bytes.assert_awaited_once()
+
+    await sleep(0.1)
+    assert backplane.failures == 0
+    assert worker.deliver in backplane.subscribers
+
+    await worker.broadcast(user_ids=[1], conversation_id=10, data={})
+    assert alice.send_bytes.await_count == 2
+
+    await worker.close()
@@ -0,0 +1,140 @@
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from orjson import dumps
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import db
+import routes.articles
+import services.category
+from auth.utils import validate_depends
+from model import ArticleModel, CategoryModel
+from routes.articles import router
+from schemas.article import ArticleCreate
+from services.article import create_articles_bulk
+from services.category import CategoryRegistry
+from snowflake import id_generator
+
+
+@pytest.fixture
+def category(monkeypatch):
+    monkeypatch.setattr(
+        services.category,
+        "category_registry",
+        CategoryRegistry(ttl=60, reload_interval=0)
+    )
+    return id_generator.next_id().value
+
+
+async def add_category(engine, category_id: int) -> None:
+    async with AsyncSession(engine) as session:
+        session.add(CategoryModel(id=category_id, name="tech"))
+        await session.commit()
+
+
+def article(category_id: int, title: str) -> dict:
+    return {
+        "author_visibility": 0,
+        "category_id": category_id,
+        "title": title,
+        "content": "c",
+        "tags": "",
+        "is_public": True,
+        "is_event": False,
+    }
+
+
+async def article_count(engine) -> int:
+    async with AsyncSession(engine) as session:
+        return (await session.execute(
+            select(func.count()).select_from(ArticleModel)
+        )).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_returning_rows_follow_parameter_order(engine, category):
+    await add_category(engine, category)
+    data = [
+        ArticleCreate(**article(category, f"title {i}"))
+        for i in range(50)
+    ]
+
+    async with AsyncSession(engine) as session:
+        articles = await create_articles_bulk(1, data, session)
+
+    assert [a.title for a in articles] == [d.title for d in data]
+    assert [a.id for a in articles] == sorted(a.id for a in articles)
+
+    async with AsyncSession(engine) as session:
+        stored = dict((await session.execute(select(
+            ArticleModel.id,
+            ArticleModel.title,
+        ))).tuples().all())
+    assert all(stored[a.id] == a.title for a in articles)
+
+
+@pytest.fixture
+def client(engine, category, monkeypatch):
+    app = FastAPI()
+    app.include_router(router)
+
+    async def session():
+        async with AsyncSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[db.__get_session] = session
+    app.dependency_overrides[validate_depends] = lambda: 1
+
+    return AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_ndjson_import(engine, category, client):
+    await add_category(engine, category)
+    body = b"\n".join(
+        dumps(article(category, f"line {i}")) for i in range(3)
+    ) + b"\n\n"
+
+    async with client:
+        response = await client.post("/articles/bulk/ndjson", content=body)
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+    assert await article_count(engine) == 3
+
+
+@pytest.mark.asyncio
+async def test_ndjson_parse_error_names_the_line(engine, category, client):
+    await add_category(engine, category)
+    body = b"\n".join([
+        dumps(article(category, "ok")),
+        b"",
+        b'{"title": "missing fields"}',
+        dumps(article(category, "never written")),
+    ])
+
+    async with client:
+        response = await client.post("/articles/bulk/ndjson", content=body)
+
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Invalid article on line 3")
+    assert await article_count(engine) == 0
+
+
+@pytest.mark.asyncio
+async def test_ndjson_import_is_capped(engine, category, client, monkeypatch):
+    await add_category(engine, category)
+    monkeypatch.setattr(routes.articles, "BULK_NDJSON_MAX_ARTICLES", 2)
+    body = b"\n".join(
+        dumps(article(category, f"line {i}")) for i in range(3)
+    )
+
+    async with client:
+        response = await client.post("/articles/bulk/ndjson", content=body)
+
+    assert response.status_code == 413
+    assert await article_count(engine) == 0
@@ -0,0 +1,50 @@
+import pytest
+
+from model.view import CategoryView
+from services.category import CategoryRegistry
+from snowflake import SnowflakeID
+
+
+@pytest.fixture
+def rows(monkeypatch):
+    rows = [CategoryView(id=SnowflakeID(1), name="tech")]
+    calls = []
+
+    async def get_all(session):
+        calls.append(session)
+        return list(rows)
+
+    monkeypatch.setattr(CategoryView, "get_all", get_all)
+    return rows, calls
+
+
+@pytest.mark.asyncio
+async def test_lookups_are_served_from_one_load(rows):
+    _, calls = rows
+    registry = CategoryRegistry(ttl=60)
+    session = object()
+
+    assert await registry.missing([1, 1, 1], session=session) == set()
+    assert list(await registry.get_all(session)) == [1]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_unknown_ids_reload(rows):
+    data, calls = rows
+    registry = CategoryRegistry(ttl=60, reload_interval=0)
+    session = object()
+
+    await registry.get_all(session)
+    data.append(CategoryView(id=SnowflakeID(2), name="life"))
+
+    assert await registry.missing([1, 2, 3], session=session) == {3}
+    assert len(calls) == 2
+
+    version = registry.version
+    data.append(CategoryView(id=SnowflakeID(4), name="food"))
+    registry.invalidate()
+
+    assert registry.version == version + 1
+    assert 4 in await registry.get_all(session)
+    assert len(calls) == 3
@@ -0,0 +1,129 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload
+
+from conversation_manager.utils import get_conversation_views_by_user_id
+from model import ArticleModel, ConversationModel, MessageModel, UserModel
+from model.relationships import conversation_user_table
+from model.view import ConversationView
+from snowflake import id_generator
+
+ALICE, BOB, CAROL = 1, 2, 3
+
+
+@pytest_asyncio.fixture
+async def conversations(engine) -> dict[str, int]:
+    names = ("pair", "event", "quiet")
+    ids = {
+        name: id.value
+        for name, id in zip(names, id_generator.next_ids(len(names)))
+    }
+
+    async with AsyncSession(engine) as session:
+        for user_id, name in enumerate(("alice", "bob", "carol"), ALICE):
+            session.add(UserModel(
+                id=user_id,
+                username=name,
+                display_name=name.title(),
+                gender="",
+                department="R&D",
+                onboarding_year=2024,
+                onboarding_month=1,
+                onboarding_day=1,
+                interest="",
+                password_hash="",
+            ))
+        for name, conversation_id in ids.items():
+            session.add(ConversationModel(
+                id=conversation_id,
+                title=name,
+                is_private=name == "pair",
+            ))
+        session.add(ArticleModel(
+            id=id_generator.next_id().value,
+            author_id=CAROL,
+            author_visibility=0,
+            title="hike",
+            content="c",
+            tags="",
+            is_public=True,
+            is_event=True,
+            event_conversation_id=ids["event"],
+        ))
+        await session.execute(insert(conversation_user_table).values([
+            {"user_id": ALICE, "conversations_id": ids["pair"]},
+            {"user_id": BOB, "conversations_id": ids["pair"]},
+            {"user_id": ALICE, "conversations_id": ids["event"]},
+            {"user_id": CAROL, "conversations_id": ids["event"]},
+            {"user_id": ALICE, "conversations_id": ids["quiet"]},
+        ]))
+        await session.flush()
+
+        # Interleaved, so a latest message taken from the wrong
+        # conversation would show.
+        for conversation, text in (
+            ("pair", "p1"),
+            ("event", "e1"),
+            ("pair", "p2"),
+            ("event", "e2"),
+            ("pair", "p3"),
+        ):
+            message_id = id_generator.next_id().value
+            session.add(MessageModel(
+                id=message_id,
+                updated_seq=message_id,
+                author_id=ALICE,
+                conversation_id=ids[conversation],
+                context=text,
+            ))
+        await session.commit()
+
+    return ids
+
+
+def summary(view: ConversationView) -> tuple:
+    return (
+        view.title,
+        sorted(user.username for user in view.users),
+        view.latest_message.context if view.latest_message else None,
+        (view.event.title, view.event.author_id, view.event.author_name)
+        if view.event else None,
+    )
+
+
+EXPECTED = {
+    "pair": ("pair", ["alice", "bob"], "p3", None),
+    "event": ("event", ["alice", "carol"], "e2", ("hike", None, "匿名")),
+    "quiet": ("quiet", ["alice"], None, None),
+}
+
+
+@pytest.mark.asyncio
+async def test_batch_hydration_of_unloaded_relations(engine, conversations):
+    async with AsyncSession(engine) as session:
+        models = (await session.execute(select(ConversationModel).options(
+            lazyload(ConversationModel.users),
+            lazyload(ConversationModel.event),
+        ))).scalars().all()
+        views = await ConversationView.from_models(models, session=session)
+
+    assert {view.title: summary(view) for view in views} == EXPECTED
+
+
+@pytest.mark.asyncio
+async def test_conversation_list_is_ordered_by_activity(engine, conversations):
+    async with AsyncSession(engine) as session:
+        views = await get_conversation_views_by_user_id(ALICE, session)
+
+    assert [summary(view) for view in views] == [
+        EXPECTED["pair"],
+        EXPECTED["event"],
+        EXPECTED["quiet"],
+    ]
+
+    async with AsyncSession(engine) as session:
+        views = await get_conversation_views_by_user_id(BOB, session)
+
+    assert [summary(view) for view in views] == [EXPECTED["pair"]]
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from os import environ
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# db builds its engine at import time from DB_URL, so each configuration is
+# checked in a fresh interpreter.
+SCRIPT = """
+import asyncio
+from sqlalchemy import text
+
+import db
+
+
+async def main():
+    async with db.engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    status = db.get_pool_status()
+    await db.engine.dispose()
+    print(status["pool"], status["connects"])
+
+
+asyncio.run(main())
+"""
+
+
+def connect(db_url: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=ROOT,
+        env={**environ, "DB_URL": db_url},
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_in_memory_sqlite_connects_without_a_queue_pool():
+    assert connect("sqlite+aiosqlite:///:memory:") == "StaticPool 1"
+
+
+def test_file_sqlite_uses_the_instrumented_pool(tmp_path):
+    assert connect(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}"
+    ) == "InstrumentedPool 1"
@@ -0,0 +1,212 @@
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import services.category
+from conversation_manager import get_conversations_version
+from model import (
+    ArticleModel,
+    CategoryModel,
+    ConversationModel,
+    MessageModel,
+    UserModel,
+)
+from model.relationships import conversation_user_table
+from schemas.user import UserUpdate
+from services.article import add_article_interest, get_articles_version
+from services.category import (
+    CategoryRegistry,
+    follow_category,
+    unfollow_category,
+)
+from services.comment import add_comment_by_article_id
+from services.etag import etag_matches, make_etag
+from services.feed import get_feed_version
+from services.user import add_friend_by_id, update_user_by_id
+from snowflake import id_generator
+
+
+async def add_user(engine, user_id: int) -> None:
+    async with AsyncSession(engine) as session:
+        session.add(UserModel(
+            id=user_id,
+            username=f"user{user_id}",
+            display_name=f"User {user_id}",
+            gender="",
+            department="R&D",
+            onboarding_year=2024,
+            onboarding_month=1,
+            onboarding_day=1,
+            interest="",
+            password_hash="",
+        ))
+        await session.commit()
+
+
+def test_etags_change_with_any_part():
+    assert make_etag("articles", 10, 0) == make_etag("articles", 10, 0)
+    assert make_etag("articles", 10, 0) != make_etag("articles", 11, 0)
+    assert make_etag("articles", 10, 0) != make_etag("articles", 10, 1)
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag("categories", 1)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+@pytest.mark.asyncio
+async def test_articles_version_follows_every_write(engine):
+    article_id = id_generator.next_id().value
+    async with AsyncSession(engine) as session:
+        session.add(ArticleModel(
+            id=article_id,
+            updated_seq=article_id,
+            author_id=1,
+            author_visibility=0,
+            title="t",
+            content="c",
+            is_public=True,
+            is_event=False,
+        ))
+        await session.commit()
+
+    versions = []
+    async with AsyncSession(engine) as session:
+        versions.append(await get_articles_version(session))
+    async with AsyncSession(engine) as session:
+        await add_article_interest(article_id, 1, session)
+    async with AsyncSession(engine) as session:
+        versions.append(await get_articles_version(session))
+    async with AsyncSession(engine) as session:
+        await add_comment_by_article_id(article_id, 1, "hi", 0, session)
+    async with AsyncSession(engine) as session:
+        versions.append(await get_articles_version(session))
+
+    assert versions[0][0] == article_id
+    assert versions[0][0] < versions[1][0] < versions[2][0]
+
+
+@pytest.mark.asyncio
+async def test_articles_version_follows_profile_edits(engine):
+    await add_user(engine, 1)
+
+    async with AsyncSession(engine) as session:
+        before = await get_articles_version(session)
+        await update_user_by_id(1, UserUpdate(department="Ops"), session)
+        after = await get_articles_version(session)
+
+    assert before[0] == after[0]
+    assert before != after
+
+
+@pytest.mark.asyncio
+async def test_feed_version_follows_follows_and_friends(engine, monkeypatch):
+    monkeypatch.setattr(
+        services.category,
+        "category_registry",
+        CategoryRegistry(ttl=60, reload_interval=0)
+    )
+    for user_id in (1, 2):
+        await add_user(engine, user_id)
+    category_id = id_generator.next_id().value
+    async with AsyncSession(engine) as session:
+        session.add(CategoryModel(id=category_id, name="tech"))
+        await session.commit()
+
+    versions = []
+    async with AsyncSession(engine) as session:
+        versions.append(await get_feed_version(1, session))
+        await follow_category(1, category_id, session)
+        versions.append(await get_feed_version(1, session))
+        await unfollow_category(1, category_id, session)
+        versions.append(await get_feed_version(1, session))
+        await add_friend_by_id(2, 1, session)
+        versions.append(await get_feed_version(1, session))
+
+    assert versions == sorted(set(versions))
+
+
+@pytest.mark.asyncio
+async def test_conversations_version_follows_membership_and_messages(engine):
+    old_id, new_id, message_id = id_generator.next_ids(3)
+    async with AsyncSession(engine) as session:
+        for conversation_id in (old_id, new_id):
+            session.add(ConversationModel(
+                id=conversation_id.value,
+                title="chat",
+                is_private=False,
+            ))
+        await session.execute(insert(conversation_user_table).values(
+            user_id=1,
+            conversations_id=new_id.value
+        ))
+        await session.commit()
+
+    async with AsyncSession(engine) as session:
+        empty = await get_conversations_version(1, session)
+
+        # Joining an older conversation does not move max(conversations_id).
+        await session.execute(insert(conversation_user_table).values(
+            user_id=1,
+            conversations_id=old_id.value
+        ))
+        await session.commit()
+        joined = await get_conversations_version(1, session)
+
+        session.add(MessageModel(
+            id=message_id.value,
+            updated_seq=message_id.value,
+            author_id=2,
+            conversation_id=old_id.value,
+            context="hi",
+        ))
+        await session.commit()
+        sent = await get_conversations_version(1, session)
+
+    assert len({empty, joined, sent}) == 3
+    assert sent[2] == message_id.value
+
+
+@pytest.mark.asyncio
+async def test_conversations_version_follows_events_and_members(engine):
+    conversation_id, event_id = id_generator.next_ids(2)
+    for user_id in (1, 2):
+        await add_user(engine, user_id)
+    async with AsyncSession(engine) as session:
+        session.add(ConversationModel(
+            id=conversation_id.value,
+            title="event",
+            is_private=False,
+        ))
+        session.add(ArticleModel(
+            id=event_id.value,
+            updated_seq=event_id.value,
+            author_id=2,
+            author_visibility=1,
+            title="t",
+            content="c",
+            is_public=True,
+            is_event=True,
+            event_conversation_id=conversation_id.value,
+        ))
+        await session.execute(insert(conversation_user_table).values([
+            {"user_id": 1, "conversations_id": conversation_id.value},
+            {"user_id": 2, "conversations_id": conversation_id.value},
+        ]))
+        await session.commit()
+
+    versions = []
+    async with AsyncSession(engine) as session:
+        versions.append(await get_conversations_version(1, session))
+        await add_article_interest(event_id.value, 1, session)
+        versions.append(await get_conversations_version(1, session))
+        await update_user_by_id(2, UserUpdate(display_name="Bo"), session)
+        versions.append(await get_conversations_version(1, session))
+
+    assert len(set(versions)) == 3
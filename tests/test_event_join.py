@@ -0,0 +1,93 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from asyncio import gather
+
+from exceptions.article import EVENT_FULL, EVENT_NOT_FOUND
+from model import ArticleModel
+from model.relationships import join_event_table
+from services.article import join_event, leave_event
+from snowflake import id_generator
+
+CAPACITY = 25
+USERS = 200
+
+
+async def create_event(engine, is_event=True, capacity=CAPACITY) -> int:
+    article_id = id_generator.next_id().value
+    async with AsyncSession(engine) as session:
+        session.add(ArticleModel(
+            id=article_id,
+            author_id=1,
+            author_visibility=0,
+            title="event",
+            content="",
+            is_public=True,
+            is_event=is_event,
+            event_number_max=capacity,
+        ))
+        await session.commit()
+
+    return article_id
+
+
+async def attempt(engine, article_id: int, user_id: int):
+    async with AsyncSession(engine) as session:
+        try:
+            return await join_event(article_id, user_id, session)
+        except HTTPException as exc:
+            return exc
+
+
+async def participants(engine, article_id: int) -> tuple[int, int]:
+    async with AsyncSession(engine) as session:
+        join_count = (await session.execute(select(
+            ArticleModel.join_count
+        ).where(ArticleModel.id == article_id))).scalar_one()
+        rows = (await session.execute(select(func.count()).where(
+            join_event_table.c.article_id == article_id
+        ))).scalar_one()
+
+    return join_count, rows
+
+
+@pytest.mark.asyncio
+async def test_concurrent_joins_never_oversell(engine):
+    article_id = await create_event(engine)
+
+    # Every user tries twice at once to exercise the duplicate path as well.
+    results = await gather(*[
+        attempt(engine, article_id, user_id)
+        for user_id in list(range(1, USERS + 1)) * 2
+    ])
+
+    assert results.count(True) == CAPACITY
+    assert all(result in (True, False, EVENT_FULL) for result in results)
+    assert await participants(engine, article_id) == (CAPACITY, CAPACITY)
+
+
+@pytest.mark.asyncio
+async def test_join_is_idempotent_and_leave_frees_a_seat(engine):
+    article_id = await create_event(engine, capacity=1)
+
+    assert await attempt(engine, article_id, 1) is True
+    assert await attempt(engine, article_id, 1) is False
+    assert await attempt(engine, article_id, 2) is EVENT_FULL
+
+    async with AsyncSession(engine) as session:
+        assert await leave_event(article_id, 1, session) is True
+    async with AsyncSession(engine) as session:
+        assert await leave_event(article_id, 1, session) is False
+
+    assert await attempt(engine, article_id, 2) is True
+    assert await participants(engine, article_id) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_only_events_can_be_joined(engine):
+    article_id = await create_event(engine, is_event=False)
+
+    assert await attempt(engine, article_id, 1) is EVENT_NOT_FOUND
+    assert await attempt(engine, article_id + 1, 1) is EVENT_NOT_FOUND
@@ -0,0 +1,193 @@
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import services.category
+import services.feed
+from model import ArticleModel, CategoryModel
+from model.relationships import friend_table, timeline_table
+from schemas.article import ArticleCreate
+from services.article import create_article
+from services.category import (
+    CategoryRegistry,
+    follow_category,
+    unfollow_category,
+)
+from services.feed import get_feed
+from snowflake import id_generator
+
+AUTHOR, FRIEND, READER, OTHER = 1, 2, 3, 4
+
+
+@pytest.fixture
+def threshold(monkeypatch):
+    monkeypatch.setattr(
+        services.category,
+        "category_registry",
+        CategoryRegistry(ttl=60, reload_interval=0)
+    )
+    monkeypatch.setattr(services.feed, "FEED_FANOUT_MAX_FOLLOWERS", 1)
+
+
+async def create_category(engine, name: str) -> int:
+    category_id = id_generator.next_id().value
+    async with AsyncSession(engine) as session:
+        session.add(CategoryModel(id=category_id, name=name))
+        await session.commit()
+
+    return category_id
+
+
+async def follow(engine, user_id: int, category_id: int) -> bool:
+    async with AsyncSession(engine) as session:
+        return await follow_category(user_id, category_id, session)
+
+
+async def post(
+    engine,
+    category_id: int,
+    author_id: int = AUTHOR,
+    author_visibility: int = 1,
+) -> int:
+    async with AsyncSession(engine) as session:
+        article = await create_article(
+            author_id=author_id,
+            data=ArticleCreate(
+                author_visibility=author_visibility,
+                category_id=category_id,
+                title="t",
+                content="c",
+                tags="",
+                is_public=True,
+                is_event=False,
+            ),
+            session=session
+        )
+
+    return article.id
+
+
+async def feed(engine, user_id: int) -> list[int]:
+    async with AsyncSession(engine) as session:
+        articles, _ = await get_feed(user_id, session)
+
+    return [article.id for article in articles]
+
+
+async def timeline(engine, user_id: int) -> set[int]:
+    async with AsyncSession(engine) as session:
+        return set((await session.execute(select(
+            timeline_table.c.article_id
+        ).where(
+            timeline_table.c.user_id == user_id
+        ))).scalars().all())
+
+
+async def follower_count(engine, category_id: int) -> int:
+    async with AsyncSession(engine) as session:
+        return (await session.execute(select(
+            CategoryModel.follower_count
+        ).where(CategoryModel.id == category_id))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_small_categories_fan_out_on_write(engine, threshold):
+    category_id = await create_category(engine, "small")
+    async with AsyncSession(engine) as session:
+        await session.execute(insert(friend_table).values(
+            user_id=FRIEND,
+            friend_id=AUTHOR
+        ))
+        await session.commit()
+
+    assert await follow(engine, READER, category_id) is True
+    assert await follow(engine, READER, category_id) is False
+    assert await follower_count(engine, category_id) == 1
+
+    article_id = await post(engine, category_id)
+
+    for user_id in (AUTHOR, FRIEND, READER):
+        assert await timeline(engine, user_id) == {article_id}
+        assert await feed(engine, user_id) == [article_id]
+    assert await timeline(engine, OTHER) == set()
+
+
+@pytest.mark.asyncio
+async def test_anonymous_articles_skip_friends(engine, threshold):
+    category_id = await create_category(engine, "small")
+    async with AsyncSession(engine) as session:
+        await session.execute(insert(friend_table).values([
+            {"user_id": FRIEND, "friend_id": AUTHOR},
+            {"user_id": READER, "friend_id": AUTHOR},
+        ]))
+        await session.commit()
+    await follow(engine, READER, category_id)
+
+    article_id = await post(engine, category_id, author_visibility=0)
+
+    assert await timeline(engine, AUTHOR) == {article_id}
+    assert await timeline(engine, READER) == {article_id}
+    assert await timeline(engine, FRIEND) == set()
+
+    # Following the category was the only way it arrived, so unfollowing
+    # takes it away even though the author is a friend.
+    async with AsyncSession(engine) as session:
+        await unfollow_category(READER, category_id, session)
+    assert await timeline(engine, READER) == set()
+
+
+@pytest.mark.asyncio
+async def test_large_categories_are_pulled_on_read(engine, threshold):
+    large_id = await create_category(engine, "large")
+    small_id = await create_category(engine, "small")
+    for user_id in (READER, OTHER):
+        await follow(engine, user_id, large_id)
+    await follow(engine, READER, small_id)
+
+    first = await post(engine, large_id)
+    second = await post(engine, small_id)
+    third = await post(engine, large_id)
+
+    assert await timeline(engine, READER) == {second}
+    assert await feed(engine, READER) == [third, second, first]
+
+    # Shrinking below the threshold must not hide what was posted while
+    # the category was large.
+    async with AsyncSession(engine) as session:
+        assert await unfollow_category(OTHER, large_id, session) is True
+    assert await follower_count(engine, large_id) == 1
+
+    fourth = await post(engine, large_id)
+
+    assert await timeline(engine, READER) == {second, fourth}
+    assert await feed(engine, READER) == [fourth, third, second, first]
+
+
+@pytest.mark.asyncio
+async def test_unfollow_removes_category_articles(engine, threshold):
+    category_id = await create_category(engine, "small")
+    async with AsyncSession(engine) as session:
+        await session.execute(insert(friend_table).values(
+            user_id=READER,
+            friend_id=FRIEND
+        ))
+        await session.commit()
+    await follow(engine, READER, category_id)
+
+    stranger = await post(engine, category_id)
+    friend = await post(engine, category_id, author_id=FRIEND)
+    own = await post(engine, category_id, author_id=READER)
+
+    async with AsyncSession(engine) as session:
+        assert await unfollow_category(READER, category_id, session) is True
+        assert await unfollow_category(READER, category_id, session) is False
+
+    assert await follower_count(engine, category_id) == 0
+    assert await feed(engine, READER) == [own, friend]
+    assert stranger not in await timeline(engine, READER)
+
+    async with AsyncSession(engine) as session:
+        fanned_out = (await session.execute(select(
+            ArticleModel.fanned_out
+        ).where(ArticleModel.id == stranger))).scalar_one()
+    assert fanned_out is True
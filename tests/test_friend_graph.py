@@ -0,0 +1,147 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import services.user
+from model import ArticleModel, UserModel
+from model.relationships import friend_table, timeline_table
+from services.friend_graph import FriendGraph
+from services.user import (
+    add_friend_by_id,
+    check_is_friend,
+    get_friends_by_user_id,
+    remove_friend_by_id,
+)
+from snowflake import id_generator
+
+ALICE, BOB, CAROL = 1, 2, 3
+
+
+@pytest.fixture
+def graph(monkeypatch) -> FriendGraph:
+    graph = FriendGraph(maxsize=100, ttl=300, sync_interval=3600)
+    monkeypatch.setattr(services.user, "friend_graph", graph)
+    return graph
+
+
+@pytest_asyncio.fixture
+async def users(engine) -> None:
+    async with AsyncSession(engine) as session:
+        for user_id, name in enumerate(("alice", "bob", "carol"), ALICE):
+            session.add(UserModel(
+                id=user_id,
+                username=name,
+                display_name=name.title(),
+                gender="",
+                department="R&D",
+                onboarding_year=2024,
+                onboarding_month=1,
+                onboarding_day=1,
+                interest="",
+                password_hash="",
+            ))
+        await session.commit()
+
+
+async def friend_ids(engine, graph: FriendGraph, user_id: int) -> set[int]:
+    async with AsyncSession(engine) as session:
+        return set(await graph.get_friend_ids(user_id, session))
+
+
+@pytest.mark.asyncio
+async def test_add_and_remove_friend_invalidate(engine, graph, users):
+    assert await friend_ids(engine, graph, ALICE) == set()
+    assert await friend_ids(engine, graph, BOB) == set()
+
+    async with AsyncSession(engine) as session:
+        await add_friend_by_id(ALICE, BOB, session)
+
+    assert await friend_ids(engine, graph, ALICE) == {BOB}
+    assert await friend_ids(engine, graph, BOB) == {ALICE}
+    async with AsyncSession(engine) as session:
+        assert await check_is_friend(BOB, ALICE, session) is True
+        assert [
+            user.username
+            for user in await get_friends_by_user_id(ALICE, session)
+        ] == ["bob"]
+
+    async with AsyncSession(engine) as session:
+        await remove_friend_by_id(BOB, ALICE, session)
+
+    assert await friend_ids(engine, graph, ALICE) == set()
+    assert await friend_ids(engine, graph, BOB) == set()
+    async with AsyncSession(engine) as session:
+        assert await check_is_friend(ALICE, BOB, session) is False
+
+
+@pytest.mark.asyncio
+async def test_fill_started_before_invalidate_is_discarded(engine, graph):
+    class Session:
+        def __init__(self, session: AsyncSession) -> None:
+            self.session = session
+
+        async def execute(self, statement):
+            result = await self.session.execute(statement)
+            # Another request adds a friend while this fill is in flight.
+            graph.invalidate(ALICE)
+            return result
+
+    async with AsyncSession(engine) as session:
+        assert await graph.get_friend_ids(ALICE, Session(session)) == set()
+
+    assert ALICE not in graph._adjacency
+
+
+@pytest.mark.asyncio
+async def test_workers_drop_friend_sets_changed_elsewhere(
+    engine,
+    graph,
+    users
+):
+    worker = FriendGraph(maxsize=100, ttl=300, sync_interval=0)
+
+    assert await friend_ids(engine, worker, ALICE) == set()
+    assert await friend_ids(engine, graph, ALICE) == set()
+
+    # `graph` plays the worker that served the request; `worker` only
+    # learns about the friendship from the database.
+    async with AsyncSession(engine) as session:
+        await add_friend_by_id(ALICE, CAROL, session)
+
+    assert await friend_ids(engine, worker, ALICE) == {CAROL}
+    assert await friend_ids(engine, worker, CAROL) == {ALICE}
+
+
+@pytest.mark.asyncio
+async def test_remove_friend_clears_friend_articles(engine, graph, users):
+    article_id = id_generator.next_id().value
+    async with AsyncSession(engine) as session:
+        await add_friend_by_id(ALICE, BOB, session)
+    async with AsyncSession(engine) as session:
+        session.add(ArticleModel(
+            id=article_id,
+            author_id=BOB,
+            author_visibility=1,
+            title="t",
+            content="c",
+            tags="",
+            is_public=True,
+            is_event=False,
+        ))
+        await session.execute(insert(timeline_table).values([
+            {"user_id": ALICE, "article_id": article_id},
+            {"user_id": BOB, "article_id": article_id},
+        ]))
+        await session.commit()
+
+    async with AsyncSession(engine) as session:
+        await remove_friend_by_id(ALICE, BOB, session)
+
+    async with AsyncSession(engine) as session:
+        assert (await session.execute(select(
+            timeline_table.c.user_id
+        ))).scalars().all() == [BOB]
+        assert (await session.execute(
+            select(friend_table)
+        )).all() == []
@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from asyncio import sleep
+
+from model import InstanceLeaseModel
+from snowflake import InstanceLeaseExpired, SnowflakeGenerator
+from snowflake.lease import InstanceLease
+
+
+async def owners(engine) -> dict[int, str]:
+    async with AsyncSession(engine) as session:
+        return dict((await session.execute(select(
+            InstanceLeaseModel.instance_id,
+            InstanceLeaseModel.owner,
+        ))).tuples().all())
+
+
+def lease(ttl: float = 30) -> tuple[InstanceLease, SnowflakeGenerator]:
+    generator = SnowflakeGenerator()
+    return InstanceLease(generator=generator, ttl=ttl), generator
+
+
+@pytest.mark.asyncio
+async def test_workers_claim_distinct_slots(engine):
+    first, first_generator = lease()
+    second, second_generator = lease()
+
+    async with AsyncSession(engine) as session:
+        first_id = await first.acquire(session)
+    async with AsyncSession(engine) as session:
+        second_id = await second.acquire(session)
+
+    assert first_id != second_id
+    assert first_generator.next_id().instance_id == first_id
+    assert second_generator.next_id().instance_id == second_id
+    assert await owners(engine) == {
+        first_id: first.owner,
+        second_id: second.owner,
+    }
+
+
+@pytest.mark.asyncio
+async def test_expired_slot_is_taken_over_and_fenced(engine):
+    stale, stale_generator = lease(ttl=0.05)
+    fresh, fresh_generator = lease()
+
+    async with AsyncSession(engine) as session:
+        instance_id = await stale.acquire(session)
+    stale_generator.next_id()
+
+    await sleep(0.1)
+
+    # The stalled worker stops issuing ids before anyone can reclaim.
+    with pytest.raises(InstanceLeaseExpired):
+        stale_generator.next_id()
+
+    async with AsyncSession(engine) as session:
+        assert await fresh.acquire(session) == instance_id
+    assert fresh_generator.next_id().instance_id == instance_id
+
+    # Renewing after the loss moves the stale worker to a new slot.
+    async with AsyncSession(engine) as session:
+        await stale.renew(session)
+
+    assert stale.instance_id not in (None, instance_id)
+    assert stale_generator.next_id().instance_id == stale.instance_id
+    assert await owners(engine) == {
+        instance_id: fresh.owner,
+        stale.instance_id: stale.owner,
+    }
+
+
+@pytest.mark.asyncio
+async def test_renew_extends_the_local_deadline(engine):
+    worker, generator = lease(ttl=0.2)
+
+    async with AsyncSession(engine) as session:
+        instance_id = await worker.acquire(session)
+
+    for _ in range(4):
+        await sleep(0.1)
+        async with AsyncSession(engine) as session:
+            await worker.renew(session)
+        assert generator.next_id().instance_id == instance_id
+
+
+@pytest.mark.asyncio
+async def test_release_frees_the_slot(engine):
+    worker, generator = lease()
+
+    async with AsyncSession(engine) as session:
+        await worker.acquire(session)
+    async with AsyncSession(engine) as session:
+        await worker.release(session)
+
+    assert worker.instance_id is None
+    assert await owners(engine) == {}
+    with pytest.raises(InstanceLeaseExpired):
+        generator.next_id()
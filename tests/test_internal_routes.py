@@ -0,0 +1,36 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import routes.internal
+from routes.internal import router
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def test_internal_routes_require_the_token(monkeypatch):
+    monkeypatch.setattr(routes.internal, "INTERNAL_TOKEN", "secret")
+
+    assert client.get("/internal/stats").status_code == 404
+    assert client.get(
+        "/internal/stats",
+        headers={"X-Internal-Token": "wrong"}
+    ).status_code == 404
+    assert client.get("/internal/health").status_code == 404
+
+    response = client.get(
+        "/internal/stats",
+        headers={"X-Internal-Token": "secret"}
+    )
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
+
+
+def test_internal_routes_are_disabled_without_a_token(monkeypatch):
+    monkeypatch.setattr(routes.internal, "INTERNAL_TOKEN", None)
+
+    assert client.get(
+        "/internal/stats",
+        headers={"X-Internal-Token": ""}
+    ).status_code == 404
@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import search.memory
+from model import ArticleModel
+from search.memory import build_article_index, InvertedIndex
+from search.tokenizer import query_tokens
+from snowflake import id_generator
+
+
+def build() -> InvertedIndex:
+    index = InvertedIndex()
+    index.add(1, "台北咖啡廳推薦 coffee")
+    index.add(2, "高雄夜市美食")
+    index.add(3, "台北夜市 台北夜市 小吃")
+    return index
+
+
+def test_bm25_ranks_denser_matches_first():
+    index = build()
+
+    hits = index.search(query_tokens("台北夜市"))
+
+    assert [doc_id for doc_id, _ in hits] == [3, 2, 1]
+    assert hits[0][1] > hits[1][1] > hits[2][1] > 0
+    assert index.search(query_tokens("不存在")) == []
+
+
+def test_pagination_and_duplicate_adds():
+    index = build()
+    index.add(3, "ignored")
+
+    assert len(index) == 3
+    assert [doc_id for doc_id, _ in index.search(
+        query_tokens("台北夜市"),
+        offset=1,
+        limit=1
+    )] == [2]
+
+
+def test_snapshot_round_trip(tmp_path):
+    index = build()
+    file = str(tmp_path / "index.bin")
+    index.save(file)
+
+    restored = InvertedIndex()
+    restored.load(file)
+
+    assert restored.last_id == 3
+    assert len(restored) == 3
+    assert restored.search(query_tokens("夜市 coffee")) == index.search(
+        query_tokens("夜市 coffee")
+    )
+
+    restored.add(4, "coffee 夜市")
+    assert restored.search(query_tokens("coffee"))[0][0] == 4
+
+
+def test_concurrent_saves_use_separate_temp_files(tmp_path, monkeypatch):
+    file = str(tmp_path / "index.bin")
+    temp_files = []
+    real_replace = search.memory.replace
+
+    def record(source, target):
+        temp_files.append(source)
+        real_replace(source, target)
+
+    monkeypatch.setattr(search.memory, "replace", record)
+    build().save(file)
+    build().save(file)
+
+    assert len(set(temp_files)) == 2
+    assert all(temp != f"{file}.tmp" for temp in temp_files)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["index.bin"]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_rescans_behind_the_watermark(engine, tmp_path):
+    late_id, indexed_id = id_generator.next_ids(2)
+
+    def article(article_id, title):
+        return ArticleModel(
+            id=article_id.value,
+            author_id=1,
+            author_visibility=0,
+            title=title,
+            content="",
+            is_public=True,
+            is_event=False,
+        )
+
+    async with AsyncSession(engine) as session:
+        session.add(article(indexed_id, "indexed"))
+        await session.commit()
+
+        index = InvertedIndex()
+        assert await build_article_index(index, session=session) == 1
+        file = str(tmp_path / "index.bin")
+        index.save(file)
+
+        # A lower id committed by another worker after the snapshot.
+        session.add(article(late_id, "late"))
+        await session.commit()
+
+        restored = InvertedIndex()
+        assert await build_article_index(restored, file, session) == 1
+
+    assert restored.search(query_tokens("late"))[0][0] == late_id.value
+    assert len(restored) == 2
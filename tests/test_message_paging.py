@@ -0,0 +1,217 @@
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import db
+from auth.utils import validate_depends
+from conversation_manager import get_messages_by_conversation_id
+from model import ConversationModel, MessageModel, UserModel
+from model.relationships import conversation_user_table
+from routes.message import router
+from snowflake import id_generator
+
+ALICE, BOB = 1, 2
+
+
+@pytest_asyncio.fixture
+async def conversation(engine) -> tuple[int, list[int]]:
+    conversation_id, other_id = (
+        id.value for id in id_generator.next_ids(2)
+    )
+
+    async with AsyncSession(engine) as session:
+        for user_id, name in enumerate(("alice", "bob"), ALICE):
+            session.add(UserModel(
+                id=user_id,
+                username=name,
+                display_name=name.title(),
+                gender="",
+                department="R&D",
+                onboarding_year=2024,
+                onboarding_month=1,
+                onboarding_day=1,
+                interest="",
+                password_hash="",
+            ))
+        for id in (conversation_id, other_id):
+            session.add(ConversationModel(
+                id=id,
+                title=str(id),
+                is_private=False,
+            ))
+        await session.execute(insert(conversation_user_table).values([
+            {"user_id": ALICE, "conversations_id": conversation_id},
+            {"user_id": ALICE, "conversations_id": other_id},
+            {"user_id": BOB, "conversations_id": other_id},
+        ]))
+        await session.flush()
+
+        # Messages of another conversation sit between the cursors, so a
+        # page that leaked across conversations would show.
+        message_ids = []
+        for index in range(7):
+            for target in (conversation_id, other_id):
+                message_id = id_generator.next_id().value
+                session.add(MessageModel(
+                    id=message_id,
+                    updated_seq=message_id,
+                    author_id=ALICE,
+                    conversation_id=target,
+                    context=str(index),
+                ))
+                if target == conversation_id:
+                    message_ids.append(message_id)
+        await session.commit()
+
+    return conversation_id, message_ids
+
+
+async def page(engine, conversation_id: int, **kwargs) -> list[int]:
+    async with AsyncSession(engine) as session:
+        return [
+            message.id
+            for message in await get_messages_by_conversation_id(
+                user_id=ALICE,
+                conversation_id=conversation_id,
+                session=session,
+                **kwargs
+            )
+        ]
+
+
+@pytest.mark.asyncio
+async def test_default_page_is_newest_first(engine, conversation):
+    conversation_id, message_ids = conversation
+
+    assert await page(engine, conversation_id) == message_ids[::-1]
+    assert await page(engine, conversation_id, limit=3) == \
+        message_ids[:-4:-1]
+
+
+@pytest.mark.asyncio
+async def test_before_id_scrolls_back_to_the_first_message(
+    engine,
+    conversation
+):
+    conversation_id, message_ids = conversation
+
+    pages = []
+    before_id = None
+    while True:
+        ids = await page(
+            engine,
+            conversation_id,
+            before_id=before_id,
+            limit=3,
+        )
+        if not ids:
+            break
+        pages.append(ids)
+        before_id = ids[-1]
+
+    assert pages == [
+        message_ids[6:3:-1],
+        message_ids[3:0:-1],
+        message_ids[:1],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_after_id_catches_up_from_the_cursor(engine, conversation):
+    conversation_id, message_ids = conversation
+
+    # The page nearest the cursor comes first, still newest first.
+    assert await page(
+        engine,
+        conversation_id,
+        after_id=message_ids[1],
+        limit=3,
+    ) == message_ids[4:1:-1]
+    assert await page(
+        engine,
+        conversation_id,
+        after_id=message_ids[4],
+        limit=3,
+    ) == message_ids[6:4:-1]
+    assert await page(
+        engine,
+        conversation_id,
+        after_id=message_ids[-1],
+    ) == []
+
+
+@pytest.mark.asyncio
+async def test_both_cursors_bound_the_page(engine, conversation):
+    conversation_id, message_ids = conversation
+
+    assert await page(
+        engine,
+        conversation_id,
+        before_id=message_ids[5],
+        after_id=message_ids[1],
+    ) == message_ids[4:1:-1]
+    assert await page(
+        engine,
+        conversation_id,
+        before_id=message_ids[5],
+        after_id=message_ids[1],
+        limit=2,
+    ) == message_ids[4:2:-1]
+
+
+def make_client(engine, user_id: int) -> AsyncClient:
+    app = FastAPI()
+    app.include_router(router)
+
+    async def session():
+        async with AsyncSession(engine) as session:
+            yield session
+
+    app.dependency_overrides[db.__get_session] = session
+    app.dependency_overrides[validate_depends] = lambda: user_id
+
+    return AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_messages_route_pages(engine, conversation):
+    conversation_id, message_ids = conversation
+    url = f"/messages/by-id/{conversation_id}/messages"
+
+    async with make_client(engine, ALICE) as client:
+        response = await client.get(url, params={
+            "before_id": message_ids[3],
+            "limit": 2,
+        })
+        assert response.status_code == 200
+        assert [message["id"] for message in response.json()] == [
+            str(id) for id in message_ids[2:0:-1]
+        ]
+
+        response = await client.get(url, params={
+            "after_id": message_ids[3],
+        })
+        assert [message["id"] for message in response.json()] == [
+            str(id) for id in message_ids[:3:-1]
+        ]
+
+        response = await client.get(url, params={"limit": 0})
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_messages_require_membership(engine, conversation):
+    conversation_id, _ = conversation
+
+    async with make_client(engine, BOB) as client:
+        response = await client.get(
+            f"/messages/by-id/{conversation_id}/messages"
+        )
+
+    assert response.status_code == 404
@@ -0,0 +1,56 @@
+from bcrypt import gensalt, hashpw
+import pytest
+
+from asyncio import create_task, gather, sleep
+from time import perf_counter
+
+from auth.password import PasswordHasher
+
+
+async def measure_loop_lag(stop: list[bool], interval: float = 0.005) -> float:
+    worst = 0.0
+    while not stop:
+        started_at = perf_counter()
+        await sleep(interval)
+        worst = max(worst, perf_counter() - started_at - interval)
+    return worst
+
+
+@pytest.mark.asyncio
+async def test_login_storm_does_not_stall_event_loop():
+    hasher = PasswordHasher(workers=2)
+    password_hash = hashpw(b"secret", gensalt(rounds=10)).decode("utf-8")
+
+    started_at = perf_counter()
+    hashpw(b"secret", password_hash.encode("utf-8"))
+    single_check = perf_counter() - started_at
+
+    stop: list[bool] = []
+    lag = create_task(measure_loop_lag(stop))
+
+    results = await gather(*[
+        hasher.check("secret" if i % 2 else "wrong", password_hash)
+        for i in range(16)
+    ])
+
+    stop.append(True)
+    worst_lag = await lag
+
+    assert results == [bool(i % 2) for i in range(16)]
+    assert worst_lag < max(single_check / 2, 0.02)
+
+    stats = hasher.stats.snapshot()
+    assert stats["completed"] == 16
+    assert stats["waiting"] == 0 and stats["running"] == 0
+    assert stats["max_queue_wait_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_hash_round_trips_as_text():
+    hasher = PasswordHasher(workers=1)
+
+    password_hash = await hasher.hash("hunter2")
+
+    assert isinstance(password_hash, str)
+    assert await hasher.check("hunter2", password_hash)
+    assert not await hasher.check("hunter3", password_hash)
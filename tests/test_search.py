@@ -0,0 +1,145 @@
+import pytest
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import search.engine
+from model import ArticleModel, CommentModel, SearchDocumentModel
+from search import (
+    backfill_search_documents,
+    index_articles,
+    search_documents,
+)
+from services.comment import add_comment_by_article_id
+from snowflake import id_generator
+
+
+@pytest.fixture(autouse=True)
+def database_backend(monkeypatch):
+    monkeypatch.setattr(search.engine, "SEARCH_BACKEND", "database")
+
+
+def article(title: str, content: str) -> ArticleModel:
+    return ArticleModel(
+        id=id_generator.next_id().value,
+        author_id=1,
+        author_visibility=0,
+        title=title,
+        content=content,
+        tags="",
+        is_public=True,
+        is_event=False,
+    )
+
+
+async def add_articles(engine, *articles: ArticleModel) -> list[int]:
+    article_ids = [article.id for article in articles]
+    async with AsyncSession(engine) as session:
+        session.add_all(articles)
+        await index_articles(articles, session)
+        await session.commit()
+
+    return article_ids
+
+
+async def find(engine, query: str, **kwargs) -> list[tuple[str, int]]:
+    async with AsyncSession(engine) as session:
+        hits = await search_documents(query, session=session, **kwargs)
+
+    return [(kind, id) for kind, id, _ in hits]
+
+
+@pytest.mark.asyncio
+async def test_articles_and_comments_rank_by_bm25(engine):
+    weak, strong, other = await add_articles(
+        engine,
+        article("hiking", "a long trip report about a weekend hiking trail "
+                "with many other words in it"),
+        article("hiking hiking", "hiking"),
+        article("cooking", "pasta"),
+    )
+    async with AsyncSession(engine) as session:
+        comment = await add_comment_by_article_id(
+            other, 1, "Any hiking plans?", 0, session
+        )
+
+    hits = await find(engine, "Hiking")
+    assert hits[0] == ("article", strong)
+    assert set(hits) == {
+        ("article", strong),
+        ("article", weak),
+        ("comment", comment.id),
+    }
+
+    assert await find(engine, "hiking", kind="comment") == [
+        ("comment", comment.id)
+    ]
+    assert await find(engine, "hiking", kind="article", limit=1) == [
+        ("article", strong)
+    ]
+    assert await find(engine, "hiking", kind="article", offset=1) == [
+        ("article", weak)
+    ]
+    assert await find(engine, "baking") == []
+
+
+@pytest.mark.asyncio
+async def test_fts_triggers_follow_the_documents(engine):
+    [article_id] = await add_articles(engine, article("tea", "green"))
+
+    async with AsyncSession(engine) as session:
+        await session.execute(update(SearchDocumentModel).where(
+            SearchDocumentModel.id == article_id
+        ).values(tokens="coffee"))
+        await session.commit()
+
+    assert await find(engine, "tea") == []
+    assert await find(engine, "coffee") == [("article", article_id)]
+
+    async with AsyncSession(engine) as session:
+        await session.execute(delete(SearchDocumentModel))
+        await session.commit()
+
+    assert await find(engine, "coffee") == []
+
+
+@pytest.mark.asyncio
+async def test_backfill_indexes_unindexed_rows(engine):
+    unindexed = article("chess", "openings")
+    async with AsyncSession(engine) as session:
+        session.add(unindexed)
+        await session.flush()
+        session.add(CommentModel(
+            id=id_generator.next_id().value,
+            article_id=unindexed.id,
+            author_id=1,
+            content="chess clubs",
+            author_visibility=0,
+        ))
+        await session.commit()
+
+    assert await find(engine, "chess") == []
+
+    async with AsyncSession(engine) as session:
+        assert await backfill_search_documents(session) == 2
+        assert await backfill_search_documents(session) == 0
+
+    assert {kind for kind, _ in await find(engine, "chess")} == {
+        "article", "comment"
+    }
+
+
+@pytest.mark.asyncio
+async def test_like_fallback_matches_whole_tokens(engine):
+    both, one, partial = await add_articles(
+        engine,
+        article("red", "apple"),
+        article("red", "berry"),
+        article("reddish", "stone"),
+    )
+    search_like = getattr(search.engine, "__search_like")
+
+    async with AsyncSession(engine) as session:
+        rows = await search_like(["red", "apple"], None, 0, 10, session)
+
+    assert [(id, score) for _, id, score in rows] == [(both, 2), (one, 1)]
+    assert partial not in [id for _, id, _ in rows]
@@ -0,0 +1,20 @@
+from search.tokenizer import query_tokens, tokenize
+
+
+def test_cjk_runs_become_overlapping_bigrams():
+    assert tokenize("台北咖啡") == ["台北", "北咖", "咖啡"]
+    assert tokenize("好") == ["好"]
+
+
+def test_latin_words_are_normalized():
+    assert tokenize("Coffee-Shop ＡＢＣ 2025") == ["coffee", "shop", "abc", "2025"]
+
+
+def test_mixed_text_splits_on_script_boundaries():
+    assert tokenize("信義區coffee很多！") == [
+        "信義", "義區", "coffee", "很多"
+    ]
+
+
+def test_query_tokens_are_unique_and_ordered():
+    assert query_tokens("夜市 夜市 night") == ["夜市", "night"]
@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from snowflake import SnowflakeGenerator, SnowflakeID
+from snowflake.snowflake import MAX_SEQ, START_TS
+
+
+class FakeClock:
+    def __init__(self, *readings: int) -> None:
+        self.readings = list(readings)
+
+    def __call__(self) -> int:
+        if len(self.readings) > 1:
+            return self.readings.pop(0)
+        return self.readings[0]
+
+
+def test_ids_are_unique_under_thread_contention():
+    generator = SnowflakeGenerator(instance_id=7)
+
+    def work(_: int) -> list[int]:
+        return [generator.next_id().value for _ in range(5000)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        ids = [value for chunk in pool.map(work, range(8)) for value in chunk]
+
+    assert len(set(ids)) == len(ids)
+    assert all(
+        generator.next_id().instance_id == 7
+        for _ in range(3)
+    )
+
+
+def test_sequence_overflow_waits_for_next_millisecond():
+    clock = FakeClock(*([5] * (MAX_SEQ + 3)), 6)
+    generator = SnowflakeGenerator(clock=clock)
+
+    ids = [generator.next_id() for _ in range(MAX_SEQ + 2)]
+
+    assert len(set(ids)) == len(ids)
+    assert ids[MAX_SEQ].sequence == MAX_SEQ
+    assert ids[-1].sequence == 0
+    assert ids[-1].value > ids[MAX_SEQ].value
+
+
+def test_clock_regression_never_reuses_ids():
+    generator = SnowflakeGenerator(clock=FakeClock(100, 100, 40, 40))
+
+    ids = [generator.next_id().value for _ in range(4)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 4
+
+
+def test_next_ids_allocates_across_milliseconds():
+    generator = SnowflakeGenerator(clock=FakeClock(1, 1, 2))
+
+    ids = [value.value for value in generator.next_ids(MAX_SEQ + 11)]
+
+    assert len(ids) == MAX_SEQ + 11
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_time_bounds_enclose_ids_of_that_millisecond():
+    at = START_TS + timedelta(days=3, milliseconds=250)
+    generator = SnowflakeGenerator(
+        instance_id=5,
+        clock=lambda: 3 * 86_400_000 + 250
+    )
+    ids = [generator.next_id().value for _ in range(10)]
+
+    lower = SnowflakeID.lower_bound(at).value
+    upper = SnowflakeID.upper_bound(at).value
+
+    assert all(lower <= value <= upper for value in ids)
+    assert SnowflakeID(lower).timestamp == at
+    assert SnowflakeID.upper_bound(
+        at - timedelta(milliseconds=1)
+    ).value < lower
+    assert SnowflakeID.lower_bound(START_TS - timedelta(days=1)).value == 0
@@ -0,0 +1,136 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from asyncio import gather
+from datetime import datetime, timedelta
+
+import translate.cache
+from model import TranslationCacheEntryModel
+from snowflake import id_generator, SnowflakeID
+from snowflake.snowflake import UTC
+from translate.cache import hash_text, TranslationCache
+
+
+async def entries(engine) -> list[tuple[int, int, str]]:
+    async with AsyncSession(engine) as session:
+        return (await session.execute(select(
+            TranslationCacheEntryModel.id,
+            TranslationCacheEntryModel.refreshed_at,
+            TranslationCacheEntryModel.translated_text,
+        ))).tuples().all()
+
+
+async def add_stale_entry(engine, text: str, age: float) -> None:
+    refreshed_at = SnowflakeID.lower_bound(
+        datetime.now(UTC) - timedelta(seconds=age)
+    ).value
+    async with AsyncSession(engine) as session:
+        session.add(TranslationCacheEntryModel(
+            id=id_generator.next_id().value,
+            refreshed_at=refreshed_at,
+            text_hash=hash_text(text),
+            target_language="EN",
+            translated_text=text.upper(),
+        ))
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_entries_are_shared_through_the_database(engine):
+    cache = TranslationCache(maxsize=10, ttl=60)
+    async with AsyncSession(engine) as session:
+        await cache.set("hola", "EN", "hello", session)
+        assert await cache.get(" hola ", "EN", session) == "hello"
+    assert cache.memory_hits == 1
+
+    other = TranslationCache(maxsize=10, ttl=60)
+    async with AsyncSession(engine) as session:
+        assert await other.get("hola", "EN", session) == "hello"
+        assert await other.get("hola", "DE", session) is None
+    assert (other.db_hits, other.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("upserts", [translate.cache.UPSERTS, {}])
+async def test_set_refreshes_existing_entry(engine, monkeypatch, upserts):
+    # With no dialect upserts, set() takes the portable update-or-insert
+    # path.
+    monkeypatch.setattr(translate.cache, "UPSERTS", upserts)
+    cache = TranslationCache(maxsize=10, ttl=60)
+    async with AsyncSession(engine) as session:
+        await cache.set("hola", "EN", "hello", session)
+    [(entry_id, refreshed_at, _)] = await entries(engine)
+
+    async with AsyncSession(engine) as session:
+        await cache.set("hola", "EN", "hi", session)
+
+    [(same_id, refreshed_again, text)] = await entries(engine)
+    assert (same_id, text) == (entry_id, "hi")
+    assert refreshed_again > refreshed_at
+
+
+@pytest.mark.asyncio
+async def test_failed_write_keeps_the_memory_entry(engine, capsys):
+    cache = TranslationCache(maxsize=10, ttl=60)
+    async with AsyncSession(engine) as session:
+        await session.run_sync(
+            lambda session: TranslationCacheEntryModel.__table__.drop(
+                session.connection()
+            )
+        )
+        await session.commit()
+
+        await cache.set("hola", "EN", "hello", session)
+        assert await cache.get("hola", "EN", session) == "hello"
+
+    assert "Traceback" in capsys.readouterr().err
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_of_one_key(engine):
+    caches = [TranslationCache(maxsize=10, ttl=60) for _ in range(5)]
+
+    async def write(cache: TranslationCache, translated: str) -> None:
+        async with AsyncSession(engine) as session:
+            await cache.set("hola", "EN", translated, session)
+
+    await gather(*[
+        write(cache, f"hello {i}")
+        for i, cache in enumerate(caches)
+    ])
+
+    rows = await entries(engine)
+    assert len(rows) == 1
+    assert rows[0][2].startswith("hello")
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_miss_and_are_evicted(engine):
+    await add_stale_entry(engine, "old", age=120)
+    await add_stale_entry(engine, "new", age=0)
+    cache = TranslationCache(maxsize=10, ttl=60)
+
+    async with AsyncSession(engine) as session:
+        assert await cache.get("old", "EN", session) is None
+        assert await cache.get("new", "EN", session) == "NEW"
+
+        await cache.evict_expired(session)
+        count = (await session.execute(
+            select(func.count()).select_from(TranslationCacheEntryModel)
+        )).scalar_one()
+
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_eviction_runs_every_n_writes(engine):
+    await add_stale_entry(engine, "old", age=120)
+    cache = TranslationCache(maxsize=10, ttl=60, evict_every=2)
+
+    async with AsyncSession(engine) as session:
+        await cache.set("a", "EN", "A", session)
+        assert len(await entries(engine)) == 2
+        await cache.set("b", "EN", "B", session)
+
+    assert sorted(text for _, _, text in await entries(engine)) == ["A", "B"]
@@ -0,0 +1,103 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.websockets import WebSocketState
+
+from asyncio import Event, sleep, wait_for
+
+import conversation_manager.manager
+import translate.pipeline
+from conversation_manager import ConversationManager
+from translate import TranslationPipeline
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_instead_of_blocking(monkeypatch):
+    release = Event()
+
+    async def translate_text(text: str) -> str:
+        await release.wait()
+        return text.upper()
+
+    monkeypatch.setattr(translate.pipeline, "translate_text", translate_text)
+    pipeline = TranslationPipeline(workers=1, max_queue=1)
+    results = []
+
+    async def callback(translated: str) -> None:
+        results.append(translated)
+
+    # One job is held by the worker and one waits in the queue.
+    await pipeline.submit("a", callback)
+    await sleep(0)
+    await pipeline.submit("b", callback)
+    await wait_for(pipeline.submit("c", callback), timeout=0.1)
+
+    assert pipeline.stats()["dropped"] == 1
+
+    release.set()
+    await sleep(0.01)
+    await pipeline.close()
+
+    assert results == ["A", "B"]
+    assert pipeline.stats() == {
+        "queued": 0,
+        "completed": 2,
+        "failed": 0,
+        "dropped": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_translation_skips_the_callback(monkeypatch):
+    async def translate_text(text: str) -> str:
+        raise RuntimeError("DeepL is down")
+
+    monkeypatch.setattr(translate.pipeline, "translate_text", translate_text)
+    pipeline = TranslationPipeline(workers=1, max_queue=10)
+    callback = AsyncMock()
+
+    await pipeline.submit("a", callback)
+    await sleep(0.01)
+    await pipeline.close()
+
+    callback.assert_not_awaited()
+    assert pipeline.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_translation_is_not_stored_or_broadcast(
+    engine,
+    monkeypatch
+):
+    callbacks = []
+
+    async def submit(text, callback) -> None:
+        callbacks.append(callback)
+
+    monkeypatch.setattr(
+        conversation_manager.manager.translation_pipeline,
+        "submit",
+        submit
+    )
+
+    manager = ConversationManager()
+    ws = MagicMock()
+    ws.client_state = WebSocketState.CONNECTED
+    ws.send_bytes = AsyncMock()
+    manager.connect(ws=ws, user_id=1)
+    manager.conversations[10] = [1]
+
+    async with AsyncSession(engine) as session:
+        await manager.send_message(
+            user_id=1,
+            conversation_id=10,
+            message="hi",
+            session=session
+        )
+
+    get_session = MagicMock()
+    monkeypatch.setattr(conversation_manager.manager, "get_session", get_session)
+    await callbacks[0]("")
+
+    ws.send_bytes.assert_awaited_once()
+    get_session.assert_not_called()
@@ -0,0 +1,128 @@
+import pytest, pytest_asyncio
+from aiohttp import web
+
+from asyncio import gather, wait_for
+
+from translate import Translator
+
+
+@pytest_asyncio.fixture
+async def deepl_stub(unused_tcp_port):
+    requests = []
+
+    async def handle(request: web.Request) -> web.Response:
+        form = await request.post()
+        texts = form.getall("text")
+        requests.append((form["target_lang"], texts))
+
+        return web.json_response({"translations": [
+            {"text": f"{form['target_lang']}:{text}"}
+            for text in texts
+        ]})
+
+    app = web.Application()
+    app.router.add_post("/v2/translate", handle)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", unused_tcp_port).start()
+
+    yield f"http://127.0.0.1:{unused_tcp_port}/v2/translate", requests
+
+    await runner.cleanup()
+
+
+def make_translator(api_url: str, batch_size: int = 50) -> Translator:
+    return Translator(
+        api_url=api_url,
+        api_key="test",
+        pool_size=2,
+        batch_window=0.05,
+        batch_size=batch_size,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_batched_per_language(deepl_stub):
+    api_url, requests = deepl_stub
+    translator = make_translator(api_url)
+
+    results = await gather(
+        *[translator.translate(f"hello {i}", "ZH-HANT") for i in range(10)],
+        *[translator.translate(f"你好 {i}", "EN") for i in range(3)],
+    )
+    await translator.close()
+
+    assert results[:10] == [f"ZH-HANT:hello {i}" for i in range(10)]
+    assert results[10:] == [f"EN:你好 {i}" for i in range(3)]
+    assert sorted((target, len(texts)) for target, texts in requests) == [
+        ("EN", 3),
+        ("ZH-HANT", 10),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_texts_are_sent_once(deepl_stub):
+    api_url, requests = deepl_stub
+    translator = make_translator(api_url)
+
+    results = await gather(*[
+        translator.translate("ok", "ZH-HANT")
+        for _ in range(5)
+    ])
+    await translator.close()
+
+    assert results == ["ZH-HANT:ok"] * 5
+    assert requests == [("ZH-HANT", ["ok"])]
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_flushed_immediately(deepl_stub):
+    api_url, requests = deepl_stub
+    translator = make_translator(api_url, batch_size=4)
+
+    await gather(*[translator.translate(str(i), "EN") for i in range(10)])
+    await translator.close()
+
+    assert [len(texts) for _, texts in requests] == [4, 4, 2]
+
+
+@pytest_asyncio.fixture
+async def broken_stub(unused_tcp_port):
+    replies = []
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.json_response(replies.pop(0))
+
+    app = web.Application()
+    app.router.add_post("/v2/translate", handle)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", unused_tcp_port).start()
+
+    yield f"http://127.0.0.1:{unused_tcp_port}/v2/translate", replies
+
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reply", [
+    {"translations": [{"text": "only one"}]},
+    {"unexpected": []},
+])
+async def test_malformed_replies_fail_every_caller(broken_stub, reply):
+    api_url, replies = broken_stub
+    replies.append(reply)
+    translator = make_translator(api_url)
+
+    results = await wait_for(gather(
+        translator.translate("a", "EN"),
+        translator.translate("b", "EN"),
+        translator.translate("b", "EN"),
+        return_exceptions=True
+    ), timeout=5)
+    await translator.close()
+
+    assert len(results) == 3
+    assert all(isinstance(result, Exception) for result in results)
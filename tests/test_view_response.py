@@ -0,0 +1,73 @@
+from orjson import loads
+from pydantic import TypeAdapter
+
+from model.view import (
+    ArticleView,
+    CategoryView,
+    ConversationView,
+    MessageView,
+    UserView,
+    ViewResponse,
+)
+from snowflake import SnowflakeID
+
+
+def make_conversation() -> ConversationView:
+    user = UserView.model_construct(
+        id=SnowflakeID(149495524844875776),
+        username="alice",
+        display_name="Alice",
+        gender="F",
+        department="CS",
+        onboarding_year=2020,
+        onboarding_month=1,
+        onboarding_day=1,
+        interest="",
+    )
+    event = ArticleView.model_construct(
+        id="2",
+        author_id=None,
+        author_name="匿名",
+        category_id=None,
+        category_name=None,
+        title="t",
+        content="c",
+        tags="",
+        is_event=True,
+        event_week_day=3,
+        event_number_min=None,
+        event_number_max=10,
+        event_conversation_id="1",
+        interest_count=0,
+        join_count=1,
+        comment_count=0,
+    )
+
+    return ConversationView.model_construct(
+        id="1",
+        title="",
+        is_private=False,
+        event=event,
+        users=[user],
+        latest_message=MessageView.model_construct(
+            id="3",
+            author_id="149495524844875776",
+            conversation_id="1",
+            context="hi",
+            translated_context=None,
+        ),
+    )
+
+
+def test_view_response_matches_pydantic_serialization():
+    views = [make_conversation()]
+
+    expected = TypeAdapter(list[ConversationView]).dump_json(views)
+
+    assert loads(ViewResponse(views).body) == loads(expected)
+
+
+def test_snowflake_fields_are_strings():
+    category = CategoryView.model_construct(id=SnowflakeID(42), name="tech")
+
+    assert loads(ViewResponse(category).body) == {"id": "42", "name": "tech"}
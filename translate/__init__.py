@@ -0,0 +1,8 @@
+from .cache import TranslationCache, translation_cache
+from .pipeline import TranslationPipeline, translation_pipeline
+from .translator import (
+    heuristic_detection,
+    translate_text,
+    Translator,
+    translator,
+)
@@ -0,0 +1,203 @@
+from cachetools import TTLCache
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from datetime import datetime, timedelta
+from hashlib import sha256
+from traceback import print_exc
+from typing import Optional
+from unicodedata import normalize
+
+from config import TRANSLATION_CACHE_SIZE, TRANSLATION_CACHE_TTL
+from db import get_session
+from model import TranslationCacheEntryModel
+from snowflake import id_generator, SnowflakeID
+from snowflake.snowflake import UTC
+
+
+def hash_text(text: str) -> str:
+    return sha256(
+        normalize("NFC", text.strip()).encode("utf-8")
+    ).hexdigest()
+
+
+UPSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class TranslationCache:
+    memory_hits: int
+    db_hits: int
+    misses: int
+
+    _memory: TTLCache
+    _ttl: float
+    _evict_every: int
+    _writes: int
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        evict_every: int = 1000,
+    ) -> None:
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._ttl = ttl
+        self._evict_every = evict_every
+        self._writes = 0
+
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "memory_size": len(self._memory),
+        }
+
+    def _expire_before_id(self) -> int:
+        return SnowflakeID.lower_bound(
+            datetime.now(UTC) - timedelta(seconds=self._ttl)
+        ).value
+
+    async def get(
+        self,
+        text: str,
+        target_language: str,
+        session: Optional[AsyncSession] = None,
+    ) -> Optional[str]:
+        key = (hash_text(text), target_language)
+
+        translated = self._memory.get(key)
+        if translated is not None:
+            self.memory_hits += 1
+            return translated
+
+        async with get_session(session) as session:
+            translated = (await session.execute(select(
+                TranslationCacheEntryModel.translated_text
+            ).where(
+                TranslationCacheEntryModel.text_hash == key[0],
+                TranslationCacheEntryModel.target_language == key[1],
+                TranslationCacheEntryModel.refreshed_at >=
+                self._expire_before_id(),
+            ))).scalar()
+
+        if translated is None:
+            self.misses += 1
+            return None
+
+        self.db_hits += 1
+        self._memory[key] = translated
+        return translated
+
+    async def set(
+        self,
+        text: str,
+        target_language: str,
+        translated: str,
+        session: Optional[AsyncSession] = None,
+    ) -> None:
+        key = (hash_text(text), target_language)
+        self._memory[key] = translated
+
+        async with get_session(session) as session:
+            # The translation is already in hand; a failed cache write must
+            # not cost the caller it.
+            try:
+                await self.__write(key, translated, session)
+                await session.commit()
+            except:
+                await session.rollback()
+                print_exc()
+                return
+
+            self._writes += 1
+            if self._writes % self._evict_every == 0:
+                try:
+                    await self.evict_expired(session)
+                except:
+                    print_exc()
+
+    async def __write(
+        self,
+        key: tuple[str, str],
+        translated: str,
+        session: AsyncSession,
+    ) -> None:
+        refreshed_at = id_generator.next_id().value
+
+        upsert = UPSERTS.get(session.get_bind().dialect.name)
+        if upsert is not None:
+            # Concurrent writers of the same key resolve in the database
+            # instead of racing into the unique constraint.
+            stat = upsert(TranslationCacheEntryModel).values(
+                id=refreshed_at,
+                text_hash=key[0],
+                target_language=key[1],
+                translated_text=translated,
+                refreshed_at=refreshed_at,
+            )
+            await session.execute(stat.on_conflict_do_update(
+                index_elements=[
+                    TranslationCacheEntryModel.text_hash,
+                    TranslationCacheEntryModel.target_language,
+                ],
+                set_={
+                    "translated_text": stat.excluded.translated_text,
+                    "refreshed_at": stat.excluded.refreshed_at,
+                }
+            ))
+            return
+
+        result = await session.execute(update(
+            TranslationCacheEntryModel
+        ).where(
+            TranslationCacheEntryModel.text_hash == key[0],
+            TranslationCacheEntryModel.target_language == key[1],
+        ).values(
+            translated_text=translated,
+            refreshed_at=refreshed_at,
+        ))
+        if result.rowcount == 0:
+            # Losing an insert race to another writer raises here and is
+            # logged by set(); the other writer's row is just as good.
+            await session.execute(insert(TranslationCacheEntryModel).values(
+                id=refreshed_at,
+                text_hash=key[0],
+                target_language=key[1],
+                translated_text=translated,
+                refreshed_at=refreshed_at,
+            ))
+
+    async def evict_expired(
+        self,
+        session: Optional[AsyncSession] = None,
+    ) -> None:
+        self._memory.expire()
+
+        async with get_session(session) as session:
+            await session.execute(delete(
+                TranslationCacheEntryModel
+            ).where(
+                TranslationCacheEntryModel.refreshed_at <
+                self._expire_before_id()
+            ))
+
+            try:
+                await session.commit()
+            except:
+                await session.rollback()
+                raise
+
+
+translation_cache = TranslationCache(
+    maxsize=TRANSLATION_CACHE_SIZE,
+    ttl=TRANSLATION_CACHE_TTL,
+)
@@ -0,0 +1,87 @@
+from asyncio import CancelledError, create_task, gather, Queue, QueueFull, Task
+from traceback import print_exc
+from typing import Awaitable, Callable
+
+from config import TRANSLATION_QUEUE_SIZE, TRANSLATION_WORKERS
+
+from .translator import translate_text
+
+TranslationCallback = Callable[[str], Awaitable[None]]
+
+
+class TranslationPipeline:
+    completed: int
+    failed: int
+    dropped: int
+
+    _queue: Queue[tuple[str, TranslationCallback]]
+    _workers: list[Task]
+    _worker_count: int
+
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+
+        self._queue = Queue(maxsize=max_queue)
+        self._workers = []
+        self._worker_count = workers
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "completed": self.completed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+    def start(self) -> None:
+        if self._workers:
+            return
+
+        self._workers = [
+            create_task(self.__worker())
+            for _ in range(self._worker_count)
+        ]
+
+    async def close(self) -> None:
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+
+        await gather(*workers, return_exceptions=True)
+
+    async def submit(
+        self,
+        text: str,
+        callback: TranslationCallback,
+    ) -> None:
+        self.start()
+
+        # Submitting happens on the chat receive loop; a DeepL backlog must
+        # drop translations rather than stall the conversation.
+        try:
+            self._queue.put_nowait((text, callback))
+        except QueueFull:
+            self.dropped += 1
+            print(f"Translation queue full, dropped a job ({self.dropped}).")
+
+    async def __worker(self) -> None:
+        while True:
+            text, callback = await self._queue.get()
+            try:
+                await callback(await translate_text(text))
+                self.completed += 1
+            except CancelledError:
+                raise
+            except:
+                self.failed += 1
+                print_exc()
+            finally:
+                self._queue.task_done()
+
+
+translation_pipeline = TranslationPipeline(
+    workers=TRANSLATION_WORKERS,
+    max_queue=TRANSLATION_QUEUE_SIZE,
+)
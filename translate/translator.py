@@ -0,0 +1,207 @@
+from aiohttp import ClientSession, TCPConnector
+from langdetect import detect, DetectorFactory
+
+import re
+from asyncio import create_task, Future, get_running_loop, Task, TimerHandle
+from typing import Literal, Optional
+
+from config import (
+    TRANSLATER_API_KEY,
+    TRANSLATER_API_URL,
+    TRANSLATION_BATCH_SIZE,
+    TRANSLATION_BATCH_WINDOW,
+    TRANSLATION_POOL_SIZE,
+)
+
+from .cache import translation_cache
+
+
+DetectorFactory.seed = 0
+
+
+def heuristic_detection(text) -> Literal["EN", "ZH-HANT"]:
+    chinese_chars = re.findall(r'[\u4e00-\u9fff]', text)
+    chinese_ratio = len(chinese_chars) / max(len(text), 1)
+
+    english_chars = re.findall(r'[a-zA-Z]', text)
+    english_ratio = len(english_chars) / max(len(text), 1)
+
+    if chinese_ratio > 0.3:
+        return "EN"
+
+    elif english_ratio > 0.6:
+        return "ZH-HANT"
+
+    return "EN" if chinese_ratio > english_ratio else "ZH-HANT"
+
+
+class Translator:
+    api_url: str
+    api_key: str
+
+    _session: Optional[ClientSession]
+    _pool_size: int
+    _batch_window: float
+    _batch_size: int
+    _pending: dict[str, dict[str, list[Future]]]
+    _timers: dict[str, TimerHandle]
+    _inflight: set[Task]
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: str,
+        pool_size: int,
+        batch_window: float,
+        batch_size: int,
+    ) -> None:
+        self.api_url = api_url
+        self.api_key = api_key
+
+        self._session = None
+        self._pool_size = pool_size
+        self._batch_window = batch_window
+        self._batch_size = batch_size
+        self._pending = {}
+        self._timers = {}
+        self._inflight = set()
+
+    async def start(self) -> None:
+        if self._session is not None and not self._session.closed:
+            return
+
+        self._session = ClientSession(connector=TCPConnector(
+            limit=self._pool_size,
+            ttl_dns_cache=300,
+        ))
+
+    async def close(self) -> None:
+        for target_language in list(self._pending):
+            self.__flush(target_language)
+
+        for task in list(self._inflight):
+            await task
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def translate(self, text: str, target_language: str) -> str:
+        await self.start()
+
+        future = get_running_loop().create_future()
+        batch = self._pending.setdefault(target_language, {})
+        batch.setdefault(text, []).append(future)
+
+        if len(batch) >= self._batch_size:
+            self.__flush(target_language)
+        elif target_language not in self._timers:
+            self._timers[target_language] = get_running_loop().call_later(
+                self._batch_window,
+                self.__flush,
+                target_language
+            )
+
+        return await future
+
+    def __flush(self, target_language: str) -> None:
+        timer = self._timers.pop(target_language, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(target_language, None)
+        if not batch:
+            return
+
+        task = create_task(self.__send(target_language, batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def __send(
+        self,
+        target_language: str,
+        batch: dict[str, list[Future]],
+    ) -> None:
+        texts = list(batch)
+        error: BaseException = RuntimeError("Translation batch was abandoned.")
+
+        try:
+            await self.start()
+            response = await self._session.post(
+                self.api_url,
+                data=[
+                    ("auth_key", self.api_key),
+                    ("target_lang", target_language),
+                    *[("text", text) for text in texts],
+                ]
+            )
+
+            async with response:
+                if response.status != 200:
+                    print(await response.text())
+                    translations = [""] * len(texts)
+                else:
+                    data = await response.json()
+                    translations = [
+                        translation["text"]
+                        for translation in data["translations"]
+                    ]
+
+            # Results are matched to texts by position, so a short or long
+            # answer cannot be paired safely; fail the whole batch.
+            if len(translations) != len(texts):
+                raise ValueError(
+                    f"Expected {len(texts)} translations, "
+                    f"got {len(translations)}."
+                )
+
+            for text, translated in zip(texts, translations):
+                for future in batch[text]:
+                    if not future.done():
+                        future.set_result(translated)
+        except Exception as exc:
+            error = exc
+        finally:
+            # Every caller is awaiting one of these futures; none may be left
+            # pending, whatever ended the batch.
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+
+
+translator = Translator(
+    api_url=TRANSLATER_API_URL,
+    api_key=TRANSLATER_API_KEY,
+    pool_size=TRANSLATION_POOL_SIZE,
+    batch_window=TRANSLATION_BATCH_WINDOW,
+    batch_size=TRANSLATION_BATCH_SIZE,
+)
+
+
+async def translate_text(
+    text: str,
+) -> str:
+    if not text.strip():
+        return ""
+
+    target_language = "EN"
+    # try:
+    #     lang = detect(text=text)
+
+    #     if lang.startswith("zh"):
+    #         target_language = "EN"
+    #     else:
+    #         target_language = "ZH-HANT"
+    # except:
+    target_language = heuristic_detection(text)
+
+    cached = await translation_cache.get(text, target_language)
+    if cached is not None:
+        return cached
+
+    translated = await translator.translate(text, target_language)
+    if translated:
+        await translation_cache.set(text, target_language, translated)
+
+    return translated